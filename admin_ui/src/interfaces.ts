@@ -16,6 +16,27 @@ export interface UpdateRow {
     data: object
 }
 
+export interface BulkUpdateRows {
+    tableName: string
+    rowIDs: RowID[]
+    data: object
+}
+
+export interface BulkDeleteRows {
+    tableName: string
+    rowIDs: RowID[]
+}
+
+export interface BulkFailure {
+    row_id: RowID
+    error: string
+}
+
+export interface BulkAPIResponse {
+    succeeded: RowID[]
+    failed: BulkFailure[]
+}
+
 export interface FetchIdsConfig {
     tableName: string
     limit: number
@@ -44,8 +65,15 @@ export interface OrderByConfig {
 }
 
 export interface RowCountAPIResponse {
-    count: number
+    count: number | null
     page_size: number
+    estimated: boolean
+}
+
+export interface RowsWithCountAPIResponse extends RowCountAPIResponse {
+    rows: { [key: string]: any }[]
+    next_cursor?: string | null
+    previous_cursor?: string | null
 }
 
 export interface TableReference {
@@ -57,6 +85,18 @@ export interface TableReferencesAPIResponse {
     references: TableReference[]
 }
 
+export interface AllTableReferencesAPIResponse {
+    references: { [tableName: string]: TableReference[] }
+}
+
+export interface TableReferenceCount extends TableReference {
+    count: number
+}
+
+export interface TableReferenceCountsAPIResponse {
+    references: TableReferenceCount[]
+}
+
 /*****************************************************************************/
 // Translations
 export interface TranslationListItemAPI {
@@ -67,6 +107,7 @@ export interface TranslationListItemAPI {
 export interface TranslationsListAPIResponse {
     translations: TranslationListItemAPI[]
     default_language_code: string
+    translations_version?: string
 }
 
 export interface TranslationAPIResponse {
@@ -75,6 +116,36 @@ export interface TranslationAPIResponse {
     translations: { [key: string]: string }
 }
 
+/*****************************************************************************/
+// Bootstrap
+
+export interface UserAPIResponse {
+    username: string
+    user_id: string
+}
+
+export interface MetaAPIResponse {
+    piccolo_admin_version: string
+    site_name: string
+}
+
+export interface PublicBootstrapAPIResponse {
+    meta: MetaAPIResponse
+    translations: TranslationsListAPIResponse
+    translation: TranslationAPIResponse
+}
+
+export interface BootstrapAPIResponse {
+    public: PublicBootstrapAPIResponse
+    user: UserAPIResponse
+    tables: { grouped: { [key: string]: string[] }; ungrouped: string[] }
+    forms: {
+        grouped: { [key: string]: FormConfig[] }
+        ungrouped: FormConfig[]
+    }
+    links: { [key: string]: string }
+}
+
 /*****************************************************************************/
 // File storage
 
@@ -112,6 +183,8 @@ export interface SchemaExtra {
     visible_fields_options: string[]
     visible_filter_names: string[]
     time_resolution: { [key: string]: number }
+    pagination: "offset" | "keyset"
+    count_strategy: "exact" | "estimate" | "cached" | "none"
 }
 
 export interface Schema {
@@ -169,6 +242,25 @@ export interface FormConfig {
     description: string
 }
 
+export type FormJobStatus =
+    | "pending"
+    | "running"
+    | "succeeded"
+    | "failed"
+    | "cancelled"
+
+export interface FormJob {
+    id: string
+    form_slug: string
+    status: FormJobStatus
+    progress: number | null
+    progress_message: string | null
+    message: string | null
+    file_name: string | null
+    created_at: string
+    finished_at: string | null
+}
+
 /*****************************************************************************/
 
 export const getType = (property: Property): string => {
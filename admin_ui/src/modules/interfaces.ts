@@ -2,6 +2,7 @@
 // These interfaces are used for now, to stop TypeScript from complaining.
 
 export interface Context {
+    state: any
     commit: (mutation: string, value: any) => void
     dispatch: (actionName: string, arg?: any) => Promise<void>
 }
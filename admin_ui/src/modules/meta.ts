@@ -1,5 +1,6 @@
 import axios from "axios"
 
+import type { MetaAPIResponse } from "@/interfaces"
 import type { Context } from "./interfaces"
 
 interface State {
@@ -21,13 +22,16 @@ export default {
         }
     },
     actions: {
-        async fetchMeta(context: Context) {
-            const response = await axios.get(`./public/meta/`)
-            context.commit("updateSiteName", response.data.site_name)
+        applyMeta(context: Context, meta: MetaAPIResponse) {
+            context.commit("updateSiteName", meta.site_name)
             context.commit(
                 "updatePiccoloAdminVersion",
-                response.data.piccolo_admin_version
+                meta.piccolo_admin_version
             )
+        },
+        async fetchMeta(context: Context) {
+            const response = await axios.get<MetaAPIResponse>(`./public/meta/`)
+            await context.dispatch("applyMeta", response.data)
         }
     }
 }
@@ -2,6 +2,7 @@ import axios from "axios"
 
 import i18n from "@/translations"
 import type {
+    PublicBootstrapAPIResponse,
     TranslationsListAPIResponse,
     TranslationListItemAPI,
     TranslationAPIResponse
@@ -24,20 +25,65 @@ const localStorageUtils = {
     }
 }
 
+/**
+ * The bootstrap endpoints work out which translation to return, based on
+ * these params.
+ */
+export const getLanguageParams = (): { [key: string]: string } => {
+    const params: { [key: string]: string } = {
+        browser_language_code: navigator.language
+    }
+    const storedLanguagePreference = localStorageUtils.getDefaultLanguage()
+    if (storedLanguagePreference) {
+        params.language_code = storedLanguagePreference
+    }
+    return params
+}
+
+const setTranslation = (translation: TranslationAPIResponse) => {
+    localStorageUtils.setDefaultLanguage(translation.language_code)
+
+    i18n.global.setLocaleMessage(
+        translation.language_code,
+        translation.translations
+    )
+    i18n.global.locale = translation.language_code
+}
+
 interface State {
     translations: TranslationListItemAPI[]
+    translationsVersion: string | null
 }
 
 export default {
     state: {
-        translations: []
+        translations: [],
+        translationsVersion: null
     } as State,
     mutations: {
         updateTranslations(state: State, value: TranslationListItemAPI[]) {
             state.translations = value
+        },
+        updateTranslationsVersion(state: State, value: string | null) {
+            state.translationsVersion = value
         }
     },
     actions: {
+        /**
+         * Stores the translations from the bootstrap response, so we don't
+         * need to fetch them separately.
+         */
+        applyBootstrapTranslations(
+            context: Context,
+            data: PublicBootstrapAPIResponse
+        ) {
+            context.commit("updateTranslations", data.translations.translations)
+            context.commit(
+                "updateTranslationsVersion",
+                data.translations.translations_version || null
+            )
+            setTranslation(data.translation)
+        },
         async setupTranslations(context: Context) {
             // This fetches a list of all available translations (not the
             // translations themselves):
@@ -46,6 +92,10 @@ export default {
             )
             const data = response.data
             context.commit("updateTranslations", data.translations)
+            context.commit(
+                "updateTranslationsVersion",
+                data.translations_version || null
+            )
 
             const availableLanguageCodes = data.translations.map(
                 (translation) => {
@@ -98,16 +148,14 @@ export default {
          * Fetch the translations for a certain language, and store it.
          */
         async loadTranslation(context: Context, languageCode: string) {
+            // Passing the version lets the browser cache the translation
+            // indefinitely.
+            const version = context.state.translationsVersion
             const response = await axios.get<TranslationAPIResponse>(
-                `./public/translations/${languageCode}/`
-            )
-            localStorageUtils.setDefaultLanguage(languageCode)
-
-            i18n.global.setLocaleMessage(
-                response.data.language_code,
-                response.data.translations
+                `./public/translations/${languageCode}/`,
+                { params: version ? { v: version } : {} }
             )
-            i18n.global.locale = response.data.language_code
+            setTranslation(response.data)
         }
     }
 }
@@ -5,11 +5,24 @@ import type * as i from "./interfaces"
 import aboutModalModule from "./modules/aboutModal"
 import timezoneModalModule from "./modules/timezoneModal"
 import metaModule from "./modules/meta"
-import translationsModule from "./modules/translations"
+import translationsModule, { getLanguageParams } from "./modules/translations"
 import { getOrderByString } from "./utils"
 
 const BASE_URL = import.meta.env.VITE_APP_BASE_URI
 
+// Resolves to true if the bootstrap response contained the table groups, form
+// groups and links, so we don't need to fetch them separately.
+let bootstrapPromise: Promise<boolean> | null = null
+
+const isBootstrapped = async (): Promise<boolean> => {
+    return bootstrapPromise !== null && (await bootstrapPromise)
+}
+
+// Maps each table name to the tables which reference it.
+let tableReferencesPromise: Promise<{
+    [tableName: string]: i.TableReference[]
+}> | null = null
+
 export default createStore({
     modules: {
         aboutModalModule,
@@ -20,11 +33,15 @@ export default createStore({
     state: {
         apiResponseMessage: null as i.APIResponseMessage | null,
         currentPageNumber: 1,
+        pageCursor: null as string | null,
+        nextCursor: null as string | null,
+        previousCursor: null as string | null,
         currentTableName: undefined,
         darkMode: false,
         filterParams: {} as { [key: string]: any },
         pageSize: 15,
-        rowCount: 0,
+        rowCount: 0 as number | null,
+        rowCountEstimated: false,
         rows: [],
         schema: undefined as i.Schema | undefined,
         formSchema: undefined,
@@ -74,24 +91,49 @@ export default createStore({
         },
         updateOrderBy(state, config: i.OrderByConfig[]) {
             state.orderBy = config
+            // Cursors are only valid for the ordering they were created with.
+            state.pageCursor = null
         },
         reset(state) {
             state.orderBy = []
             state.filterParams = {}
             state.currentPageNumber = 1
+            state.pageCursor = null
             state.rows = []
         },
         updateFilterParams(state, config: object) {
             state.filterParams = config
+            state.pageCursor = null
         },
-        updateRowCount(state, rowCount: number) {
+        updateRowCount(state, rowCount: number | null) {
             state.rowCount = rowCount
         },
+        updateRowCountEstimated(state, value: boolean) {
+            state.rowCountEstimated = value
+        },
         updatePageSize(state, pageSize: number) {
             state.pageSize = pageSize
         },
         updateCurrentPageNumber(state, pageNumber: number) {
             state.currentPageNumber = pageNumber
+            state.pageCursor = null
+        },
+        updatePageCursor(
+            state,
+            { pageNumber, cursor }: { pageNumber: number; cursor: string }
+        ) {
+            state.currentPageNumber = pageNumber
+            state.pageCursor = cursor
+        },
+        updateCursors(
+            state,
+            {
+                nextCursor,
+                previousCursor
+            }: { nextCursor: string | null; previousCursor: string | null }
+        ) {
+            state.nextCursor = nextCursor
+            state.previousCursor = previousCursor
         },
         updateDarkMode(state, enabled: boolean) {
             state.darkMode = enabled
@@ -105,11 +147,56 @@ export default createStore({
         }
     },
     actions: {
+        /**
+         * Fetches everything the app needs on startup in a single request.
+         */
+        async fetchBootstrap(context) {
+            const params = getLanguageParams()
+
+            bootstrapPromise = (async () => {
+                try {
+                    const response = await axios.get<i.BootstrapAPIResponse>(
+                        `${BASE_URL}bootstrap/`,
+                        { params }
+                    )
+                    const data = response.data
+                    await context.dispatch("applyMeta", data.public.meta)
+                    await context.dispatch(
+                        "applyBootstrapTranslations",
+                        data.public
+                    )
+                    context.commit("updateUser", data.user)
+                    context.commit("updateTableGroups", data.tables)
+                    context.commit("updateFormGroups", data.forms)
+                    context.commit("updateCustomLinks", data.links)
+                    return true
+                } catch (error) {
+                    // The user isn't logged in - the login page still needs
+                    // the site name and translations.
+                    const response =
+                        await axios.get<i.PublicBootstrapAPIResponse>(
+                            `./public/bootstrap/`,
+                            { params }
+                        )
+                    await context.dispatch("applyMeta", response.data.meta)
+                    await context.dispatch(
+                        "applyBootstrapTranslations",
+                        response.data
+                    )
+                    return false
+                }
+            })()
+
+            return await bootstrapPromise
+        },
         async fetchFormConfigs(context) {
             const response = await axios.get(`${BASE_URL}forms/`)
             context.commit("updateFormConfigs", response.data)
         },
         async fetchFormGroups(context) {
+            if (await isBootstrapped()) {
+                return
+            }
             const response = await axios.get(`${BASE_URL}forms/grouped/`)
             context.commit("updateFormGroups", response.data)
         },
@@ -132,10 +219,16 @@ export default createStore({
             context.commit("updateTableNames", response.data)
         },
         async fetchTableGroups(context) {
+            if (await isBootstrapped()) {
+                return
+            }
             const response = await axios.get(`${BASE_URL}tables/grouped/`)
             context.commit("updateTableGroups", response.data)
         },
         async fetchCustomLinks(context) {
+            if (await isBootstrapped()) {
+                return
+            }
             const response = await axios.get(`${BASE_URL}links/`)
             context.commit("updateCustomLinks", response.data)
         },
@@ -154,6 +247,7 @@ export default createStore({
             )
             const data = response.data as i.RowCountAPIResponse
             context.commit("updateRowCount", data.count)
+            context.commit("updateRowCountEstimated", data.estimated)
             return data
         },
         async fetchRows(context) {
@@ -169,25 +263,51 @@ export default createStore({
                 params["__order"] = getOrderByString(orderByConfigs)
             }
 
-            // Get the row counts:
-            const rowCountResponse = await context.dispatch("fetchCount")
             params["__page_size"] = context.state.pageSize
 
-            if (rowCountResponse.count < params["__page_size"]) {
-                context.commit("updateCurrentPageNumber", 1)
+            // If using keyset pagination, and we have a cursor for this page,
+            // it's much faster than an offset.
+            if (context.state.pageCursor) {
+                params["__cursor"] = context.state.pageCursor
+            } else {
+                params["__page"] = context.state.currentPageNumber
             }
 
-            // Now get the rows:
-            params["__page"] = context.state.currentPageNumber
+            // The rows and count are fetched in a single request.
+            params["__count"] = true
+
+            // Only fetch the columns which are shown in the list view.
+            params["__listing"] = true
 
             try {
-                const response = await axios.get(
+                const response = await axios.get<i.RowsWithCountAPIResponse>(
                     `${BASE_URL}tables/${tableName}/?__readable=true`,
                     {
                         params: params
                     }
                 )
-                context.commit("updateRows", response.data.rows)
+                const data = response.data
+
+                // The count is null if the table's count strategy is 'none'.
+                // If the filters have changed, the current page might not
+                // exist any more, so go back to the first page.
+                const pageNumber = context.state.currentPageNumber
+                if (
+                    data.count !== null &&
+                    pageNumber > 1 &&
+                    data.count <= (pageNumber - 1) * params["__page_size"]
+                ) {
+                    context.commit("updateCurrentPageNumber", 1)
+                    return await context.dispatch("fetchRows")
+                }
+
+                context.commit("updateRowCount", data.count)
+                context.commit("updateRowCountEstimated", data.estimated)
+                context.commit("updateRows", data.rows)
+                context.commit("updateCursors", {
+                    nextCursor: data.next_cursor || null,
+                    previousCursor: data.previous_cursor || null
+                })
             } catch (error) {
                 if (axios.isAxiosError(error)) {
                     console.log(error.response)
@@ -199,11 +319,34 @@ export default createStore({
             }
             context.commit("updateLoadingStatus", false)
         },
-        async fetchTableReferences(context, tableName: string) {
-            const response = await axios.get(
-                `${BASE_URL}tables/${tableName}/references/`
+        async fetchTableReferences(
+            context,
+            tableName: string
+        ): Promise<i.TableReference[]> {
+            // The references for every table are fetched once, as they can't
+            // change while the app is running.
+            if (tableReferencesPromise === null) {
+                tableReferencesPromise = axios
+                    .get<i.AllTableReferencesAPIResponse>(
+                        `${BASE_URL}tables/references/`
+                    )
+                    .then((response) => response.data.references)
+                    .catch((error) => {
+                        tableReferencesPromise = null
+                        throw error
+                    })
+            }
+            const references = await tableReferencesPromise
+            return references[tableName] || []
+        },
+        async fetchRowReferenceCounts(
+            context,
+            config: { tableName: string; rowID: number | string }
+        ): Promise<i.TableReferenceCount[]> {
+            const response = await axios.get<i.TableReferenceCountsAPIResponse>(
+                `${BASE_URL}tables/${config.tableName}/references/${config.rowID}/`
             )
-            return response
+            return response.data.references
         },
         async fetchIds(context, config: i.FetchIdsConfig) {
             const params: { [key: string]: any } = {}
@@ -269,6 +412,20 @@ export default createStore({
             )
             return response
         },
+        async bulkUpdateRows(context, config: i.BulkUpdateRows) {
+            const response = await axios.patch<i.BulkAPIResponse>(
+                `${BASE_URL}tables/${config.tableName}/bulk/`,
+                { row_ids: config.rowIDs, data: config.data }
+            )
+            return response
+        },
+        async bulkDeleteRows(context, config: i.BulkDeleteRows) {
+            const response = await axios.delete<i.BulkAPIResponse>(
+                `${BASE_URL}tables/${config.tableName}/bulk/`,
+                { data: { row_ids: config.rowIDs } }
+            )
+            return response
+        },
         async fetchUser(context) {
             const response = await axios.get(`${BASE_URL}user/`)
             context.commit("updateUser", response.data)
@@ -1,12 +1,50 @@
+import { readdirSync, readFileSync, statSync, writeFileSync } from "node:fs"
+import { join } from "node:path"
 import { fileURLToPath, URL } from "node:url"
+import { brotliCompressSync, constants, gzipSync } from "node:zlib"
 
-import { defineConfig } from "vite"
+import { defineConfig, type Plugin } from "vite"
 import vue from "@vitejs/plugin-vue"
 import vueDevTools from "vite-plugin-vue-devtools"
 
+const OUT_DIR = "../piccolo_admin/dist"
+
+// Piccolo Admin serves these instead of the original files, if the browser
+// accepts them. Compressing at the highest level is too slow to do on the
+// fly, so we do it once here.
+const compressAssets = (): Plugin => ({
+    name: "compress-assets",
+    apply: "build",
+    closeBundle() {
+        const assetsDir = fileURLToPath(
+            new URL(`${OUT_DIR}/assets`, import.meta.url)
+        )
+        for (const name of readdirSync(assetsDir)) {
+            if (!/\.(js|css|svg|map|json|html)$/.test(name)) {
+                continue
+            }
+            const path = join(assetsDir, name)
+            if (statSync(path).size < 1000) {
+                continue
+            }
+            const contents = readFileSync(path)
+            writeFileSync(`${path}.gz`, gzipSync(contents, { level: 9 }))
+            writeFileSync(
+                `${path}.br`,
+                brotliCompressSync(contents, {
+                    params: {
+                        [constants.BROTLI_PARAM_QUALITY]:
+                            constants.BROTLI_MAX_QUALITY
+                    }
+                })
+            )
+        }
+    }
+})
+
 // https://vite.dev/config/
 export default defineConfig({
-    plugins: [vue(), vueDevTools()],
+    plugins: [vue(), vueDevTools(), compressAssets()],
     resolve: {
         alias: {
             "@": fileURLToPath(new URL("./src", import.meta.url))
@@ -14,7 +52,7 @@ export default defineConfig({
     },
     base: "./",
     build: {
-        outDir: "../piccolo_admin/dist",
+        outDir: OUT_DIR,
         emptyOutDir: true
     },
     server: {
@@ -0,0 +1,148 @@
+"""
+Benchmarks for Piccolo Admin.
+
+Run using ``python -m benchmarks``, for example::
+
+    python -m benchmarks all --inflate=10000 --output=results.json
+
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+
+import targ
+
+from .endpoints import run_endpoints
+from .memory import run_memory
+from .serialisation import run_serialisation
+from .startup import run_startup
+from .utils import report
+
+
+def _parse_table_counts(table_counts: str) -> tuple[int, ...]:
+    return tuple(int(i) for i in table_counts.split(","))
+
+
+def startup(
+    table_counts: str = "10,100,500",
+    iterations: int = 5,
+    output: Optional[str] = None,
+):
+    """
+    Measure how long ``create_admin`` takes.
+
+    :param table_counts:
+        A comma separated list of how many tables to create.
+    :param iterations:
+        How many times to construct the admin for each table count.
+    :param output:
+        If specified, the results are saved as JSON to this file.
+
+    """
+    report(
+        run_startup(
+            table_counts=_parse_table_counts(table_counts),
+            iterations=iterations,
+        ),
+        output=output,
+    )
+
+
+def endpoints(
+    inflate: int = 0, iterations: int = 100, output: Optional[str] = None
+):
+    """
+    Measure the latency of the main API endpoints.
+
+    :param inflate:
+        How many extra rows to insert using ``populate_data`` (requires
+        ``faker``).
+    :param iterations:
+        How many requests to make to each endpoint.
+    :param output:
+        If specified, the results are saved as JSON to this file.
+
+    """
+    report(
+        run_endpoints(inflate=inflate, iterations=iterations), output=output
+    )
+
+
+def memory(table_counts: str = "10,100,500", output: Optional[str] = None):
+    """
+    Measure how much memory each ``AdminRouter`` uses.
+
+    :param table_counts:
+        A comma separated list of how many tables to create.
+    :param output:
+        If specified, the results are saved as JSON to this file.
+
+    """
+    report(
+        run_memory(table_counts=_parse_table_counts(table_counts)),
+        output=output,
+    )
+
+
+def serialisation(
+    page_size: int = 1000, iterations: int = 20, output: Optional[str] = None
+):
+    """
+    Measure how long large pages of rows take to return, with each
+    ``json_backend``.
+
+    :param page_size:
+        How many rows are in each page.
+    :param iterations:
+        How many requests to make for each ``json_backend``.
+    :param output:
+        If specified, the results are saved as JSON to this file.
+
+    """
+    report(
+        run_serialisation(page_size=page_size, iterations=iterations),
+        output=output,
+    )
+
+
+def run_all(
+    table_counts: str = "10,100,500",
+    inflate: int = 0,
+    iterations: int = 100,
+    output: Optional[str] = None,
+):
+    """
+    Run all of the benchmarks.
+
+    :param table_counts:
+        A comma separated list of how many tables to create.
+    :param inflate:
+        How many extra rows to insert using ``populate_data`` (requires
+        ``faker``).
+    :param iterations:
+        How many requests to make to each endpoint.
+    :param output:
+        If specified, the results are saved as JSON to this file.
+
+    """
+    parsed_table_counts = _parse_table_counts(table_counts)
+    report(
+        [
+            *run_startup(table_counts=parsed_table_counts),
+            *run_memory(table_counts=parsed_table_counts),
+            *run_endpoints(inflate=inflate, iterations=iterations),
+            *run_serialisation(),
+        ],
+        output=output,
+    )
+
+
+if __name__ == "__main__":
+    cli = targ.CLI(description="Piccolo Admin benchmarks")
+    cli.register(startup)
+    cli.register(endpoints)
+    cli.register(memory)
+    cli.register(serialisation)
+    cli.register(run_all, command_name="all")
+    cli.run()
@@ -0,0 +1,99 @@
+"""
+The latency and throughput of the main API endpoints, using the example app
+and data.
+"""
+
+from __future__ import annotations
+
+import os
+
+from piccolo.engine.sqlite import SQLiteEngine
+from starlette.testclient import TestClient
+
+from piccolo_admin.example.app import APP
+from piccolo_admin.example.tables import (
+    PASSWORD,
+    TABLE_CLASSES,
+    USERNAME,
+    create_schema,
+    populate_data,
+)
+
+from .utils import Result, measure
+
+DB_PATH = os.path.join(os.path.dirname(__file__), "benchmark.sqlite")
+
+
+def setup_database(inflate: int = 0):
+    """
+    Creates a separate SQLite database, so we don't interfere with the
+    example app's database.
+    """
+    db = SQLiteEngine(path=DB_PATH)
+    for table_class in TABLE_CLASSES:
+        table_class._meta._db = db
+
+    create_schema(persist=False)
+    populate_data(inflate=inflate)
+
+
+def get_client() -> TestClient:
+    client = TestClient(APP)
+
+    # To get a CSRF cookie
+    response = client.get("/")
+    csrftoken = response.cookies["csrftoken"]
+
+    client.post(
+        "/public/login/",
+        json={
+            "username": USERNAME,
+            "password": PASSWORD,
+            "csrftoken": csrftoken,
+        },
+        headers={"X-CSRFToken": csrftoken},
+    )
+    return client
+
+
+ENDPOINTS = {
+    "list": "/api/tables/movie/?__readable=true&__page_size=15",
+    "list (page 50)": "/api/tables/movie/?__readable=true&__page=50",
+    "list (filtered)": "/api/tables/movie/?__readable=true&director=1",
+    "list (with count)": "/api/tables/movie/?__readable=true&__count=true",
+    "count": "/api/tables/movie/count/",
+    "count (filtered)": "/api/tables/movie/count/?director=1",
+    "schema": "/api/tables/movie/schema/",
+    "ids": "/api/tables/director/ids/?limit=10",
+    "ids (search)": "/api/tables/director/ids/?search=a&limit=10",
+    "translations": "/public/translations/",
+    "translation": "/public/translations/en/",
+    "forms": "/api/forms/",
+    "forms (grouped)": "/api/forms/grouped/",
+    "bootstrap": "/api/bootstrap/",
+}
+
+
+def run_endpoints(inflate: int = 0, iterations: int = 100) -> list[Result]:
+    """
+    :param inflate:
+        How many extra rows to add to the ``Movie`` and ``Director`` tables,
+        using ``populate_data``.
+
+    """
+    setup_database(inflate=inflate)
+    client = get_client()
+
+    results: list[Result] = []
+
+    for name, path in ENDPOINTS.items():
+
+        def request():
+            response = client.get(path)
+            assert response.status_code == 200, response.text
+
+        result = measure(f"GET {name}", request, iterations=iterations)
+        result.extra["rows"] = inflate
+        results.append(result)
+
+    return results
@@ -0,0 +1,48 @@
+"""
+How much memory each ``AdminRouter`` uses.
+"""
+
+from __future__ import annotations
+
+import gc
+import tracemalloc
+
+from piccolo_admin.endpoints import create_admin
+
+from .utils import Result, create_tables
+
+
+def run_memory(table_counts: tuple[int, ...] = (10, 100, 500)) -> list[Result]:
+    results: list[Result] = []
+
+    for count in table_counts:
+        tables = create_tables(count)
+
+        for lazy_tables in (False, True):
+            gc.collect()
+            tracemalloc.start()
+            admin = create_admin(tables=tables, lazy_tables=lazy_tables)
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            del admin
+
+            name = f"AdminRouter memory ({count} tables"
+            name += ", lazy)" if lazy_tables else ")"
+
+            results.append(
+                Result(
+                    name=name,
+                    iterations=0,
+                    mean=0,
+                    median=0,
+                    p95=0,
+                    min=0,
+                    max=0,
+                    extra={
+                        "current_mb": round(current / 1024 / 1024, 2),
+                        "peak_mb": round(peak / 1024 / 1024, 2),
+                    },
+                )
+            )
+
+    return results
@@ -0,0 +1,106 @@
+"""
+How long it takes to return large pages of rows, and the ids used by the
+foreign key selectors, with each ``json_backend``.
+"""
+
+from __future__ import annotations
+
+import datetime
+import decimal
+
+from starlette.testclient import TestClient
+
+from piccolo_admin.crud import AdminCRUD
+from piccolo_admin.example.tables import Director, Movie, Studio
+from piccolo_admin.serialisation import JSON_BACKENDS
+
+from .endpoints import setup_database
+from .utils import Result, measure
+
+
+def add_movies(count: int):
+    """
+    Makes sure there are at least ``count`` movies. Unlike ``populate_data``,
+    it doesn't require ``faker``.
+    """
+    existing = Movie.count().run_sync()
+    if existing >= count:
+        return
+
+    director = Director.select(Director.id).first().run_sync()
+    studio = Studio.select(Studio.pk).first().run_sync()
+    assert director is not None and studio is not None
+    director_id, studio_id = director["id"], studio["pk"]
+
+    Movie.insert(
+        *[
+            Movie(
+                name=f"Movie {i}",
+                rating=7.5,
+                duration=datetime.timedelta(minutes=120),
+                director=director_id,
+                oscar_nominations=1,
+                won_oscar=False,
+                description="A movie. " * 20,
+                release_date=datetime.date(2000, 1, 1),
+                box_office=decimal.Decimal("123.4"),
+                tags=["drama", "thriller"],
+                studio=studio_id,
+            )
+            for i in range(count - existing)
+        ]
+    ).run_sync()
+
+
+def run_serialisation(
+    page_size: int = 1000, iterations: int = 20
+) -> list[Result]:
+    setup_database()
+    add_movies(page_size)
+
+    results: list[Result] = []
+
+    for pagination in ("offset", "keyset"):
+        for json_backend in JSON_BACKENDS:
+            client = TestClient(
+                AdminCRUD(
+                    table=Movie,
+                    pagination=pagination,
+                    json_backend=json_backend,
+                )
+            )
+            path = f"/?__readable=true&__page_size={page_size}"
+
+            def request():
+                response = client.get(path)
+                assert response.status_code == 200, response.text
+
+            result = measure(
+                f"GET list ({pagination}, {json_backend})",
+                request,
+                iterations=iterations,
+            )
+            result.extra["page_size"] = page_size
+            results.append(result)
+
+    for json_backend in JSON_BACKENDS:
+        client = TestClient(AdminCRUD(table=Movie, json_backend=json_backend))
+
+        for name, path in (
+            ("all", "/ids/"),
+            ("search", "/ids/?search=movie&limit=1000"),
+        ):
+
+            def request():
+                response = client.get(path)
+                assert response.status_code == 200, response.text
+
+            results.append(
+                measure(
+                    f"GET ids ({name}, {json_backend})",
+                    request,
+                    iterations=iterations,
+                )
+            )
+
+    return results
@@ -0,0 +1,50 @@
+"""
+How long it takes to construct the admin, with different numbers of tables.
+"""
+
+from __future__ import annotations
+
+from piccolo_admin.endpoints import create_admin
+
+from .utils import Result, create_tables, measure
+
+
+def run_startup(
+    table_counts: tuple[int, ...] = (10, 100, 500), iterations: int = 5
+) -> list[Result]:
+    results: list[Result] = []
+
+    for count in table_counts:
+        tables = create_tables(count)
+        chained_tables = create_tables(count, chain=True)
+
+        results.append(
+            measure(
+                f"create_admin ({count} tables)",
+                lambda: create_admin(tables=tables),
+                iterations=iterations,
+                warmup=1,
+            )
+        )
+
+        # Only the last table is passed in - ``get_all_tables`` has to follow
+        # the foreign keys to find the rest.
+        results.append(
+            measure(
+                f"create_admin ({count} tables, FK chain)",
+                lambda: create_admin(tables=chained_tables[-1:]),
+                iterations=iterations,
+                warmup=1,
+            )
+        )
+
+        results.append(
+            measure(
+                f"create_admin ({count} tables, lazy)",
+                lambda: create_admin(tables=tables, lazy_tables=True),
+                iterations=iterations,
+                warmup=1,
+            )
+        )
+
+    return results
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import json
+import statistics
+import time
+from collections.abc import Callable
+from dataclasses import asdict, dataclass, field
+from typing import Any, Optional
+
+from piccolo.columns.column_types import ForeignKey, Integer, Varchar
+from piccolo.table import Table, create_table_class
+
+from piccolo_admin.version import __VERSION__ as PICCOLO_ADMIN_VERSION
+
+
+@dataclass
+class Result:
+    """
+    The timings for a single benchmark, in milliseconds.
+    """
+
+    name: str
+    iterations: int
+    mean: float
+    median: float
+    p95: float
+    min: float
+    max: float
+    extra: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def throughput(self) -> float:
+        """
+        Operations per second, based on the mean.
+        """
+        return 1000 / self.mean if self.mean else 0.0
+
+    def __str__(self) -> str:
+        output = f"{self.name:<45}"
+        if self.iterations:
+            output += (
+                f" mean={self.mean:9.3f}ms p50={self.median:9.3f}ms "
+                f"p95={self.p95:9.3f}ms ({self.throughput:,.1f}/s)"
+            )
+        for key, value in self.extra.items():
+            output += f" {key}={value}"
+        return output
+
+
+def measure(
+    name: str,
+    function: Callable[[], Any],
+    iterations: int = 100,
+    warmup: int = 5,
+) -> Result:
+    """
+    Calls ``function`` repeatedly, and records how long each call takes.
+    """
+    for _ in range(warmup):
+        function()
+
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    timings.sort()
+
+    return Result(
+        name=name,
+        iterations=iterations,
+        mean=statistics.mean(timings),
+        median=statistics.median(timings),
+        p95=timings[min(int(len(timings) * 0.95), len(timings) - 1)],
+        min=timings[0],
+        max=timings[-1],
+    )
+
+
+def report(results: list[Result], output: Optional[str] = None):
+    """
+    Prints the results, and optionally saves them as JSON, so they can be
+    compared between releases.
+    """
+    for result in results:
+        print(result)
+
+    if output:
+        with open(output, "w") as f:
+            json.dump(
+                {
+                    "piccolo_admin_version": PICCOLO_ADMIN_VERSION,
+                    "results": [
+                        {**asdict(i), "throughput": i.throughput}
+                        for i in results
+                    ],
+                },
+                f,
+                indent=2,
+            )
+        print(f"Saved results to {output}")
+
+
+def create_tables(count: int, chain: bool = False) -> list[type[Table]]:
+    """
+    Creates synthetic table classes.
+
+    :param chain:
+        If ``True``, each table has a foreign key to the previous one, so the
+        admin has to traverse the chain to find all of the related tables.
+
+    """
+    tables: list[type[Table]] = []
+
+    for index in range(count):
+        class_members: dict[str, Any] = {
+            "name": Varchar(),
+            "description": Varchar(length=1000),
+            "rating": Integer(),
+        }
+        if chain and tables:
+            class_members["parent"] = ForeignKey(references=tables[-1])
+
+        tables.append(
+            create_table_class(
+                class_name=f"BenchmarkTable{index}",
+                class_kwargs={"tablename": f"benchmark_table_{index}"},
+                class_members=class_members,
+            )
+        )
+
+    return tables
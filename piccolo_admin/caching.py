@@ -0,0 +1,165 @@
+"""
+Helpers for responses which rarely change, so can be serialised once, and then
+served using conditional requests (``ETag`` / ``If-None-Match``).
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+from typing import Any, Optional
+
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+
+def make_etag(body: bytes) -> str:
+    """
+    Returns a strong ``ETag`` value, based on a hash of the response body.
+    """
+    return '"{}"'.format(hashlib.sha256(body).hexdigest()[:32])
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Checks whether the value of an ``If-None-Match`` header matches the
+    ``ETag``. As per RFC 9110, weak comparison is used, and the header can
+    contain several values, or ``*``.
+    """
+    if not if_none_match:
+        return False
+
+    if if_none_match.strip() == "*":
+        return True
+
+    return etag.removeprefix("W/") in (
+        i.strip().removeprefix("W/") for i in if_none_match.split(",")
+    )
+
+
+def get_accepted_encodings(accept_encoding: Optional[str]) -> set[str]:
+    """
+    Parses an ``Accept-Encoding`` header, ignoring any encodings with a
+    quality value of 0.
+    """
+    encodings = set()
+
+    for item in (accept_encoding or "").split(","):
+        encoding, _, params = item.partition(";")
+        encoding = encoding.strip().lower()
+        if not encoding:
+            continue
+
+        quality = params.strip().removeprefix("q=")
+        if params and quality:
+            try:
+                if float(quality) == 0:
+                    continue
+            except ValueError:
+                continue
+
+        encodings.add(encoding)
+
+    return encodings
+
+
+class CachedResponse:
+    """
+    A response body which is only serialised once, and is then returned with
+    an ``ETag``. If the client already has the latest version, an empty
+    ``304`` response is returned instead.
+
+    :param body:
+        The serialised response body.
+    :param media_type:
+        The ``Content-Type`` of the response.
+    :param cache_control:
+        The ``Cache-Control`` header. The default makes the client revalidate
+        each time, which is cheap, as it's just a ``304`` response.
+    :param compress:
+        If ``True``, gzip and brotli (if installed) versions of the body are
+        also created, and returned to clients which accept them.
+
+    """
+
+    def __init__(
+        self,
+        body: bytes,
+        media_type: str = "application/json",
+        cache_control: str = "private, no-cache",
+        compress: bool = False,
+    ) -> None:
+        self.body = body
+        self.media_type = media_type
+        self.cache_control = cache_control
+        self.etag = make_etag(body)
+
+        # Maps the content encoding to the compressed body. The order is our
+        # preference.
+        self.compressed: dict[str, bytes] = {}
+        if compress:
+            if brotli is not None:
+                self.compressed["br"] = brotli.compress(body)
+            self.compressed["gzip"] = gzip.compress(body, mtime=0)
+
+    @classmethod
+    def from_json(cls, content: Any, **kwargs) -> CachedResponse:
+        """
+        Serialises ``content`` the same way as ``JSONResponse``.
+        """
+        return cls(body=bytes(JSONResponse(content).body), **kwargs)
+
+    def get_variant(self, request: Request) -> tuple[Optional[str], bytes]:
+        """
+        Works out which version of the body to send, based on the request's
+        ``Accept-Encoding`` header.
+
+        :returns:
+            The content encoding (``None`` if not compressed), and the body.
+
+        """
+        if self.compressed:
+            accepted = get_accepted_encodings(
+                request.headers.get("accept-encoding")
+            )
+            for encoding, body in self.compressed.items():
+                if encoding in accepted:
+                    return encoding, body
+
+        return None, self.body
+
+    def to_response(
+        self, request: Request, cache_control: Optional[str] = None
+    ) -> Response:
+        """
+        :param cache_control:
+            Overrides the ``Cache-Control`` header for this response.
+
+        """
+        encoding, body = self.get_variant(request)
+
+        # Each encoding is a different representation, so needs its own
+        # ETag.
+        etag = f'{self.etag[:-1]}-{encoding}"' if encoding else self.etag
+
+        headers = {
+            "ETag": etag,
+            "Cache-Control": cache_control or self.cache_control,
+        }
+        if self.compressed:
+            headers["Vary"] = "Accept-Encoding"
+
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+
+        if encoding:
+            headers["Content-Encoding"] = encoding
+
+        return Response(
+            content=body, media_type=self.media_type, headers=headers
+        )
@@ -0,0 +1,354 @@
+"""
+Compresses responses using gzip or brotli, and serves precompressed static
+files.
+"""
+
+from __future__ import annotations
+
+import mimetypes
+import stat
+import zlib
+from collections.abc import Sequence
+from typing import Any, Literal, Optional, Protocol
+
+import anyio.to_thread
+import typing_extensions
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .caching import get_accepted_encodings
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+
+Encoding: typing_extensions.TypeAlias = Literal["br", "gzip"]
+
+ENCODINGS: tuple[Encoding, ...] = ("br", "gzip")
+
+#: Compressing these is a waste of time, as they're already compressed.
+EXCLUDED_CONTENT_TYPES = (
+    "application/gzip",
+    "application/x-gzip",
+    "application/zip",
+    "audio/",
+    "font/woff",
+    "font/woff2",
+    "image/avif",
+    "image/gif",
+    "image/jpeg",
+    "image/png",
+    "image/webp",
+    "text/event-stream",
+    "video/",
+)
+
+#: The file extensions of precompressed static files.
+PRECOMPRESSED_EXTENSIONS: dict[Encoding, str] = {"br": ".br", "gzip": ".gz"}
+
+#: The built assets have a hash in their file name, so they never change.
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+#: Bodies bigger than this are compressed in a thread, so the event loop
+#: isn't blocked.
+THREAD_MINIMUM_SIZE = 256 * 1024
+
+
+def validate_encodings(encodings: Sequence[str]) -> None:
+    """
+    :raises ValueError:
+        If any of the encodings aren't supported.
+
+    """
+    for encoding in encodings:
+        if encoding not in ENCODINGS:
+            raise ValueError(
+                f"Unsupported compression encoding - {encoding}. The options "
+                f"are {', '.join(ENCODINGS)}."
+            )
+
+
+def add_vary_header(headers: MutableHeaders) -> None:
+    """
+    Adds ``Accept-Encoding`` to the ``Vary`` header, if it isn't already
+    there.
+    """
+    vary = headers.get("vary")
+    if not vary:
+        headers["Vary"] = "Accept-Encoding"
+    elif "accept-encoding" not in vary.lower():
+        headers["Vary"] = f"{vary}, Accept-Encoding"
+
+
+class Compressor(Protocol):
+    def compress(self, data: bytes, finish: bool) -> bytes: ...
+
+
+class GzipCompressor:
+    def __init__(self, level: int) -> None:
+        self.compressor = zlib.compressobj(
+            level, zlib.DEFLATED, 16 + zlib.MAX_WBITS
+        )
+
+    def compress(self, data: bytes, finish: bool) -> bytes:
+        return self.compressor.compress(data) + self.compressor.flush(
+            zlib.Z_FINISH if finish else zlib.Z_SYNC_FLUSH
+        )
+
+
+class BrotliCompressor:
+    def __init__(self, quality: int) -> None:
+        self.compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes, finish: bool) -> bytes:
+        output = self.compressor.process(data)
+        return output + (
+            self.compressor.finish() if finish else self.compressor.flush()
+        )
+
+
+class CompressionMiddleware:
+    """
+    Compresses responses, using the first of ``encodings`` which the client
+    accepts.
+
+    Responses which are already compressed (e.g. a ``CachedResponse`` with
+    ``compress=True``), are too small, or have a content type which is
+    already compressed (e.g. images) are left alone, as are downloads with a
+    known ``Content-Length``. Other streaming responses (e.g. CSV exports)
+    are compressed chunk by chunk.
+
+    :param encodings:
+        In order of preference. ``'br'`` is ignored if ``brotli`` isn't
+        installed.
+    :param minimum_size:
+        Responses smaller than this many bytes aren't compressed, as it's
+        not worth it.
+    :param gzip_level:
+        From 1 (fastest) to 9 (smallest).
+    :param brotli_quality:
+        From 0 (fastest) to 11 (smallest). Higher values are too slow for
+        compressing responses on the fly.
+
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        encodings: Sequence[Encoding] = ENCODINGS,
+        minimum_size: int = 1000,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+    ) -> None:
+        validate_encodings(encodings)
+        self.app = app
+        self.encodings = [
+            i for i in encodings if i != "br" or brotli is not None
+        ]
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    def get_compressor(self, encoding: Encoding) -> Compressor:
+        if encoding == "br":
+            return BrotliCompressor(quality=self.brotli_quality)
+        return GzipCompressor(level=self.gzip_level)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accepted = get_accepted_encodings(
+            Headers(scope=scope).get("accept-encoding")
+        )
+        encoding = next((i for i in self.encodings if i in accepted), None)
+
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(
+            send=send, encoding=encoding, middleware=self
+        )
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    """
+    Wraps ``send`` for a single response.
+    """
+
+    def __init__(
+        self, send: Send, encoding: Encoding, middleware: CompressionMiddleware
+    ) -> None:
+        self._send = send
+        self.encoding = encoding
+        self.middleware = middleware
+        self.start_message: Optional[Message] = None
+        self.compressor: Optional[Compressor] = None
+        self.passthrough = False
+
+    def _should_compress(self, message: Message) -> bool:
+        if message["status"] in (204, 206, 304):
+            return False
+
+        headers = Headers(raw=message["headers"])
+        if "content-encoding" in headers:
+            return False
+
+        content_type = headers.get("content-type", "").lower()
+        return not content_type.startswith(EXCLUDED_CONTENT_TYPES)
+
+    async def _compress(self, data: bytes, finish: bool) -> bytes:
+        assert self.compressor is not None
+        if len(data) >= THREAD_MINIMUM_SIZE:
+            return await anyio.to_thread.run_sync(
+                self.compressor.compress, data, finish
+            )
+        return self.compressor.compress(data, finish)
+
+    async def send(self, message: Message) -> None:
+        message_type = message["type"]
+
+        if message_type == "http.response.start":
+            if self._should_compress(message):
+                # Wait for the body, to see if it's worth compressing.
+                self.start_message = message
+            else:
+                self.passthrough = True
+                await self._send(message)
+            return
+
+        if self.passthrough or message_type != "http.response.body":
+            if self.start_message is not None:
+                # For example ``http.response.pathsend``.
+                await self._send(self.start_message)
+                self.start_message = None
+            await self._send(message)
+            return
+
+        body: bytes = message.get("body", b"")
+        more_body: bool = message.get("more_body", False)
+
+        if self.start_message is None:
+            # The rest of a streaming response.
+            if self.compressor is not None:
+                message["body"] = await self._compress(
+                    body, finish=not more_body
+                )
+            await self._send(message)
+            return
+
+        start_message = self.start_message
+        self.start_message = None
+
+        if not more_body and len(body) < self.middleware.minimum_size:
+            await self._send(start_message)
+            await self._send(message)
+            return
+
+        headers = MutableHeaders(scope=start_message)
+
+        if (
+            more_body
+            and "content-length" in headers
+            and headers.get("content-disposition", "").startswith("attachment")
+        ):
+            # It's a download, where the size is known up front. We keep the
+            # ``Content-Length``, so the browser can show the progress.
+            self.passthrough = True
+            await self._send(start_message)
+            await self._send(message)
+            return
+
+        self.compressor = self.middleware.get_compressor(self.encoding)
+        message["body"] = await self._compress(body, finish=not more_body)
+
+        headers["Content-Encoding"] = self.encoding
+        add_vary_header(headers)
+
+        if more_body:
+            if "content-length" in headers:
+                del headers["Content-Length"]
+        else:
+            headers["Content-Length"] = str(len(message["body"]))
+
+        await self._send(start_message)
+        await self._send(message)
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """
+    Serves ``.br`` or ``.gz`` versions of files (for example,
+    ``index.js.br`` instead of ``index.js``) if they exist, and the client
+    accepts them. They're created when the UI is built, using the maximum
+    compression level, which is too slow to do on the fly.
+
+    :param cache_control:
+        Added to successful responses. The default assumes the file names
+        contain a hash of their contents, so they can be cached forever.
+
+    """
+
+    def __init__(
+        self,
+        *args: Any,
+        cache_control: str = IMMUTABLE_CACHE_CONTROL,
+        **kwargs,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.cache_control = cache_control
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        response = await self._get_precompressed_response(path, scope)
+        if response is None:
+            response = await super().get_response(path, scope)
+
+        if response.status_code in (200, 304):
+            response.headers["Cache-Control"] = self.cache_control
+            add_vary_header(response.headers)
+
+        return response
+
+    async def _get_precompressed_response(
+        self, path: str, scope: Scope
+    ) -> Optional[Response]:
+        if scope["method"] not in ("GET", "HEAD"):
+            return None
+
+        request_headers = Headers(scope=scope)
+        accepted = get_accepted_encodings(
+            request_headers.get("accept-encoding")
+        )
+
+        for encoding, extension in PRECOMPRESSED_EXTENSIONS.items():
+            if encoding not in accepted:
+                continue
+
+            try:
+                full_path, stat_result = await anyio.to_thread.run_sync(
+                    self.lookup_path, path + extension
+                )
+            except (OSError, ValueError):
+                # ``StaticFiles`` returns the appropriate error response.
+                return None
+
+            if stat_result is None or not stat.S_ISREG(stat_result.st_mode):
+                continue
+
+            response = FileResponse(
+                full_path,
+                stat_result=stat_result,
+                media_type=mimetypes.guess_type(path)[0] or "text/plain",
+                headers={"Content-Encoding": encoding},
+            )
+            if self.is_not_modified(response.headers, request_headers):
+                return NotModifiedResponse(response.headers)
+            return response
+
+        return None
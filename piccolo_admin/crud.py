@@ -0,0 +1,1872 @@
+"""
+Extends ``PiccoloCRUD`` with functionality which is specific to Piccolo Admin.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import csv
+import functools
+import inspect
+import io
+import json
+import operator
+import re
+import time
+from collections import OrderedDict
+from collections.abc import AsyncGenerator, Sequence
+from typing import Any, Literal, Optional, Union, cast
+
+import pydantic
+import pydantic_core
+import typing_extensions
+from piccolo.apps.user.tables import BaseUser
+from piccolo.columns.base import Column
+from piccolo.columns.column_types import ForeignKey, Text, Varchar
+from piccolo.columns.combination import Where
+from piccolo.engine.postgres import PostgresEngine
+from piccolo.engine.sqlite import SQLiteEngine
+from piccolo.query.methods.select import Select
+from piccolo.querystring import QueryString
+from piccolo.utils.encoding import dump_json, load_json
+from piccolo_api.crud.endpoints import (
+    CustomJSONResponse,
+    OrderBy,
+    ParamException,
+    Params,
+    PiccoloCRUD,
+)
+from piccolo_api.crud.exceptions import MalformedQuery, db_exception_handler
+from piccolo_api.crud.hooks import (
+    HookType,
+    execute_delete_hooks,
+    execute_patch_hooks,
+)
+from piccolo_api.crud.validators import apply_validators
+from starlette.exceptions import HTTPException
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response, StreamingResponse
+
+from .caching import CachedResponse
+from .serialisation import JSONBackend, dump_json_orjson
+
+EXPORT_FORMATS = ("csv", "jsonl")
+
+EXPORT_DELIMITERS = (",", ";")
+
+Pagination: typing_extensions.TypeAlias = Literal["offset", "keyset"]
+
+CountStrategy: typing_extensions.TypeAlias = Literal[
+    "exact", "estimate", "cached", "none"
+]
+
+SearchStrategy: typing_extensions.TypeAlias = Literal[
+    "contains", "prefix", "trigram", "fulltext"
+]
+
+
+class CursorException(Exception):
+    """
+    Raised when a keyset pagination cursor can't be decoded.
+    """
+
+    pass
+
+
+def _clears_ids_cache(method):
+    """
+    Clears the cached ids endpoint responses once the wrapped method, which
+    modifies the table, has finished.
+    """
+
+    @functools.wraps(method)
+    async def wrapper(self: AdminCRUD, *args, **kwargs):
+        try:
+            return await method(self, *args, **kwargs)
+        finally:
+            self._ids_cache.clear()
+
+    return wrapper
+
+
+class AdminCRUD(PiccoloCRUD):
+    """
+    Piccolo Admin uses this instead of ``PiccoloCRUD``, so we can add extra
+    endpoints, and optimise existing ones for use with the admin UI.
+    """
+
+    #: How many rows are fetched from the database at a time when exporting.
+    export_batch_size: int = 1000
+
+    #: The maximum number of primary key values in each ``IN (...)`` clause
+    #: used by the bulk endpoints, so we stay below the database's limit on
+    #: query parameters.
+    bulk_batch_size: int = 500
+
+    #: The maximum number of filter combinations to cache counts for.
+    count_cache_size: int = 1000
+
+    #: The maximum number of search terms to cache the ids endpoint for.
+    ids_cache_size: int = 100
+
+    def __init__(
+        self,
+        *args,
+        pagination: Pagination = "offset",
+        order_by: Optional[list[OrderBy]] = None,
+        count_strategy: CountStrategy = "exact",
+        count_cache_ttl: float = 60.0,
+        list_columns: Optional[Sequence[Column]] = None,
+        preview_lengths: Optional[dict[str, int]] = None,
+        json_backend: JSONBackend = "json",
+        referencing_columns: Optional[Sequence[ForeignKey]] = None,
+        search_strategy: SearchStrategy = "contains",
+        ids_cache_ttl: Optional[float] = None,
+        **kwargs,
+    ) -> None:
+        """
+        Accepts the same arguments as ``PiccoloCRUD``, plus:
+
+        :param pagination:
+            Either ``'offset'`` (``LIMIT`` / ``OFFSET``), or ``'keyset'``, in
+            which case the root endpoint returns a ``next_cursor`` and
+            ``previous_cursor``, which can be passed back using the
+            ``__cursor`` param to fetch the adjacent pages.
+        :param order_by:
+            The default ordering when using keyset pagination, if ``__order``
+            isn't specified.
+        :param count_strategy:
+            How the count endpoint works out the number of rows - see
+            ``get_count``.
+        :param count_cache_ttl:
+            How many seconds counts are cached for, when ``count_strategy`` is
+            ``'cached'``.
+        :param list_columns:
+            The columns shown in the list view of the admin UI. If
+            ``__listing=true`` is passed to the root endpoint, only these
+            columns are selected (unless ``__visible_fields`` is also
+            specified). Defaults to all of the columns.
+        :param preview_lengths:
+            A mapping of column names to the maximum number of characters
+            returned for them when ``__listing=true`` is passed in. Longer
+            values are truncated by the database, and a
+            ``{column_name}_truncated`` value of ``true`` is added to the
+            row.
+        :param json_backend:
+            If ``'orjson'``, the rows are serialised directly using
+            ``orjson``, rather than being validated by the Pydantic model
+            first.
+        :param referencing_columns:
+            The foreign key columns in other tables which reference this
+            one, returned by the references endpoint. If not specified, they
+            are looked up using the table class instead, which includes
+            tables which aren't in the admin.
+        :param search_strategy:
+            How the ids endpoint filters rows using the ``search`` param - see
+            ``get_ids``.
+        :param ids_cache_ttl:
+            If set, the ids endpoint responses are cached for this many
+            seconds.
+
+        """
+        super().__init__(*args, **kwargs)
+        self.pagination = pagination
+        self.count_strategy = count_strategy
+        self.count_cache_ttl = count_cache_ttl
+        self._count_cache: dict[str, tuple[float, int]] = {}
+        self.preview_lengths = preview_lengths or {}
+        self.json_backend = json_backend
+        self.list_column_names = ",".join(
+            dict.fromkeys(
+                i._meta.name
+                for i in (list_columns or self.table._meta.columns)
+            )
+        )
+        self.order_by = order_by or [
+            OrderBy(column=self.table._meta.primary_key, ascending=True)
+        ]
+        self.referencing_columns: Optional[list[ForeignKey]] = (
+            None if referencing_columns is None else list(referencing_columns)
+        )
+        self.search_strategy = search_strategy
+        self.ids_cache_ttl = ids_cache_ttl
+        self._ids_cache: OrderedDict[
+            tuple[Optional[str], ...], tuple[float, bytes]
+        ] = OrderedDict()
+
+    ###########################################################################
+
+    async def _run_validators(self, request: Request, name: str) -> None:
+        """
+        ``apply_validators`` only works for methods which have a matching
+        attribute on ``Validators``. For our own endpoints, we run the
+        validators for the closest equivalent ``PiccoloCRUD`` method instead.
+
+        :param name:
+            The name of the ``Validators`` attribute, e.g. ``'get_all'``.
+
+        """
+        validators = self.validators
+        if validators is None:
+            return
+
+        for validator_function in getattr(validators, name) + validators.every:
+            try:
+                if inspect.iscoroutinefunction(validator_function):
+                    await validator_function(
+                        request=request,
+                        piccolo_crud=self,
+                        **validators.extra_context,
+                    )
+                else:
+                    validator_function(
+                        request=request,
+                        piccolo_crud=self,
+                        **validators.extra_context,
+                    )
+            except HTTPException as exception:
+                raise exception
+            except Exception:
+                raise HTTPException(status_code=400, detail="Validation error")
+
+    def _get_select_query(
+        self,
+        split_params: Params,
+        order_by: Optional[list[OrderBy]] = None,
+        extra_columns: Sequence[Column] = (),
+        preview: bool = False,
+    ) -> tuple[Select, list[Column], Union[bool, tuple[ForeignKey, ...]]]:
+        """
+        Builds the same ``SELECT`` query as ``PiccoloCRUD.get_all``, but
+        without any pagination.
+
+        :param order_by:
+            If not specified, the ``__order`` param is used, falling back to
+            the primary key in descending order.
+        :param extra_columns:
+            Columns which need to be selected, even if they're not in
+            ``__visible_fields``.
+        :param preview:
+            If ``True``, columns in ``preview_lengths`` are truncated - see
+            ``_get_preview_columns``.
+        :returns:
+            The query, the visible columns, and the ``nested`` value.
+        :raises MalformedQuery:
+            If the filters aren't valid.
+
+        """
+        visible_fields = split_params.visible_fields
+        nested: Union[bool, tuple[ForeignKey, ...]]
+        if visible_fields:
+            nested = tuple(
+                i._meta.call_chain[-1]
+                for i in visible_fields
+                if len(i._meta.call_chain) > 0
+            )
+        else:
+            visible_fields = self.table._meta.columns
+            nested = False
+
+        readable_columns = (
+            [
+                self.table._get_related_readable(i)
+                for i in visible_fields
+                if isinstance(i, ForeignKey)
+            ]
+            if split_params.include_readable
+            else []
+        )
+
+        visible_field_names = {
+            i._meta.get_default_alias() for i in visible_fields
+        }
+
+        selected_columns: list[Union[Column, QueryString]] = list(
+            visible_fields
+        )
+        if preview:
+            selected_columns = self._get_preview_columns(
+                columns=visible_fields, exclude_columns=extra_columns
+            )
+
+        query = self.table.select(
+            *selected_columns,
+            *[
+                i
+                for i in extra_columns
+                if i._meta.get_default_alias() not in visible_field_names
+            ],
+            *readable_columns,
+            exclude_secrets=self.exclude_secrets,
+        )
+
+        if nested:
+            query = query.output(nested=True)
+
+        query = cast(Select, self._apply_filters(query, split_params))
+
+        if order_by is None:
+            order_by = split_params.order_by or [
+                OrderBy(column=self.table._meta.primary_key, ascending=False)
+            ]
+
+        for _order_by in order_by:
+            query = query.order_by(
+                _order_by.column, ascending=_order_by.ascending
+            )
+
+        return query, visible_fields, nested
+
+    def _get_preview_columns(
+        self, columns: Sequence[Column], exclude_columns: Sequence[Column]
+    ) -> list[Union[Column, QueryString]]:
+        """
+        Swaps any columns in ``preview_lengths`` for the first ``n``
+        characters of their value, and a flag saying whether it was
+        truncated. This means large values are never fetched from the
+        database in the list view.
+
+        :param exclude_columns:
+            These are left as they are - for example, the columns used for
+            keyset pagination need their full values.
+
+        """
+        exclude_names = {i._meta.name for i in exclude_columns}
+        output: list[Union[Column, QueryString]] = []
+
+        for column in columns:
+            name = column._meta.name
+            length = self.preview_lengths.get(name)
+
+            if (
+                length is None
+                or column._meta.call_chain
+                or column._meta.secret
+                or name in exclude_names
+            ):
+                output.append(column)
+                continue
+
+            output.extend(
+                [
+                    QueryString(
+                        "SUBSTR(CAST({} AS TEXT), 1, {})",
+                        column,
+                        length,
+                        alias=name,
+                    ),
+                    QueryString(
+                        "LENGTH(CAST({} AS TEXT)) > {}",
+                        column,
+                        length,
+                        alias=f"{name}_truncated",
+                    ),
+                ]
+            )
+
+        return output
+
+    def _get_rows_data(
+        self,
+        rows: list[dict[str, Any]],
+        split_params: Params,
+        visible_fields: list[Column],
+        nested: Union[bool, tuple[ForeignKey, ...]],
+        hidden_names: Sequence[str] = (),
+    ) -> dict[str, Any]:
+        """
+        Serialises the rows using the Pydantic model, like
+        ``PiccoloCRUD.get_all`` does.
+
+        Truncated preview values aren't valid for the Pydantic model (for
+        example, a ``JSON`` value which has been cut short), so they bypass
+        it.
+
+        :param hidden_names:
+            Any values which were selected, but shouldn't be returned (for
+            example, the columns needed for keyset pagination).
+
+        """
+        preview_names = [
+            name
+            for name in self.preview_lengths
+            if rows and f"{name}_truncated" in rows[0]
+        ]
+
+        if self.json_backend == "orjson":
+            # The values come straight from the database, so validating them
+            # with Pydantic is mostly wasted effort - ``orjson`` serialises
+            # them in the same format.
+            # Secret columns aren't selected, but the Pydantic model returns
+            # them as ``null``.
+            missing_names = [
+                i._meta.name
+                for i in visible_fields
+                if rows
+                and not i._meta.call_chain
+                and i._meta.name not in rows[0]
+            ]
+            for row in rows:
+                for name in hidden_names:
+                    row.pop(name, None)
+                for name in missing_names:
+                    row[name] = None
+                for name in preview_names:
+                    row[f"{name}_truncated"] = bool(row[f"{name}_truncated"])
+            return {"rows": rows}
+
+        previews = [
+            {
+                name: (row.pop(name), bool(row.pop(f"{name}_truncated")))
+                for name in preview_names
+            }
+            for row in rows
+        ]
+
+        include_columns = tuple(
+            i
+            for i in visible_fields
+            if i._meta.call_chain or i._meta.name not in preview_names
+        )
+
+        if include_columns or not preview_names:
+            data = self.pydantic_model_plural(
+                include_readable=split_params.include_readable,
+                include_columns=include_columns,
+                nested=nested,
+            )(rows=rows).model_dump(mode="json")
+        else:
+            data = {"rows": [{} for _ in rows]}
+
+        for row_data, preview in zip(data["rows"], previews):
+            for name, (value, truncated) in preview.items():
+                row_data[name] = value
+                row_data[f"{name}_truncated"] = truncated
+
+        return data
+
+    def _get_page_size(self, split_params: Params) -> Optional[int]:
+        """
+        :returns:
+            ``None`` if the page size limit has been exceeded.
+        """
+        page_size = split_params.page_size or self.page_size
+        return None if page_size > self.max_page_size else page_size
+
+    def _dump_json(self, data: Any) -> Union[str, bytes]:
+        if self.json_backend == "orjson":
+            return dump_json_orjson(data)
+        return dump_json(data)
+
+    ###########################################################################
+
+    async def export(self, request: Request) -> Response:
+        """
+        Streams all rows matching the given query as a CSV or JSON Lines
+        file. It accepts the same filter, ``__order``, ``__visible_fields``
+        and ``__readable`` parameters as the root endpoint.
+
+        The rows are fetched from the database in batches, so memory usage
+        stays flat, no matter how many rows are being exported.
+
+        Two extra parameters are supported - ``__format`` (either ``'csv'``,
+        the default, or ``'jsonl'``), and ``__delimiter`` (either ``','``,
+        the default, or ``';'``), which only applies to CSV.
+
+        """
+        await self._run_validators(request=request, name="get_all")
+
+        params = self._clean_data(self._parse_params(request.query_params))
+
+        export_format = params.pop("__format", "csv")
+        if export_format not in EXPORT_FORMATS:
+            return Response(
+                f"Unrecognised __format argument - {export_format}",
+                status_code=400,
+            )
+
+        delimiter = params.pop("__delimiter", ",")
+        if delimiter not in EXPORT_DELIMITERS:
+            return Response(
+                f"Unrecognised __delimiter argument - {delimiter}",
+                status_code=400,
+            )
+
+        # Pagination doesn't make sense here, as we return everything.
+        for key in ("__page", "__page_size"):
+            params.pop(key, None)
+
+        try:
+            split_params = self._split_params(params)
+        except (ParamException, ValueError) as exception:
+            return Response(str(exception), status_code=400)
+
+        try:
+            query, _, _ = self._get_select_query(split_params)
+        except (MalformedQuery, ValueError) as exception:
+            return Response(str(exception), status_code=400)
+
+        tablename = self.table._meta.tablename
+
+        if export_format == "csv":
+            content = self._stream_csv(query=query, delimiter=delimiter)
+            media_type = "text/csv"
+        else:
+            content = self._stream_jsonl(query=query)
+            media_type = "application/jsonl"
+
+        return StreamingResponse(
+            content,
+            media_type=media_type,
+            headers={
+                "Content-Disposition": (
+                    f'attachment; filename="{tablename}.{export_format}"'
+                )
+            },
+        )
+
+    async def _iterate_batches(
+        self, query: Select
+    ) -> AsyncGenerator[list[dict[str, Any]], None]:
+        """
+        Fetches the rows using a database cursor, ``export_batch_size`` rows
+        at a time.
+        """
+        db = self.table._meta.db
+
+        if db.engine_type == "sqlite":
+            # ``SQLiteEngine.batch`` doesn't bind query parameters correctly,
+            # so we manage the cursor ourselves.
+            template, template_args = query.querystrings[0].compile_string(
+                engine_type="sqlite"
+            )
+            connection = await cast(SQLiteEngine, db).get_connection()
+            try:
+                cursor = await connection.execute(template, template_args)
+                while data := await cursor.fetchmany(self.export_batch_size):
+                    yield await query._process_results(data)
+                await cursor.close()
+            finally:
+                await connection.close()
+            return
+
+        batch = await query.batch(batch_size=self.export_batch_size)
+
+        # We don't use ``async with`` here, as the batch context manager
+        # swallows exceptions, including the ``GeneratorExit`` raised when
+        # the client disconnects mid-download.
+        await batch.__aenter__()
+        try:
+            async for rows in batch:
+                yield rows
+        finally:
+            await batch.__aexit__(None, None, None)
+
+    async def _stream_csv(
+        self, query: Select, delimiter: str
+    ) -> AsyncGenerator[str, None]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, delimiter=delimiter)
+        header_written = False
+
+        async for rows in self._iterate_batches(query):
+            for row in rows:
+                if not header_written:
+                    writer.writerow(row.keys())
+                    header_written = True
+                writer.writerow([self._get_csv_value(i) for i in row.values()])
+
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+
+    @staticmethod
+    def _get_csv_value(value: Any) -> str:
+        """
+        The values are formatted the same as the list endpoint's JSON (e.g.
+        timestamps are ISO 8601), except strings aren't quoted, and ``None``
+        is an empty cell.
+        """
+        if value is None:
+            return ""
+        if isinstance(value, str):
+            return value
+        value = pydantic_core.to_jsonable_python(value)
+        if isinstance(value, str):
+            return value
+        return dump_json(value)
+
+    async def _stream_jsonl(self, query: Select) -> AsyncGenerator[str, None]:
+        async for rows in self._iterate_batches(query):
+            yield "".join(f"{dump_json(row)}\n" for row in rows)
+
+    ###########################################################################
+    # Bulk endpoints
+
+    def _get_bulk_filters(self, data: dict[str, Any]) -> Optional[Params]:
+        """
+        The rows affected by a bulk operation are specified either using a
+        list of primary key values (``row_ids``), or using the same filters
+        as the root endpoint (``filters``).
+
+        :returns:
+            The filters, or ``None`` if ``row_ids`` were specified instead.
+        :raises ParamException:
+            If the request body is malformed.
+
+        """
+        row_ids = data.get("row_ids")
+        filters = data.get("filters")
+
+        if (row_ids is None) == (filters is None):
+            raise ParamException("Specify either `row_ids` or `filters`.")
+
+        if filters is None:
+            return None
+
+        if not isinstance(filters, dict) or not filters:
+            raise ParamException("`filters` must be a non-empty object.")
+
+        split_params = self._split_params(self._clean_data(filters))
+        if not split_params.fields:
+            # Otherwise every row would be affected.
+            raise ParamException("`filters` must contain at least one filter.")
+
+        return split_params
+
+    def _get_bulk_subquery(self, split_params: Params) -> Where:
+        """
+        Matches the rows using a subquery, so we don't have to load their
+        primary keys first.
+
+        :raises MalformedQuery:
+            If the filters aren't valid.
+
+        """
+        primary_key = self.table._meta.primary_key
+        return primary_key.is_in(
+            cast(
+                Select,
+                self._apply_filters(
+                    self.table.select(primary_key), split_params
+                ),
+            )
+        )
+
+    def _get_batches(self, values: list[Any]) -> list[list[Any]]:
+        size = self.bulk_batch_size
+        return [
+            values[i : i + size]  # noqa: E203
+            for i in range(0, len(values), size)
+        ]
+
+    async def _get_bulk_row_ids(
+        self, data: dict[str, Any], split_params: Optional[Params]
+    ) -> tuple[list[Any], list[dict[str, Any]]]:
+        """
+        :param split_params:
+            The filters returned by ``_get_bulk_filters``.
+        :returns:
+            The primary key values of the matching rows, and a list of errors
+            for any ``row_ids`` which are invalid, or don't exist.
+        :raises ParamException:
+            If the request body is malformed.
+        :raises MalformedQuery:
+            If the filters aren't valid.
+
+        """
+        primary_key = self.table._meta.primary_key
+
+        if split_params is not None:
+            query = self.table.select(primary_key).where(
+                self._get_bulk_subquery(split_params)
+            )
+            return await query.output(as_list=True).run(), []
+
+        row_ids = data["row_ids"]
+        if not isinstance(row_ids, list):
+            raise ParamException("`row_ids` must be a list.")
+
+        failed: list[dict[str, Any]] = []
+        valid_row_ids: list[Any] = []
+
+        for row_id in row_ids:
+            try:
+                valid_row_ids.append(primary_key.value_type(row_id))
+            except (ValueError, TypeError):
+                failed.append({"row_id": row_id, "error": "The ID is invalid"})
+
+        existing_row_ids: set[Any] = set()
+        for batch in self._get_batches(valid_row_ids):
+            existing_row_ids.update(
+                await self.table.select(primary_key)
+                .where(primary_key.is_in(batch))
+                .output(as_list=True)
+                .run()
+            )
+
+        for row_id in valid_row_ids:
+            if row_id not in existing_row_ids:
+                failed.append(
+                    {"row_id": row_id, "error": "The resource doesn't exist"}
+                )
+
+        return [i for i in valid_row_ids if i in existing_row_ids], failed
+
+    @staticmethod
+    def _get_hook_error(exception: Exception) -> str:
+        return (
+            str(exception.detail)
+            if isinstance(exception, HTTPException)
+            else str(exception)
+        )
+
+    def _bulk_response(
+        self, succeeded: list[Any], failed: list[dict[str, Any]]
+    ) -> Response:
+        return CustomJSONResponse(
+            dump_json({"succeeded": succeeded, "failed": failed})
+        )
+
+    def _hash_password(self, values: dict[Any, Any]) -> dict[Any, Any]:
+        """
+        If the table is a ``BaseUser`` subclass, any new password is hashed.
+
+        :raises ValueError:
+            If the password isn't valid.
+
+        """
+        cls = self.table
+        if issubclass(cls, BaseUser):
+            if password := values.pop("password", None):
+                cls._validate_password(password)
+                values["password"] = cls.hash_password(password)
+        return values
+
+    @_clears_ids_cache
+    @db_exception_handler
+    async def bulk_update(self, request: Request) -> Response:
+        """
+        Updates many rows using a single ``UPDATE ... WHERE pk IN (...)``
+        query, rather than the client making a ``PATCH`` request per row.
+
+        The request body contains ``data`` (the values to set), and either
+        ``row_ids`` or ``filters``, for example::
+
+            {"row_ids": [1, 2, 3], "data": {"rating": 10}}
+
+        The ``patch_single`` validators and ``pre_patch`` hooks still run. If
+        a hook rejects a row (by raising a ``ValueError`` or
+        ``HTTPException``) it is reported in ``failed``, and the remaining
+        rows are still updated.
+
+        If ``filters`` are used, and there are no hooks, the rows are matched
+        using a subquery instead, so their primary keys aren't loaded first.
+        Otherwise, the primary keys are sent in batches of
+        ``bulk_batch_size``.
+
+        """
+        await self._run_validators(request=request, name="patch_single")
+
+        data = await request.json()
+        if not isinstance(data, dict) or not isinstance(
+            data.get("data"), dict
+        ):
+            return Response("`data` must be an object.", status_code=400)
+
+        values_data = data["data"]
+        cleaned_data = self._clean_data(values_data)
+
+        try:
+            model = self.pydantic_model_optional(**cleaned_data)
+        except pydantic.ValidationError as exception:
+            return Response(str(exception), status_code=400)
+
+        cls = self.table
+
+        try:
+            values = {
+                getattr(cls, key): getattr(model, key)
+                for key in values_data.keys()
+            }
+        except AttributeError:
+            unrecognised_keys = set(values_data.keys()) - set(
+                model.model_dump().keys()
+            )
+            return Response(
+                f"Unrecognised keys - {unrecognised_keys}.",
+                status_code=400,
+            )
+
+        primary_key = cls._meta.primary_key
+
+        try:
+            split_params = self._get_bulk_filters(data)
+            if split_params is not None and not self._hook_map:
+                # There are no hooks to run for each row, so the rows can be
+                # updated using the filters directly.
+                response = (
+                    await cls.update(self._hash_password(dict(values)))
+                    .where(self._get_bulk_subquery(split_params))
+                    .returning(primary_key)
+                    .run()
+                )
+                return self._bulk_response(
+                    succeeded=[i[primary_key._meta.name] for i in response],
+                    failed=[],
+                )
+
+            row_ids, failed = await self._get_bulk_row_ids(data, split_params)
+        except (ParamException, MalformedQuery, ValueError) as exception:
+            return Response(str(exception), status_code=400)
+
+        # Hooks can modify the values for each row, so we group together the
+        # rows which end up with the same values - normally there's just one
+        # group, and hence one query.
+        groups: list[tuple[dict[Any, Any], list[Any]]] = []
+
+        for row_id in row_ids:
+            row_values = values
+            if self._hook_map:
+                try:
+                    row_values = await execute_patch_hooks(
+                        hooks=self._hook_map,
+                        hook_type=HookType.pre_patch,
+                        row_id=row_id,
+                        values=dict(values),
+                        request=request,
+                    )
+                except (ValueError, HTTPException) as exception:
+                    failed.append(
+                        {
+                            "row_id": row_id,
+                            "error": self._get_hook_error(exception),
+                        }
+                    )
+                    continue
+
+            for group_values, group_row_ids in groups:
+                if group_values == row_values:
+                    group_row_ids.append(row_id)
+                    break
+            else:
+                groups.append((row_values, [row_id]))
+
+        try:
+            groups = [
+                (self._hash_password(group_values), group_row_ids)
+                for group_values, group_row_ids in groups
+            ]
+        except ValueError as exception:
+            return Response(str(exception), status_code=400)
+
+        async with cls._meta.db.transaction():
+            for group_values, group_row_ids in groups:
+                for batch in self._get_batches(group_row_ids):
+                    await cls.update(group_values).where(
+                        primary_key.is_in(batch)
+                    ).run()
+
+        return self._bulk_response(
+            succeeded=[i for _, group in groups for i in group],
+            failed=failed,
+        )
+
+    @_clears_ids_cache
+    @db_exception_handler
+    async def bulk_delete(self, request: Request) -> Response:
+        """
+        Deletes many rows using a single ``DELETE ... WHERE pk IN (...)``
+        query, rather than the client making a ``DELETE`` request per row.
+
+        The request body contains either ``row_ids`` or ``filters``, for
+        example::
+
+            {"row_ids": [1, 2, 3]}
+
+        The ``delete_single`` validators and ``pre_delete`` hooks still run.
+        If a hook rejects a row (by raising a ``ValueError`` or
+        ``HTTPException``) it is reported in ``failed``, and the remaining
+        rows are still deleted.
+
+        As with ``bulk_update``, ``filters`` are applied using a subquery if
+        there are no hooks, otherwise the primary keys are sent in batches.
+
+        """
+        await self._run_validators(request=request, name="delete_single")
+
+        data = await request.json()
+        if not isinstance(data, dict):
+            return Response("The body must be an object.", status_code=400)
+
+        primary_key = self.table._meta.primary_key
+
+        try:
+            split_params = self._get_bulk_filters(data)
+            if split_params is not None and not self._hook_map:
+                # There are no hooks to run for each row, so the rows can be
+                # deleted using the filters directly.
+                response = (
+                    await self.table.delete()
+                    .where(self._get_bulk_subquery(split_params))
+                    .returning(primary_key)
+                    .run()
+                )
+                return self._bulk_response(
+                    succeeded=[i[primary_key._meta.name] for i in response],
+                    failed=[],
+                )
+
+            row_ids, failed = await self._get_bulk_row_ids(data, split_params)
+        except (ParamException, MalformedQuery, ValueError) as exception:
+            return Response(str(exception), status_code=400)
+
+        succeeded: list[Any] = []
+
+        for row_id in row_ids:
+            if self._hook_map:
+                try:
+                    await execute_delete_hooks(
+                        hooks=self._hook_map,
+                        hook_type=HookType.pre_delete,
+                        row_id=row_id,
+                        request=request,
+                    )
+                except (ValueError, HTTPException) as exception:
+                    failed.append(
+                        {
+                            "row_id": row_id,
+                            "error": self._get_hook_error(exception),
+                        }
+                    )
+                    continue
+
+            succeeded.append(row_id)
+
+        async with self.table._meta.db.transaction():
+            for batch in self._get_batches(succeeded):
+                await self.table.delete().where(primary_key.is_in(batch)).run()
+
+        return self._bulk_response(succeeded=succeeded, failed=failed)
+
+    ###########################################################################
+    # Keyset pagination
+
+    def _get_keyset_order_by(
+        self, order_by: Optional[list[OrderBy]]
+    ) -> Optional[list[OrderBy]]:
+        """
+        The primary key is always added to the ordering, so each row has a
+        unique position.
+
+        :returns:
+            ``None`` if the ordering can't be used for keyset pagination -
+            for example, if it contains nullable columns or joins.
+
+        """
+        order_by = list(order_by or self.order_by)
+        primary_key = self.table._meta.primary_key
+
+        if not any(
+            i.column._meta.name == primary_key._meta.name for i in order_by
+        ):
+            order_by.append(OrderBy(column=primary_key, ascending=True))
+
+        for _order_by in order_by:
+            column = _order_by.column
+            if (
+                column._meta.null
+                or column._meta.call_chain
+                or column.value_type in (list, dict)
+            ):
+                return None
+
+        return order_by
+
+    @staticmethod
+    def _get_cursor_order(order_by: list[OrderBy]) -> list[str]:
+        """
+        We store the ordering in the cursor, so it can't be used with a
+        different ordering by mistake.
+        """
+        return [
+            ("" if i.ascending else "-") + i.column._meta.get_default_alias()
+            for i in order_by
+        ]
+
+    @staticmethod
+    def _encode_cursor(
+        order_by: list[OrderBy], row: dict[str, Any], forwards: bool
+    ) -> str:
+        values = [
+            pydantic.TypeAdapter(i.column.value_type).dump_python(
+                row[i.column._meta.get_default_alias()], mode="json"
+            )
+            for i in order_by
+        ]
+        data = {
+            "d": "n" if forwards else "p",
+            "o": AdminCRUD._get_cursor_order(order_by),
+            "v": values,
+        }
+        return (
+            base64.urlsafe_b64encode(json.dumps(data).encode())
+            .decode()
+            .rstrip("=")
+        )
+
+    @staticmethod
+    def _decode_cursor(
+        order_by: list[OrderBy], cursor: str
+    ) -> tuple[list[Any], bool]:
+        """
+        :returns:
+            The values for each ``order_by`` column, and whether we're going
+            forwards.
+        :raises CursorException:
+            If the cursor is malformed, or was created using a different
+            ordering.
+
+        """
+        try:
+            data = json.loads(
+                base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            )
+            if data["o"] != AdminCRUD._get_cursor_order(order_by) or data[
+                "d"
+            ] not in ("n", "p"):
+                raise ValueError("The cursor doesn't match the ordering.")
+
+            values: list[Any] = [
+                pydantic.TypeAdapter(i.column.value_type).validate_python(
+                    value
+                )
+                for i, value in zip(order_by, data["v"], strict=True)
+            ]
+        except (ValueError, TypeError, KeyError) as exception:
+            raise CursorException(
+                f"Unrecognised __cursor argument - {exception}"
+            )
+
+        return values, data["d"] == "n"
+
+    @staticmethod
+    def _get_keyset_where(
+        order_by: list[OrderBy], values: list[Any], forwards: bool
+    ):
+        """
+        For ``ORDER BY a, b`` this gives
+        ``WHERE (a > x) OR (a = x AND b > y)``, flipping the comparison
+        operators for descending columns, or when going backwards.
+        """
+        clauses = []
+
+        for index, (_order_by, value) in enumerate(zip(order_by, values)):
+            column = _order_by.column
+            clause = (
+                column > value
+                if _order_by.ascending == forwards
+                else column < value
+            )
+            for previous_order_by, previous_value in zip(
+                order_by[:index], values[:index]
+            ):
+                clause = clause & (previous_order_by.column == previous_value)
+            clauses.append(clause)
+
+        return functools.reduce(operator.or_, clauses)
+
+    async def get_all(
+        self, request: Request, params: Optional[dict[str, Any]] = None
+    ) -> Response:
+        """
+        When using keyset pagination, each page costs about the same to fetch,
+        no matter how deep it is, as we don't use ``OFFSET``.
+
+        The ``__page`` param is still supported (for jumping to a specific
+        page), but the ``next_cursor`` and ``previous_cursor`` values in the
+        response should be used for moving to the adjacent pages.
+
+        If ``__count=true`` is passed in, the response also contains
+        ``count`` and ``estimated`` (the same as ``get_count``), so the UI
+        only needs to make a single request. The rows and count queries are
+        run concurrently.
+
+        If ``__listing=true`` is passed in, and ``__visible_fields`` isn't,
+        then only the ``list_columns`` are selected. Wide tables often have
+        large ``Text`` or ``JSON`` columns which aren't shown in the list
+        view, so there's no point fetching and serialising them.
+        """
+        params = dict(params) if params else {}
+        include_count = params.pop("__count", None)
+        listing = params.pop("__listing", None)
+        preview = False
+
+        if listing is not None:
+            if str(listing).lower() not in ("true", "false"):
+                return Response(
+                    f"Unrecognised __listing argument - {listing}",
+                    status_code=400,
+                )
+
+            if str(listing).lower() == "true":
+                params.setdefault("__visible_fields", self.list_column_names)
+                preview = True
+
+        if include_count is None:
+            return await self._get_rows(
+                request=request, params=params, preview=preview
+            )
+
+        if str(include_count).lower() not in ("true", "false"):
+            return Response(
+                f"Unrecognised __count argument - {include_count}",
+                status_code=400,
+            )
+
+        if str(include_count).lower() == "false":
+            return await self._get_rows(
+                request=request, params=params, preview=preview
+            )
+
+        return await self._get_rows_and_count(
+            request=request, params=params, preview=preview
+        )
+
+    async def _get_rows_and_count(
+        self, request: Request, params: dict[str, Any], preview: bool = False
+    ) -> Response:
+        await self._run_validators(request=request, name="get_count")
+
+        # The cursor and pagination params don't affect the count.
+        count_params = {
+            key: value
+            for key, value in params.items()
+            if key not in ("__cursor", "__page", "__page_size")
+        }
+        try:
+            split_params = self._split_params(self._clean_data(count_params))
+        except (ParamException, ValueError) as exception:
+            return Response(str(exception), status_code=400)
+
+        # Each query gets its own connection from the pool, so they run in
+        # parallel.
+        try:
+            page, (count, estimated) = await asyncio.gather(
+                self._get_page(
+                    request=request, params=params, preview=preview
+                ),
+                self._get_count(split_params),
+            )
+        except MalformedQuery as exception:
+            return Response(str(exception), status_code=400)
+
+        headers: dict[str, str] = {}
+
+        if isinstance(page, Response):
+            if page.status_code != 200:
+                return page
+
+            # It was serialised by ``PiccoloCRUD``.
+            headers = {
+                key: value
+                for key, value in page.headers.items()
+                if key.lower() == "content-range"
+            }
+            page = load_json(bytes(page.body))
+
+        page.update(count=count, page_size=self.page_size, estimated=estimated)
+        return CustomJSONResponse(self._dump_json(page), headers=headers)
+
+    async def _get_rows(
+        self, request: Request, params: dict[str, Any], preview: bool = False
+    ) -> Response:
+        page = await self._get_page(
+            request=request, params=params, preview=preview
+        )
+        if isinstance(page, Response):
+            return page
+        return CustomJSONResponse(self._dump_json(page))
+
+    async def _get_page(
+        self, request: Request, params: dict[str, Any], preview: bool = False
+    ) -> Union[Response, dict[str, Any]]:
+        """
+        :returns:
+            The page of rows, or a ``Response`` if there's an error, or
+            ``PiccoloCRUD`` handled the request.
+        :param preview:
+            If ``True``, the ``preview_lengths`` are applied, in which case we
+            always build the query ourselves, even with offset pagination.
+            We also do this when using ``orjson``.
+        """
+        preview = preview and bool(self.preview_lengths)
+        own_query = preview or self.json_backend == "orjson"
+
+        if self.pagination != "keyset" and not own_query:
+            return await super().get_all(request=request, params=params)
+
+        params = self._clean_data(params) if params else {}
+        cursor = params.pop("__cursor", None)
+
+        try:
+            split_params = self._split_params(params)
+        except (ParamException, ValueError):
+            # Let ``PiccoloCRUD`` return the error response.
+            return await super().get_all(request=request, params=params)
+
+        order_by = (
+            self._get_keyset_order_by(split_params.order_by)
+            if self.pagination == "keyset"
+            else None
+        )
+        if order_by is None:
+            if own_query:
+                return await self._get_offset_rows(
+                    request=request,
+                    split_params=split_params,
+                    preview=preview,
+                )
+
+            # Keyset pagination isn't possible with this ordering.
+            return await super().get_all(request=request, params=params)
+
+        await self._run_validators(request=request, name="get_all")
+
+        page_size = self._get_page_size(split_params)
+        if page_size is None:
+            return JSONResponse(
+                {"error": "The page size limit has been exceeded"},
+                status_code=403,
+            )
+
+        forwards = True
+        values: Optional[list[Any]] = None
+        if cursor:
+            try:
+                values, forwards = self._decode_cursor(order_by, cursor)
+            except CursorException as exception:
+                return Response(str(exception), status_code=400)
+
+        query_order_by = (
+            order_by
+            if forwards
+            else [
+                OrderBy(column=i.column, ascending=not i.ascending)
+                for i in order_by
+            ]
+        )
+
+        try:
+            query, visible_fields, nested = self._get_select_query(
+                split_params,
+                order_by=query_order_by,
+                extra_columns=[i.column for i in order_by],
+                preview=preview,
+            )
+        except (MalformedQuery, ValueError) as exception:
+            return Response(str(exception), status_code=400)
+
+        # We fetch an extra row, so we know if there's another page.
+        query = query.limit(page_size + 1)
+
+        if values is not None:
+            query = query.where(
+                self._get_keyset_where(order_by, values, forwards)
+            )
+        elif split_params.page > 1:
+            query = query.offset(page_size * (split_params.page - 1))
+
+        rows = await query.run()
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+
+        if not forwards:
+            rows.reverse()
+
+        if forwards:
+            has_next = has_more
+            has_previous = values is not None or split_params.page > 1
+        else:
+            has_next = True
+            has_previous = has_more
+
+        next_cursor = (
+            self._encode_cursor(order_by, rows[-1], forwards=True)
+            if rows and has_next
+            else None
+        )
+        previous_cursor = (
+            self._encode_cursor(order_by, rows[0], forwards=False)
+            if rows and has_previous
+            else None
+        )
+
+        visible_field_names = {
+            i._meta.get_default_alias() for i in visible_fields
+        }
+        data = self._get_rows_data(
+            rows=rows,
+            split_params=split_params,
+            visible_fields=visible_fields,
+            nested=nested,
+            hidden_names=[
+                i.column._meta.get_default_alias()
+                for i in order_by
+                if i.column._meta.get_default_alias()
+                not in visible_field_names
+            ],
+        )
+        data["next_cursor"] = next_cursor
+        data["previous_cursor"] = previous_cursor
+
+        return data
+
+    async def _get_offset_rows(
+        self, request: Request, split_params: Params, preview: bool = False
+    ) -> Union[Response, dict[str, Any]]:
+        """
+        The equivalent of ``PiccoloCRUD.get_all``, but using our own query,
+        so the ``preview_lengths`` and ``json_backend`` can be applied.
+        """
+        await self._run_validators(request=request, name="get_all")
+
+        page_size = self._get_page_size(split_params)
+        if page_size is None:
+            return JSONResponse(
+                {"error": "The page size limit has been exceeded"},
+                status_code=403,
+            )
+
+        try:
+            query, visible_fields, nested = self._get_select_query(
+                split_params, preview=preview
+            )
+        except (MalformedQuery, ValueError) as exception:
+            return Response(str(exception), status_code=400)
+
+        query = query.limit(page_size)
+        if split_params.page > 1:
+            query = query.offset(page_size * (split_params.page - 1))
+
+        rows = await query.run()
+
+        return self._get_rows_data(
+            rows=rows,
+            split_params=split_params,
+            visible_fields=visible_fields,
+            nested=nested,
+        )
+
+    ###########################################################################
+
+    async def _get_estimated_count(
+        self, split_params: Params
+    ) -> Optional[int]:
+        """
+        Uses the Postgres query planner to estimate the number of rows, which
+        is much faster than ``COUNT(*)`` on large tables.
+
+        :returns:
+            ``None`` if an estimate isn't available - for example, if the
+            table hasn't been analysed yet, or we're not using Postgres.
+
+        """
+        if not isinstance(self.table._meta.db, PostgresEngine):
+            return None
+
+        if split_params.fields:
+            query = self._apply_filters(
+                self.table.select(self.table._meta.primary_key), split_params
+            )
+            response = await self.table.raw(
+                "EXPLAIN (FORMAT JSON) {}", query.querystrings[0]
+            )
+            plan = response[0]["QUERY PLAN"]
+            if isinstance(plan, str):
+                plan = load_json(plan)
+            return int(plan[0]["Plan"]["Plan Rows"])
+
+        response = await self.table.raw(
+            "SELECT reltuples::bigint AS estimate FROM pg_class "
+            "WHERE oid = to_regclass({})",
+            self.table._meta.get_formatted_tablename(),
+        )
+        # ``reltuples`` is -1 if the table has never been analysed.
+        if not response or response[0]["estimate"] < 0:
+            return None
+
+        return response[0]["estimate"]
+
+    async def _get_exact_count(self, split_params: Params) -> int:
+        query = self._apply_filters(self.table.count(), split_params)
+        return cast(int, await query.run())
+
+    async def _get_cached_count(self, split_params: Params) -> int:
+        """
+        Counts are cached for each combination of filters, for
+        ``count_cache_ttl`` seconds.
+        """
+        # The operators and match types change the results too, so they're
+        # part of the key.
+        key = dump_json(
+            sorted(
+                (
+                    name,
+                    value,
+                    split_params.operators[name].__name__,
+                    split_params.match_types[name],
+                )
+                for name, value in split_params.fields.items()
+            )
+        )
+        now = time.monotonic()
+
+        cached = self._count_cache.get(key)
+        if cached is not None and cached[0] > now:
+            return cached[1]
+
+        count = await self._get_exact_count(split_params)
+
+        if len(self._count_cache) >= self.count_cache_size:
+            self._count_cache = {
+                k: v for k, v in self._count_cache.items() if v[0] > now
+            }
+            if len(self._count_cache) >= self.count_cache_size:
+                # Dictionaries are ordered, so this is the oldest entry.
+                del self._count_cache[next(iter(self._count_cache))]
+
+        self._count_cache[key] = (now + self.count_cache_ttl, count)
+        return count
+
+    async def _get_count(
+        self, split_params: Params
+    ) -> tuple[Optional[int], bool]:
+        """
+        :returns:
+            The count (``None`` if ``count_strategy`` is ``'none'``), and
+            whether it's estimated.
+        :raises MalformedQuery:
+            If the filters aren't valid.
+
+        """
+        count: Optional[int] = None
+        estimated = False
+
+        if self.count_strategy == "estimate":
+            count = await self._get_estimated_count(split_params)
+            estimated = count is not None
+        elif self.count_strategy == "cached":
+            count = await self._get_cached_count(split_params)
+            estimated = True
+
+        if count is None and self.count_strategy != "none":
+            count = await self._get_exact_count(split_params)
+            estimated = False
+
+        return count, estimated
+
+    @apply_validators
+    async def get_count(self, request: Request) -> Response:
+        """
+        Returns the number of rows matching the filters. How it's calculated
+        depends on ``count_strategy``:
+
+        * ``'exact'`` - ``COUNT(*)`` is run each time.
+        * ``'estimate'`` - the Postgres query planner's estimate is used.
+          Falls back to an exact count if there's no estimate.
+        * ``'cached'`` - exact counts are cached for ``count_cache_ttl``
+          seconds.
+        * ``'none'`` - no count is returned.
+
+        The response also contains ``estimated``, so the UI knows whether
+        the count is approximate.
+
+        """
+        params = self._parse_params(request.query_params)
+
+        try:
+            split_params = self._split_params(params)
+        except ParamException as exception:
+            return Response(str(exception), status_code=400)
+
+        try:
+            count, estimated = await self._get_count(split_params)
+        except MalformedQuery as exception:
+            return Response(str(exception), status_code=400)
+
+        return JSONResponse(
+            {
+                "count": count,
+                "page_size": self.page_size,
+                "estimated": estimated,
+            }
+        )
+
+    ###########################################################################
+
+    post_single = _clears_ids_cache(PiccoloCRUD.post_single)
+    put_single = _clears_ids_cache(PiccoloCRUD.put_single)
+    patch_single = _clears_ids_cache(PiccoloCRUD.patch_single)
+    delete_single = _clears_ids_cache(PiccoloCRUD.delete_single)
+    delete_all = _clears_ids_cache(PiccoloCRUD.delete_all)
+
+    def _get_search_strategy(self) -> SearchStrategy:
+        """
+        Trigram and full text search are only available in Postgres, so we
+        fall back to ``'contains'`` for other databases (e.g. SQLite in
+        development).
+        """
+        if self.search_strategy in ("trigram", "fulltext") and not (
+            isinstance(self.table._meta.db, PostgresEngine)
+        ):
+            return "contains"
+        return self.search_strategy
+
+    @staticmethod
+    def _escape_like(value: str) -> str:
+        return (
+            value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        )
+
+    @staticmethod
+    def _get_tsquery(search_term: str) -> str:
+        """
+        Each word in the search term has to match the start of a word, so
+        results appear as the user types.
+        """
+        return " & ".join(f"{i}:*" for i in re.findall(r"\w+", search_term))
+
+    def _get_ids_query(
+        self, search_term: Optional[str], limit: Optional[int], offset: int
+    ) -> QueryString:
+        """
+        ``PiccoloCRUD`` is used for the ``'contains'`` search strategy, unless
+        ``json_backend`` is ``'orjson'`` - in which case, this returns the
+        same results as ``PiccoloCRUD``.
+        """
+        readable = self.table.get_readable()
+        columns: list[Any] = [self.table._meta.primary_key, readable]
+        is_postgres = isinstance(self.table._meta.db, PostgresEngine)
+        search_strategy = self._get_search_strategy()
+
+        # If the readable is a single text column, we filter on the column
+        # directly rather than the formatted value, so an index can be used.
+        search_value = "subquery.readable"
+        if (
+            search_strategy != "contains"
+            and len(readable.columns) == 1
+            and isinstance(readable.columns[0], (Varchar, Text))
+        ):
+            columns.append(readable.columns[0].as_alias("search_value"))
+            search_value = "subquery.search_value"
+
+        query = self.table.select(*columns)
+
+        order_by = ""
+        values: list[Any]
+
+        if search_term is None:
+            where = ""
+            values = []
+        elif search_strategy == "contains":
+            # The same as ``PiccoloCRUD`` - wildcards in the search term
+            # aren't escaped.
+            if is_postgres:
+                where = f" WHERE {search_value} ILIKE {{}}"
+                values = [f"%{search_term}%"]
+            else:
+                where = f" WHERE UPPER({search_value}) LIKE {{}}"
+                values = [f"%{search_term.upper()}%"]
+        elif search_strategy == "trigram":
+            # The ``pg_trgm`` GIN / GiST indexes support ``ILIKE``.
+            where = f" WHERE {search_value} ILIKE {{}}"
+            order_by = f" ORDER BY similarity({search_value}, {{}}) DESC"
+            values = [f"%{self._escape_like(search_term)}%", search_term]
+        elif search_strategy == "fulltext":
+            where = (
+                f" WHERE to_tsvector('simple', {search_value}) "
+                "@@ to_tsquery('simple', {})"
+            )
+            values = [self._get_tsquery(search_term)]
+        else:
+            # Only a trailing wildcard, so a B-tree index can be used.
+            escape = "" if is_postgres else " ESCAPE '\\'"
+            where = f" WHERE {search_value} LIKE {{}}{escape}"
+            values = [f"{self._escape_like(search_term)}%"]
+
+        if limit is not None:
+            pagination = f" LIMIT {limit} OFFSET {offset}"
+        elif offset:
+            pagination = (
+                f" LIMIT ALL OFFSET {offset}"
+                if is_postgres
+                else f" LIMIT -1 OFFSET {offset}"
+            )
+        else:
+            pagination = ""
+
+        return QueryString(
+            f"SELECT * FROM ({{}}) AS subquery{where}"
+            f"{order_by}{pagination}",
+            query.querystrings[0],
+            *values,
+        )
+
+    async def _get_ids_response(self, request: Request) -> Response:
+        search_term = request.query_params.get("search")
+
+        if self.json_backend != "orjson" and (
+            search_term is None or self._get_search_strategy() == "contains"
+        ):
+            # The validators have already been run.
+            return await inspect.unwrap(PiccoloCRUD.get_ids)(self, request)
+
+        limit: Optional[int] = None
+        offset = 0
+
+        try:
+            if "limit" in request.query_params:
+                limit = int(request.query_params["limit"])
+        except ValueError:
+            return Response("The limit must be an integer", status_code=400)
+
+        try:
+            if "offset" in request.query_params:
+                offset = int(request.query_params["offset"])
+        except ValueError:
+            return Response("The offset must be an integer", status_code=400)
+
+        if (
+            search_term is not None
+            and self._get_search_strategy() == "fulltext"
+            and not self._get_tsquery(search_term)
+        ):
+            # There aren't any words to search for.
+            values = []
+        else:
+            querystring = self._get_ids_query(
+                search_term, limit=limit, offset=offset
+            )
+            values = await self.table.raw("{}", querystring).run()
+
+        primary_key_name = self.table._meta.primary_key._meta.name
+        data = {str(i[primary_key_name]): i["readable"] for i in values}
+
+        if self.json_backend == "orjson":
+            return CustomJSONResponse(dump_json_orjson(data))
+        return JSONResponse(data)
+
+    @apply_validators
+    async def get_ids(self, request: Request) -> Response:
+        """
+        Returns the IDs for the current table, mapped to a readable
+        representation e.g. ``{'1': 'joebloggs'}``. Used by the foreign key
+        selectors in the UI.
+
+        The optional ``search`` param filters the results, using the
+        ``search_strategy``:
+
+        * ``'contains'`` - a case insensitive ``LIKE '%term%'`` on the
+          formatted readable (the default, which is the same as
+          ``PiccoloCRUD``). It can't use a B-tree index, so scans the whole
+          table.
+        * ``'prefix'`` - ``LIKE 'term%'``, which can use a B-tree index (in
+          Postgres, it needs to use ``text_pattern_ops``, unless the
+          database uses the ``C`` collation). It's case sensitive in
+          Postgres.
+        * ``'trigram'`` - a case insensitive ``ILIKE '%term%'``, which can
+          use a ``pg_trgm`` GIN index, with the closest matches first.
+        * ``'fulltext'`` - each word in the search term has to match the
+          start of a word, using ``to_tsvector('simple', ...)``, which can
+          use a GIN index on the same expression.
+
+        Trigram and full text search need Postgres - otherwise ``'contains'``
+        is used instead.
+
+        For ``'prefix'``, ``'trigram'`` and ``'fulltext'``, if the table's
+        readable is a single ``Varchar`` or ``Text`` column, the column is
+        searched directly, ignoring any other text in the readable's
+        template. Otherwise, the formatted readable value is searched, which
+        needs an expression index.
+
+        The optional ``limit`` and ``offset`` params are used for
+        pagination.
+
+        If ``ids_cache_ttl`` is set, the responses are cached for that many
+        seconds, so repeated searches (e.g. when the user deletes a
+        character) don't hit the database. The cache is cleared whenever rows
+        are added, changed or deleted using this ``AdminCRUD`` - changes made
+        elsewhere (e.g. by another worker, a form, or to a table used by the
+        readable) are only picked up once the TTL has passed.
+
+        """
+        if self.ids_cache_ttl is None:
+            return await self._get_ids_response(request)
+
+        key = tuple(
+            request.query_params.get(i) for i in ("search", "limit", "offset")
+        )
+        now = time.monotonic()
+
+        cached = self._ids_cache.get(key)
+        if cached is not None and cached[0] > now:
+            self._ids_cache.move_to_end(key)
+            return Response(cached[1], media_type="application/json")
+
+        response = await self._get_ids_response(request)
+
+        if response.status_code == 200:
+            self._ids_cache[key] = (
+                now + self.ids_cache_ttl,
+                bytes(response.body),
+            )
+            self._ids_cache.move_to_end(key)
+            while len(self._ids_cache) > self.ids_cache_size:
+                self._ids_cache.popitem(last=False)
+
+        return response
+
+    ###########################################################################
+
+    def _get_referencing_columns(self) -> list[ForeignKey]:
+        if self.referencing_columns is not None:
+            return self.referencing_columns
+        return list(self.table._meta.foreign_key_references)
+
+    @functools.cached_property
+    def _references_response(self) -> CachedResponse:
+        return CachedResponse.from_json(
+            {
+                "references": [
+                    {
+                        "tableName": i._meta.table._meta.tablename,
+                        "columnName": i._meta.name,
+                    }
+                    for i in self._get_referencing_columns()
+                ]
+            }
+        )
+
+    async def get_references(self, request: Request) -> Response:
+        """
+        Returns a list of tables with foreign keys to this table, along with
+        the name of the foreign key column.
+
+        It only depends on the table classes, so is only serialised once.
+        Clients which send ``If-None-Match`` get a ``304`` response.
+        """
+        return self._references_response.to_response(request)
+
+    def _get_reference_count_querystring(
+        self, column: ForeignKey, row_id: Any, index: int
+    ) -> QueryString:
+        """
+        Counts the rows in the column's table which reference the given row.
+        """
+        primary_key = self.table._meta.primary_key
+        target_column = column._foreign_key_meta.resolved_target_column
+        tablename = self.table._meta.get_formatted_tablename()
+
+        if target_column._meta.name == primary_key._meta.name:
+            value = QueryString("{}", row_id)
+        else:
+            # The foreign key references a different column, so we need to
+            # look up its value.
+            value = QueryString(
+                f'(SELECT "{target_column._meta.db_column_name}" '
+                f"FROM {tablename} "
+                f'WHERE "{primary_key._meta.db_column_name}" = {{}})',
+                row_id,
+            )
+
+        return QueryString(
+            f'SELECT {index} AS "index", COUNT(*) AS "count" '
+            f"FROM {column._meta.table._meta.get_formatted_tablename()} "
+            f'WHERE "{column._meta.db_column_name}" = {{}}',
+            value,
+        )
+
+    async def _get_reference_counts(
+        self, columns: Sequence[ForeignKey], row_id: Any
+    ) -> list[int]:
+        """
+        Counts the rows which reference the given row, for each of the
+        columns. Rather than a query per column, they're combined using
+        ``UNION ALL`` (one query per database, if the tables are stored in
+        several).
+        """
+        counts = [0] * len(columns)
+
+        groups: dict[int, list[int]] = {}
+        for index, column in enumerate(columns):
+            groups.setdefault(id(column._meta.table._meta.db), []).append(
+                index
+            )
+
+        for indexes in groups.values():
+            querystrings = [
+                self._get_reference_count_querystring(
+                    columns[index], row_id=row_id, index=index
+                )
+                for index in indexes
+            ]
+            response = await (
+                columns[indexes[0]]
+                ._meta.table.raw(
+                    " UNION ALL ".join("{}" for _ in querystrings),
+                    *querystrings,
+                )
+                .run()
+            )
+            for row in response:
+                counts[row["index"]] = row["count"]
+
+        return counts
+
+    async def get_reference_counts(
+        self, request: Request, row_id: str
+    ) -> Response:
+        """
+        The same as ``get_references``, but each reference also has a
+        ``count`` of how many rows reference the given row.
+        """
+        await self._run_validators(request, "get_single")
+
+        try:
+            row_id = self.table._meta.primary_key.value_type(row_id)
+        except ValueError:
+            return Response("The ID is invalid", status_code=400)
+
+        columns = self._get_referencing_columns()
+        counts = await self._get_reference_counts(columns, row_id=row_id)
+
+        return JSONResponse(
+            {
+                "references": [
+                    {
+                        "tableName": column._meta.table._meta.tablename,
+                        "columnName": column._meta.name,
+                        "count": count,
+                    }
+                    for column, count in zip(columns, counts)
+                ]
+            }
+        )
+
+    ###########################################################################
+
+    @functools.cached_property
+    def _schema_response(self) -> CachedResponse:
+        return CachedResponse.from_json(
+            self.pydantic_model.model_json_schema()
+        )
+
+    async def get_schema(self, request: Request) -> Response:
+        """
+        The schema can't change while the app is running, so rather than
+        generating it for each request, it's only generated once. Clients
+        which send ``If-None-Match`` get a ``304`` response.
+        """
+        return self._schema_response.to_response(request)
@@ -4,29 +4,48 @@ Creates a basic wrapper around a Piccolo model, turning it into an ASGI app.
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
+import functools
+import hashlib
 import inspect
 import io
 import itertools
 import json
 import logging
 import os
-from collections.abc import Callable, Coroutine, Sequence
+import pathlib
+import re
+from collections.abc import (
+    AsyncGenerator,
+    AsyncIterable,
+    Callable,
+    Coroutine,
+    Iterable,
+    Sequence,
+)
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from datetime import timedelta
 from functools import partial
-from typing import Any, Optional, TypeVar, Union
+from typing import Any, Literal, Optional, TypeVar, Union, cast
 
+import anyio
+import anyio.to_thread
 import typing_extensions
 from fastapi import FastAPI, File, Form, UploadFile
+from fastapi.datastructures import Default
 from piccolo.apps.user.tables import BaseUser
 from piccolo.columns.base import Column
 from piccolo.columns.column_types import (
+    JSON,
     ForeignKey,
+    Text,
     Time,
     Timestamp,
     Timestamptz,
+    Varchar,
 )
-from piccolo.columns.reference import LazyTableReference
 from piccolo.table import Table
 from piccolo.utils.warnings import Level, colored_warning
 from piccolo_api.change_password.endpoints import change_password
@@ -43,7 +62,6 @@ from piccolo_api.mfa.provider import MFAProvider
 from piccolo_api.openapi.endpoints import swagger_ui
 from piccolo_api.rate_limiting.middleware import (
     InMemoryLimitProvider,
-    RateLimitingMiddleware,
     RateLimitProvider,
 )
 from piccolo_api.session_auth.endpoints import session_login, session_logout
@@ -53,10 +71,42 @@ from pydantic import BaseModel, Field, ValidationError
 from starlette.middleware import Middleware
 from starlette.middleware.authentication import AuthenticationMiddleware
 from starlette.middleware.exceptions import HTTPException
-from starlette.requests import Request
-from starlette.responses import HTMLResponse, JSONResponse, Response
+from starlette.requests import HTTPConnection, Request
+from starlette.responses import FileResponse as StarletteFileResponse
+from starlette.responses import (
+    HTMLResponse,
+    JSONResponse,
+    Response,
+    StreamingResponse,
+)
 from starlette.staticfiles import StaticFiles
-
+from starlette.types import ASGIApp, Scope
+
+from .caching import CachedResponse
+from .compression import (
+    CompressionMiddleware,
+    Encoding,
+    PrecompressedStaticFiles,
+    validate_encodings,
+)
+from .crud import AdminCRUD, CountStrategy, Pagination, SearchStrategy
+from .graph import TableGraph
+from .jobs import (
+    FormJobResponseModel,
+    InMemoryJobStore,
+    Job,
+    JobManager,
+    JobStore,
+    write_job_file,
+)
+from .passwords import (
+    PasswordHasher,
+    PasswordHashingMiddleware,
+    PasswordHashingProxy,
+)
+from .rate_limiting import SQLiteLimitProvider, SQLiteRateLimitingMiddleware
+from .serialisation import JSONBackend, get_json_response_class
+from .sessions import CachedSessionsAuthBackend, SessionCache
 from .translations.data import TRANSLATIONS
 from .translations.models import (
     Translation,
@@ -70,6 +120,12 @@ logger = logging.getLogger(__name__)
 
 ASSET_PATH = os.path.join(os.path.dirname(__file__), "dist")
 
+TABLE_PATH_REGEX = re.compile(r"^/tables/(?P<tablename>[^/]+)/")
+
+TRANSLATION_CACHE_CONTROL = "public, no-cache"
+
+TRANSLATION_IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
 
 class UserResponseModel(BaseModel):
     username: str
@@ -112,6 +168,20 @@ class GroupedFormsResponseModel(BaseModel):
     ungrouped: list[FormConfigResponseModel] = Field(default_factory=list)
 
 
+class BootstrapPublicResponseModel(BaseModel):
+    meta: MetaResponseModel
+    translations: TranslationListResponse
+    translation: Translation
+
+
+class BootstrapResponseModel(BaseModel):
+    public: BootstrapPublicResponseModel
+    user: UserResponseModel
+    tables: GroupedTableNamesResponseModel
+    forms: GroupedFormsResponseModel
+    links: dict[str, str]
+
+
 @dataclass
 class TableConfig:
     """
@@ -209,6 +279,69 @@ class TableConfig:
         * 1 - the max resolution is 1 second (the default)
         * 60 - the max resolution is 1 minute
 
+    :param pagination:
+        Either ``'offset'`` (the default), or ``'keyset'``. With offset
+        pagination, deep pages on large tables get slower, as the database
+        has to scan and discard every skipped row. With keyset pagination,
+        the next and previous pages are fetched using a cursor built from the
+        ``order_by`` columns plus the primary key, so each page costs about
+        the same, no matter how deep it is. It's only used when none of the
+        columns being sorted by are nullable - otherwise it falls back to
+        offset pagination.
+    :param count_strategy:
+        How the total number of rows is worked out, which is shown in the
+        listing and used for pagination. Running ``COUNT(*)`` on tables with
+        millions of rows can be slower than fetching the rows themselves, so
+        the options are:
+
+        * ``'exact'`` - ``COUNT(*)`` is run each time (the default).
+        * ``'estimate'`` - the Postgres query planner's estimate is used,
+          which is almost instant. Falls back to ``'exact'`` if there's no
+          estimate (for example, when using SQLite).
+        * ``'cached'`` - exact counts are cached for each combination of
+          filters, for ``count_cache_ttl`` seconds.
+        * ``'none'`` - no count is shown, and the UI just lets you move to
+          the next page.
+
+    :param count_cache_ttl:
+        How many seconds counts are cached for, when ``count_strategy`` is
+        ``'cached'``.
+    :param preview_length:
+        Limits how many characters of each value are sent in the list view,
+        so large values don't slow it down. The full value is still shown
+        on the edit page. Either:
+
+        * An ``int``, which applies to all of the ``Text``, ``JSON`` and
+          ``JSONB`` columns (except media columns and columns with
+          choices).
+        * A ``dict`` mapping ``Text``, ``Varchar``, ``JSON`` or ``JSONB``
+          columns to their preview length.
+
+    :param search_strategy:
+        How rows are searched when picking them for a foreign key in the UI,
+        using the table's readable. A case insensitive ``LIKE '%term%'``
+        can't use an index, so on large tables it's slow on every keystroke.
+        The options are:
+
+        * ``'contains'`` - matches the search term anywhere (the default).
+        * ``'prefix'`` - matches the start of the value using
+          ``LIKE 'term%'``, which can use a B-tree index. In Postgres, the
+          index needs to use ``text_pattern_ops`` (unless the database uses
+          the ``C`` collation), and the search is case sensitive.
+        * ``'trigram'`` - matches the search term anywhere, using a
+          ``pg_trgm`` GIN index, with the closest matches first.
+        * ``'fulltext'`` - matches the start of each word, using a GIN
+          index on ``to_tsvector('simple', column)``.
+
+        ``'trigram'`` and ``'fulltext'`` need Postgres, otherwise
+        ``'contains'`` is used.
+    :param ids_cache_ttl:
+        If set, the foreign key search results are cached for this many
+        seconds. It's off by default, as the cache is only cleared when rows
+        are changed using this table's API endpoints - changes made in other
+        ways (by another worker, a form, or to another table used by the
+        readable) can take up to ``ids_cache_ttl`` seconds to appear.
+
     """
 
     table_class: type[Table]
@@ -226,6 +359,12 @@ class TableConfig:
     time_resolution: Optional[
         dict[Union[Timestamp, Timestamptz, Time], Union[float, int]]
     ] = None
+    pagination: Pagination = "offset"
+    count_strategy: CountStrategy = "exact"
+    count_cache_ttl: float = 60.0
+    preview_length: Optional[Union[int, dict[Column, int]]] = None
+    search_strategy: SearchStrategy = "contains"
+    ids_cache_ttl: Optional[float] = None
 
     def __post_init__(self):
         if self.visible_columns and self.exclude_visible_columns:
@@ -239,6 +378,31 @@ class TableConfig:
                 "Only specify `visible_filters` or `exclude_visible_filters`."
             )
 
+        if self.pagination not in ("offset", "keyset"):
+            raise ValueError(
+                "`pagination` must be either 'offset' or 'keyset'."
+            )
+
+        if self.count_strategy not in ("exact", "estimate", "cached", "none"):
+            raise ValueError(
+                "`count_strategy` must be 'exact', 'estimate', 'cached', or "
+                "'none'."
+            )
+
+        if self.ids_cache_ttl is not None and self.ids_cache_ttl <= 0:
+            raise ValueError("`ids_cache_ttl` must be greater than 0.")
+
+        if self.search_strategy not in (
+            "contains",
+            "prefix",
+            "trigram",
+            "fulltext",
+        ):
+            raise ValueError(
+                "`search_strategy` must be 'contains', 'prefix', 'trigram', "
+                "or 'fulltext'."
+            )
+
         if isinstance(self.link_column, ForeignKey):
             raise ValueError(
                 "Don't use a foreign key column for `link_column`, as they "
@@ -252,6 +416,26 @@ class TableConfig:
             else None
         )
 
+        if isinstance(self.preview_length, dict):
+            media_column_names = self.get_media_columns_names()
+            for column, length in self.preview_length.items():
+                if not isinstance(column, (Text, Varchar, JSON)):
+                    raise ValueError(
+                        "`preview_length` only supports `Text`, `Varchar`, "
+                        "`JSON` and `JSONB` columns."
+                    )
+                if column._meta.choices or (
+                    column._meta.name in media_column_names
+                ):
+                    raise ValueError(
+                        "`preview_length` can't be used for media columns, "
+                        "or columns with choices."
+                    )
+                if length < 1:
+                    raise ValueError("`preview_length` must be at least 1.")
+        elif self.preview_length is not None and self.preview_length < 1:
+            raise ValueError("`preview_length` must be at least 1.")
+
     def _get_columns(
         self,
         include_columns: Optional[list[Column]],
@@ -309,6 +493,25 @@ class TableConfig:
             OrderBy(column=self.table_class._meta.primary_key, ascending=True)
         ]
 
+    def get_preview_lengths(self) -> dict[str, int]:
+        if self.preview_length is None:
+            return {}
+
+        if isinstance(self.preview_length, dict):
+            return {
+                column._meta.name: length
+                for column, length in self.preview_length.items()
+            }
+
+        media_column_names = self.get_media_columns_names()
+        return {
+            column._meta.name: self.preview_length
+            for column in self.table_class._meta.columns
+            if isinstance(column, (Text, JSON))
+            and not column._meta.choices
+            and column._meta.name not in media_column_names
+        }
+
     def get_time_resolution(self) -> dict[str, Union[int, float]]:
         return (
             {
@@ -323,15 +526,100 @@ class TableConfig:
 PydanticModel = TypeVar("PydanticModel", bound=BaseModel)
 
 
+FileContents: typing_extensions.TypeAlias = Union[
+    io.StringIO,
+    io.BytesIO,
+    str,
+    os.PathLike,
+    Iterable[Union[str, bytes]],
+    AsyncIterable[Union[str, bytes]],
+]
+
+
 @dataclass
 class FileResponse:
-    contents: Union[io.StringIO, io.BytesIO]
+    """
+    Returned by a form's endpoint, to send a file to the user.
+
+    :param contents:
+        Either:
+
+        * An ``io.StringIO`` or ``io.BytesIO`` instance.
+        * A sync or async iterator / generator, which yields ``str`` or
+          ``bytes``. This means large files can be streamed to the user,
+          without the whole file being in memory at once.
+        * A path to a file (either a ``str``, or something like
+          ``pathlib.Path``), which is streamed from disk.
+
+    :param file_name:
+        The name of the file which the user downloads.
+    :param media_type:
+        For example ``'text/csv'``.
+
+    """
+
+    contents: FileContents
     file_name: str
     media_type: str
 
+    def to_response(self) -> Response:
+        """
+        Converts it into a streaming response. ``Content-Length`` is set if
+        the size is known up front.
+        """
+        headers = {
+            "Content-Disposition": f'attachment; filename="{self.file_name}"'
+        }
+
+        contents = self.contents
+
+        # A ``str`` is iterable, so it needs checking before the iterators.
+        if isinstance(contents, (str, os.PathLike)):
+            return StarletteFileResponse(
+                path=contents, headers=headers, media_type=self.media_type
+            )
+
+        if isinstance(contents, io.BytesIO):
+            buffer = contents.getbuffer()
+            headers["Content-Length"] = str(buffer.nbytes)
+            return StreamingResponse(
+                _iterate_buffer(buffer),
+                headers=headers,
+                media_type=self.media_type,
+            )
+
+        if isinstance(contents, io.StringIO):
+            return StreamingResponse(
+                _iterate_string_io(contents),
+                headers=headers,
+                media_type=self.media_type,
+            )
+
+        return StreamingResponse(
+            contents, headers=headers, media_type=self.media_type
+        )
+
+
+FILE_CHUNK_SIZE = 64 * 1024
+
+
+async def _iterate_buffer(buffer: memoryview) -> AsyncGenerator[bytes, None]:
+    for index in range(0, buffer.nbytes, FILE_CHUNK_SIZE):
+        yield buffer[index : index + FILE_CHUNK_SIZE].tobytes()  # noqa: E203
+
+
+async def _iterate_string_io(
+    contents: io.StringIO,
+) -> AsyncGenerator[str, None]:
+    contents.seek(0)
+    while chunk := contents.read(FILE_CHUNK_SIZE):
+        yield chunk
+
 
 FormResponse: typing_extensions.TypeAlias = Union[str, FileResponse, None]
 
+FormExecutor: typing_extensions.TypeAlias = Literal["thread", "process"]
+
 
 @dataclass
 class FormConfig:
@@ -350,6 +638,8 @@ class FormConfig:
         of the Pydantic model. If it returns a string, it will be shown to
         the user in the UI as the success message. For example ``'Successfully
         sent email'``. The endpoint can be a normal function or async function.
+        Normal functions are run in a thread pool, so they don't block the
+        event loop.
     :param description:
         An optional description which is shown in the UI to explain to the user
         what the form is for.
@@ -357,6 +647,24 @@ class FormConfig:
         If specified, forms can be divided into groups in the form
         menu. This is useful when you have many forms that you
         can organize into groups for better visibility.
+    :param executor:
+        Only applies when ``endpoint`` is a normal function. By default it's
+        run in a thread pool (``'thread'``), which is ideal for blocking I/O,
+        like sending emails. If the endpoint is CPU intensive (e.g. image
+        processing), use ``'process'`` instead, so it runs in a separate
+        process, and can't slow down the rest of the admin. The endpoint,
+        Pydantic model, and return value must then be picklable (e.g. defined
+        at the module level), and ``None`` is passed in place of the request,
+        as it can't be sent to another process.
+    :param background:
+        If ``True``, the endpoint is run as a background job, so the user
+        doesn't have to wait for it to finish before getting a response.
+        Use this for anything which takes longer than a few seconds (e.g.
+        generating large reports), otherwise the request might time out.
+        The endpoint can report its progress using
+        :func:`piccolo_admin.jobs.report_progress`. As the original request
+        has finished by then, the endpoint receives a copy of it, which
+        contains the headers, query params and user, but not the body.
 
     Here's a full example:
 
@@ -397,14 +705,79 @@ class FormConfig:
         ],
         description: Optional[str] = None,
         form_group: Optional[str] = None,
+        executor: FormExecutor = "thread",
+        background: bool = False,
     ):
+        if executor not in ("thread", "process"):
+            raise ValueError(
+                "`executor` must be either 'thread' or 'process'."
+            )
+
+        if executor == "process" and inspect.iscoroutinefunction(endpoint):
+            raise ValueError(
+                "Async endpoints can't be used with `executor='process'`."
+            )
+
         self.name = name
         self.pydantic_model = pydantic_model
         self.endpoint = endpoint
         self.description = description
         self.form_group = form_group
+        self.executor = executor
+        self.background = background
         self.slug = self.name.replace(" ", "-").lower()
 
+    def to_response_model(self) -> FormConfigResponseModel:
+        return FormConfigResponseModel(
+            name=self.name, slug=self.slug, description=self.description
+        )
+
+    @functools.cached_property
+    def _schema_response(self) -> CachedResponse:
+        """
+        Generating the schema for large, nested models is slow, so it's only
+        done once, when first requested.
+        """
+        return CachedResponse.from_json(
+            self.pydantic_model.model_json_schema()
+        )
+
+
+#: The parts of the request scope which are still valid once the request has
+#: finished.
+DETACHED_SCOPE_KEYS = (
+    "type",
+    "asgi",
+    "http_version",
+    "method",
+    "scheme",
+    "server",
+    "client",
+    "root_path",
+    "path",
+    "raw_path",
+    "query_string",
+    "path_params",
+    "auth",
+    "user",
+)
+
+
+def _detach_request(request: Request) -> Request:
+    """
+    Background jobs outlive the request, and the ASGI server and FastAPI
+    clean up its resources (e.g. the receive channel and dependencies) once
+    the response has been sent. So we give them a copy, which only contains
+    the headers, query params and user - the body can't be read.
+    """
+    scope = {
+        key: request.scope[key]
+        for key in DETACHED_SCOPE_KEYS
+        if key in request.scope
+    }
+    scope["headers"] = list(request.scope.get("headers", []))
+    return Request(scope)
+
 
 class FormConfigResponseModel(BaseModel):
     name: str
@@ -437,6 +810,92 @@ async def log_error(request: Request, exc: HTTPException):
     raise exc
 
 
+class LazyTablesMiddleware:
+    """
+    Used when ``lazy_tables`` is enabled. Before a request for a table is
+    handled, it makes sure the table's endpoints have been added.
+    """
+
+    def __init__(self, app: FastAPI, admin_router: AdminRouter):
+        self.app = app
+        self.admin_router = admin_router
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and self.admin_router.lazy_tables:
+            path: str = scope["path"].removeprefix(scope.get("root_path", ""))
+
+            match = TABLE_PATH_REGEX.match(path)
+            if match:
+                self.admin_router.add_pending_table_routes(
+                    tablename=match.group("tablename")
+                )
+            elif path == self.app.openapi_url:
+                # The schema needs to include every table.
+                self.admin_router.add_pending_table_routes()
+
+        await self.app(scope, receive, send)
+
+
+class SessionCacheMiddleware:
+    """
+    Used when ``session_cache_ttl`` is set. After any request which might
+    change a session or user (logging out, changing password, or editing the
+    user or session tables), the affected sessions are removed from the
+    cache.
+    """
+
+    def __init__(self, app: ASGIApp, admin_router: AdminRouter):
+        self.app = app
+        self.admin_router = admin_router
+
+    def invalidate(self, scope: Scope):
+        session_cache = self.admin_router.session_cache
+        if session_cache is None:
+            return
+
+        path: str = scope["path"].removeprefix(scope.get("root_path", ""))
+
+        if path == "/logout/":
+            token = HTTPConnection(scope).cookies.get("id")
+            if token:
+                session_cache.invalidate(token)
+        elif path == "/change-password/":
+            user = scope.get("user")
+            if user is not None and user.is_authenticated:
+                session_cache.invalidate_user(user.user_id)
+        else:
+            match = TABLE_PATH_REGEX.match(path)
+            if match and match.group("tablename") in (
+                self.admin_router.auth_table._meta.tablename,
+                self.admin_router.session_table._meta.tablename,
+            ):
+                # We don't know which users were affected (e.g. with bulk
+                # updates), so clear everything - it's rare.
+                session_cache.clear()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] in (
+            "GET",
+            "HEAD",
+            "OPTIONS",
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            # We do this afterwards, otherwise a concurrent request could
+            # cache the old values before the changes are saved.
+            self.invalidate(scope)
+
+
+@contextlib.asynccontextmanager
+async def _lifespan(app: AdminRouter) -> AsyncGenerator[None, None]:
+    yield
+    await app.shutdown()
+
+
 class AdminRouter(FastAPI):
     """
     The root returns a single page app. The other URLs are REST endpoints.
@@ -466,6 +925,17 @@ class AdminRouter(FastAPI):
         debug: bool = False,
         sidebar_links: dict[str, str] = {},
         mfa_providers: Optional[Sequence[MFAProvider]] = None,
+        lazy_tables: bool = False,
+        form_thread_limit: int = 10,
+        form_process_limit: Optional[int] = None,
+        form_job_limit: int = 5,
+        form_job_store: Optional[JobStore] = None,
+        json_backend: JSONBackend = "json",
+        compression: Sequence[Encoding] = (),
+        compression_minimum_size: int = 1000,
+        session_cache_ttl: Optional[float] = None,
+        session_cache_size: int = 1000,
+        password_thread_limit: int = 4,
     ) -> None:
         super().__init__(
             title=site_name,
@@ -481,6 +951,7 @@ class AdminRouter(FastAPI):
             exception_handlers={500: log_error},
             docs_url=None,
             redoc_url=None,
+            lifespan=_lifespan,
         )
 
         #######################################################################
@@ -504,6 +975,32 @@ class AdminRouter(FastAPI):
             for table_config in self.table_configs
         }
 
+        # Used to answer questions about related tables from memory, rather
+        # than introspecting the table classes on each request.
+        self.table_graph = TableGraph(
+            (table_config.table_class for table_config in table_configs),
+            include_related=False,
+        )
+
+        # The references for every table, so the UI only has to fetch them
+        # once.
+        self.table_references_response = CachedResponse.from_json(
+            {
+                "references": {
+                    table_class._meta.tablename: [
+                        {
+                            "tableName": i._meta.table._meta.tablename,
+                            "columnName": i._meta.name,
+                        }
+                        for i in self.table_graph.get_referencing_columns(
+                            table_class
+                        )
+                    ]
+                    for table_class in self.table_graph.tables
+                }
+            }
+        )
+
         #######################################################################
         # Make sure columns are configured properly.
 
@@ -547,14 +1044,95 @@ class AdminRouter(FastAPI):
             for translation in (translations or TRANSLATIONS)
         }
 
+        # The translations never change while the app is running, so we
+        # serialise and compress them up front.
+        self.translation_responses = {
+            language_code: CachedResponse(
+                body=translation.model_dump_json().encode(),
+                cache_control=TRANSLATION_CACHE_CONTROL,
+                compress=True,
+            )
+            for language_code, translation in self.translations_map.items()
+        }
+
+        # The public part of the bootstrap response for each language - they're
+        # created when first requested.
+        self._public_bootstrap_responses: dict[str, CachedResponse] = {}
+
+        # Changes whenever Piccolo Admin is upgraded, or the translations are
+        # modified. The UI passes it as a query param, so the translations can
+        # be cached by the browser indefinitely.
+        self.translations_version = hashlib.sha256(
+            "".join(
+                [
+                    PICCOLO_ADMIN_VERSION,
+                    *[i.etag for i in self.translation_responses.values()],
+                ]
+            ).encode()
+        ).hexdigest()[:16]
+
+        self.translation_list_response = CachedResponse(
+            body=TranslationListResponse(
+                translations=[
+                    TranslationListItem(
+                        language_code=translation.language_code,
+                        language_name=translation.language_name,
+                    )
+                    for translation in self.translations_map.values()
+                ],
+                default_language_code=self.default_language_code,
+                translations_version=self.translations_version,
+            )
+            .model_dump_json()
+            .encode(),
+            cache_control=TRANSLATION_CACHE_CONTROL,
+            compress=True,
+        )
+
         #######################################################################
 
         self.auth_table = auth_table
+        self.session_table = session_table
         self.site_name = site_name
         self.forms = forms
         self.read_only = read_only
+        self.page_size = page_size
         self.sidebar_links = sidebar_links
         self.form_config_map = {form.slug: form for form in self.forms}
+        self.form_thread_limit = form_thread_limit
+        self.form_process_limit = form_process_limit
+        # These are created when first needed.
+        self._form_thread_limiter: Optional[anyio.CapacityLimiter] = None
+        self._form_process_pool: Optional[ProcessPoolExecutor] = None
+        self.form_job_manager = JobManager(
+            store=form_job_store or InMemoryJobStore(), limit=form_job_limit
+        )
+        self.json_backend = json_backend
+        self.password_hasher = PasswordHasher(limit=password_thread_limit)
+        # Used instead of ``auth_table`` by the Piccolo API endpoints, so
+        # passwords are hashed in a thread.
+        password_hashing_auth_table = cast(
+            type[BaseUser],
+            PasswordHashingProxy(
+                auth_table, password_hasher=self.password_hasher
+            ),
+        )
+        self.session_cache: Optional[SessionCache] = (
+            SessionCache(ttl=session_cache_ttl, max_size=session_cache_size)
+            if session_cache_ttl is not None
+            else None
+        )
+        # Wrapping it in ``Default`` means FastAPI still uses its own fast
+        # path (serialising directly with Pydantic) for endpoints which have
+        # a response model.
+        json_response_class = Default(get_json_response_class(json_backend))
+
+        validate_encodings(compression)
+        compression_middleware = partial(
+            CompressionMiddleware,
+            encodings=compression,
+            minimum_size=compression_minimum_size,
+        )
 
         with open(os.path.join(ASSET_PATH, "index.html")) as f:
             self.template = f.read()
@@ -566,50 +1144,22 @@ class AdminRouter(FastAPI):
             redoc_url=None,
             debug=debug,
             exception_handlers={500: log_error},
+            default_response_class=json_response_class,
         )
         private_app.mount("/docs/", swagger_ui(schema_url="../openapi.json"))
+        if compression:
+            private_app.add_middleware(compression_middleware)
+
+        self.private_app = private_app
+        self.lazy_tables = lazy_tables
+        self._pending_table_configs: dict[str, TableConfig] = {}
 
         for table_config in table_configs:
-            table_class = table_config.table_class
-            visible_column_names = table_config.get_visible_column_names()
-            visible_filter_names = table_config.get_visible_filter_names()
-            rich_text_columns_names = (
-                table_config.get_rich_text_columns_names()
-            )
-            media_columns_names = table_config.get_media_columns_names()
-            link_column_name = table_config.get_link_column()._meta.name
-            order_by = table_config.get_order_by()
-            time_resolution = table_config.get_time_resolution()
-            validators = table_config.validators
-            if table_class in (auth_table, session_table):
-                validators = validators or Validators()
-                validators.every = [superuser_validators, *validators.every]
-
-            FastAPIWrapper(
-                root_url=f"/tables/{table_class._meta.tablename}/",
-                fastapi_app=private_app,
-                piccolo_crud=PiccoloCRUD(
-                    table=table_class,
-                    read_only=read_only,
-                    page_size=page_size,
-                    schema_extra={
-                        "visible_column_names": visible_column_names,
-                        "visible_filter_names": visible_filter_names,
-                        "rich_text_columns": rich_text_columns_names,
-                        "media_columns": media_columns_names,
-                        "link_column_name": link_column_name,
-                        "order_by": tuple(i.to_dict() for i in order_by),
-                        "time_resolution": time_resolution,
-                    },
-                    validators=validators,
-                    hooks=table_config.hooks,
-                ),
-                fastapi_kwargs=FastAPIKwargs(
-                    all_routes={
-                        "tags": [f"{table_class._meta.tablename.capitalize()}"]
-                    },
-                ),
-            )
+            if lazy_tables:
+                tablename = table_config.table_class._meta.tablename
+                self._pending_table_configs[tablename] = table_config
+            else:
+                self._add_table_routes(table_config)
 
         private_app.add_api_route(
             path="/tables/",
@@ -619,6 +1169,13 @@ class AdminRouter(FastAPI):
             tags=["Tables"],
         )
 
+        private_app.add_api_route(
+            path="/tables/references/",
+            endpoint=self.get_table_references,  # type: ignore
+            methods=["GET"],
+            tags=["Tables"],
+        )
+
         private_app.add_api_route(
             path="/tables/grouped/",
             endpoint=self.get_table_list_grouped,  # type: ignore
@@ -671,6 +1228,29 @@ class AdminRouter(FastAPI):
             tags=["Forms"],
         )
 
+        private_app.add_api_route(
+            path="/forms/{form_slug:str}/jobs/{job_id:str}/",
+            endpoint=self.get_form_job,  # type: ignore
+            methods=["GET"],
+            tags=["Forms"],
+            response_model=FormJobResponseModel,
+        )
+
+        private_app.add_api_route(
+            path="/forms/{form_slug:str}/jobs/{job_id:str}/",
+            endpoint=self.cancel_form_job,  # type: ignore
+            methods=["DELETE"],
+            tags=["Forms"],
+            response_model=FormJobResponseModel,
+        )
+
+        private_app.add_api_route(
+            path="/forms/{form_slug:str}/jobs/{job_id:str}/download/",
+            endpoint=self.download_form_job_file,  # type: ignore
+            methods=["GET"],
+            tags=["Forms"],
+        )
+
         private_app.add_api_route(
             path="/user/",
             endpoint=self.get_user,  # type: ignore
@@ -679,12 +1259,23 @@ class AdminRouter(FastAPI):
             response_model=UserResponseModel,
         )
 
+        private_app.add_api_route(
+            path="/bootstrap/",
+            endpoint=self.get_bootstrap,  # type: ignore
+            methods=["GET"],
+            tags=["Bootstrap"],
+            response_model=BootstrapResponseModel,
+        )
+
         private_app.add_route(
             path="/change-password/",
-            route=change_password(  # type: ignore
-                login_url="./../../public/login/",
-                session_table=session_table,
-                read_only=read_only,
+            route=PasswordHashingMiddleware(  # type: ignore
+                app=change_password(
+                    login_url="./../../public/login/",
+                    session_table=session_table,
+                    read_only=read_only,
+                ),
+                password_hasher=self.password_hasher,
             ),
             methods=["POST"],
         )
@@ -742,12 +1333,21 @@ class AdminRouter(FastAPI):
                     # This rate limiting is because some of the forms accept
                     # a password, and generating recovery codes is somewhat
                     # expensive, so we want to prevent abuse.
-                    app=RateLimitingMiddleware(
+                    app=SQLiteRateLimitingMiddleware(
                         app=mfa_setup(
                             provider=mfa_provider,
-                            auth_table=self.auth_table,
+                            auth_table=password_hashing_auth_table,
+                        ),
+                        provider=(
+                            # So the counters are shared between workers too.
+                            rate_limit_provider.copy(
+                                namespace="mfa_setup", limit=20, timespan=300
+                            )
+                            if isinstance(
+                                rate_limit_provider, SQLiteLimitProvider
+                            )
+                            else InMemoryLimitProvider(limit=20, timespan=300)
                         ),
-                        provider=InMemoryLimitProvider(limit=20, timespan=300),
                     ),
                 )
 
@@ -758,8 +1358,11 @@ class AdminRouter(FastAPI):
             docs_url=None,
             debug=debug,
             exception_handlers={500: log_error},
+            default_response_class=json_response_class,
         )
         public_app.mount("/docs/", swagger_ui(schema_url="../openapi.json"))
+        if compression:
+            public_app.add_middleware(compression_middleware)
 
         if not rate_limit_provider:
             rate_limit_provider = InMemoryLimitProvider(
@@ -771,9 +1374,9 @@ class AdminRouter(FastAPI):
             path="/login/",
             # This rate limiting is to prevent brute forcing password login,
             # and MFA codes.
-            app=RateLimitingMiddleware(
+            app=SQLiteRateLimitingMiddleware(
                 app=session_login(
-                    auth_table=self.auth_table,
+                    auth_table=password_hashing_auth_table,
                     session_table=session_table,
                     session_expiry=session_expiry,
                     max_session_expiry=max_session_expiry,
@@ -814,36 +1417,198 @@ class AdminRouter(FastAPI):
             response_model=Translation,
         )
 
+        # Used by the login page, which can't access ``/api/bootstrap/``.
+        public_app.add_api_route(
+            "/bootstrap/",
+            endpoint=self.get_public_bootstrap,  # type: ignore
+            methods=["GET"],
+            tags=["Bootstrap"],
+            response_model=BootstrapPublicResponseModel,
+        )
+
         #######################################################################
 
         self.router.add_route(
             path="/", endpoint=self.get_root, methods=["GET"]
         )
 
+        # Precompressed versions of the assets are created when the UI is
+        # built. The middleware is a fallback in case they're missing.
+        assets_app = PrecompressedStaticFiles(
+            directory=os.path.join(ASSET_PATH, "assets")
+        )
         self.mount(
             path="/assets",
-            app=StaticFiles(directory=os.path.join(ASSET_PATH, "assets")),
+            app=(
+                compression_middleware(assets_app)
+                if compression
+                else assets_app
+            ),
         )
 
-        auth_middleware = partial(
-            AuthenticationMiddleware,
-            backend=SessionsAuthBackend(
+        auth_backend: SessionsAuthBackend
+        if self.session_cache is None:
+            auth_backend = SessionsAuthBackend(
                 auth_table=auth_table,
                 session_table=session_table,
                 admin_only=True,
                 increase_expiry=increase_expiry,
-            ),
+            )
+        else:
+            auth_backend = CachedSessionsAuthBackend(
+                auth_table=auth_table,
+                session_table=session_table,
+                admin_only=True,
+                increase_expiry=increase_expiry,
+                session_cache=self.session_cache,
+            )
+
+        auth_middleware = partial(
+            AuthenticationMiddleware,
+            backend=auth_backend,
             on_error=handle_auth_exception,  # type: ignore
         )
 
-        self.mount(path="/api", app=auth_middleware(private_app))
-        self.mount(path="/public", app=public_app)
+        private_asgi_app: ASGIApp = (
+            LazyTablesMiddleware(app=private_app, admin_router=self)
+            if lazy_tables
+            else private_app
+        )
+        public_asgi_app: ASGIApp = public_app
+
+        if self.session_cache is not None:
+            private_asgi_app = SessionCacheMiddleware(
+                app=private_asgi_app, admin_router=self
+            )
+            public_asgi_app = SessionCacheMiddleware(
+                app=public_asgi_app, admin_router=self
+            )
+
+        self.mount(path="/api", app=auth_middleware(private_asgi_app))
+        self.mount(path="/public", app=public_asgi_app)
 
     async def get_root(self, request: Request) -> HTMLResponse:
         return HTMLResponse(self.template)
 
     ###########################################################################
 
+    def _add_table_routes(self, table_config: TableConfig) -> None:
+        """
+        Adds the CRUD endpoints for the table to ``private_app``.
+        """
+        table_class = table_config.table_class
+        visible_column_names = table_config.get_visible_column_names()
+        visible_filter_names = table_config.get_visible_filter_names()
+        rich_text_columns_names = table_config.get_rich_text_columns_names()
+        media_columns_names = table_config.get_media_columns_names()
+        link_column_name = table_config.get_link_column()._meta.name
+        order_by = table_config.get_order_by()
+        time_resolution = table_config.get_time_resolution()
+        validators = table_config.validators
+        if table_class in (self.auth_table, self.session_table):
+            validators = validators or Validators()
+            validators.every = [superuser_validators, *validators.every]
+
+        tablename = table_class._meta.tablename
+
+        piccolo_crud = AdminCRUD(
+            table=table_class,
+            read_only=self.read_only,
+            page_size=self.page_size,
+            schema_extra={
+                "visible_column_names": visible_column_names,
+                "visible_filter_names": visible_filter_names,
+                "rich_text_columns": rich_text_columns_names,
+                "media_columns": media_columns_names,
+                "link_column_name": link_column_name,
+                "order_by": tuple(i.to_dict() for i in order_by),
+                "time_resolution": time_resolution,
+                "pagination": table_config.pagination,
+                "count_strategy": table_config.count_strategy,
+            },
+            validators=validators,
+            hooks=table_config.hooks,
+            pagination=table_config.pagination,
+            order_by=order_by,
+            count_strategy=table_config.count_strategy,
+            count_cache_ttl=table_config.count_cache_ttl,
+            search_strategy=table_config.search_strategy,
+            ids_cache_ttl=table_config.ids_cache_ttl,
+            # The UI needs the primary key and link column, even if hidden.
+            list_columns=[
+                *table_config.get_visible_columns(),
+                table_class._meta.primary_key,
+                table_config.get_link_column(),
+            ],
+            preview_lengths=table_config.get_preview_lengths(),
+            json_backend=self.json_backend,
+            referencing_columns=self.table_graph.get_referencing_columns(
+                table_class
+            ),
+        )
+
+        self.private_app.add_api_route(
+            path=f"/tables/{tablename}/references/{{row_id:str}}/",
+            endpoint=piccolo_crud.get_reference_counts,  # type: ignore
+            methods=["GET"],
+            tags=[tablename.capitalize()],
+        )
+
+        # These have to be registered before the ``FastAPIWrapper``
+        # routes, otherwise they're matched by ``/{row_id:str}/``.
+        self.private_app.add_api_route(
+            path=f"/tables/{tablename}/export/",
+            endpoint=piccolo_crud.export,  # type: ignore
+            methods=["GET"],
+            tags=[tablename.capitalize()],
+            response_class=StreamingResponse,
+        )
+
+        if not self.read_only:
+            self.private_app.add_api_route(
+                path=f"/tables/{tablename}/bulk/",
+                endpoint=piccolo_crud.bulk_update,  # type: ignore
+                methods=["PATCH"],
+                tags=[tablename.capitalize()],
+            )
+            self.private_app.add_api_route(
+                path=f"/tables/{tablename}/bulk/",
+                endpoint=piccolo_crud.bulk_delete,  # type: ignore
+                methods=["DELETE"],
+                tags=[tablename.capitalize()],
+            )
+
+        FastAPIWrapper(
+            root_url=f"/tables/{tablename}/",
+            fastapi_app=self.private_app,
+            piccolo_crud=piccolo_crud,
+            fastapi_kwargs=FastAPIKwargs(
+                all_routes={"tags": [tablename.capitalize()]},
+            ),
+        )
+
+    def add_pending_table_routes(self, tablename: Optional[str] = None):
+        """
+        When ``lazy_tables`` is enabled, the CRUD endpoints for each table are
+        only added when they're first needed.
+
+        :param tablename:
+            Add the endpoints for this table. If not specified, the endpoints
+            for all remaining tables are added.
+
+        """
+        if tablename is None:
+            tablenames = list(self._pending_table_configs.keys())
+        else:
+            tablenames = [tablename]
+
+        for tablename in tablenames:
+            table_config = self._pending_table_configs.pop(tablename, None)
+            if table_config is not None:
+                self._add_table_routes(table_config)
+
+    ###########################################################################
+
     def _get_media_storage(
         self, table_name: str, column_name: str
     ) -> MediaStorage:
@@ -954,22 +1719,17 @@ class AdminRouter(FastAPI):
     ###########################################################################
     # Custom forms
 
-    def get_forms(self) -> list[FormConfigResponseModel]:
-        """
-        Returns a list of all forms registered with the admin.
-        """
-        return [
-            FormConfigResponseModel(
-                name=form.name, slug=form.slug, description=form.description
-            )
-            for form in self.forms
-        ]
+    # The forms can't change while the app is running, so these responses are
+    # only serialised once, when first requested.
 
-    def get_grouped_forms(self) -> GroupedFormsResponseModel:
-        """
-        Returns a list of custom forms registered with the admin, grouped using
-        `form_group`.
-        """
+    @functools.cached_property
+    def _forms_response(self) -> CachedResponse:
+        return CachedResponse.from_json(
+            [form.to_response_model().model_dump() for form in self.forms]
+        )
+
+    @functools.cached_property
+    def _grouped_forms_response(self) -> CachedResponse:
         response = GroupedFormsResponseModel()
         group_names = sorted(
             {
@@ -981,17 +1741,26 @@ class AdminRouter(FastAPI):
         response.grouped = {i: [] for i in group_names}
         for _, form_config in self.form_config_map.items():
             form_group = form_config.form_group
-            form_config_response = FormConfigResponseModel(
-                name=form_config.name,
-                slug=form_config.slug,
-                description=form_config.description,
-            )
+            form_config_response = form_config.to_response_model()
             if form_group is None:
                 response.ungrouped.append(form_config_response)
             else:
                 response.grouped[form_group].append(form_config_response)
 
-        return response
+        return CachedResponse(body=response.model_dump_json().encode())
+
+    def get_forms(self, request: Request) -> Response:
+        """
+        Returns a list of all forms registered with the admin.
+        """
+        return self._forms_response.to_response(request)
+
+    def get_grouped_forms(self, request: Request) -> Response:
+        """
+        Returns a list of custom forms registered with the admin, grouped using
+        `form_group`.
+        """
+        return self._grouped_forms_response.to_response(request)
 
     def get_single_form(self, form_slug: str) -> FormConfigResponseModel:
         """
@@ -1001,19 +1770,67 @@ class AdminRouter(FastAPI):
         if form is None:
             raise HTTPException(status_code=404, detail="No such form found")
         else:
-            return FormConfigResponseModel(
-                name=form.name,
-                slug=form.slug,
-                description=form.description,
-            )
+            return form.to_response_model()
 
-    def get_single_form_schema(self, form_slug: str) -> dict[str, Any]:
+    def get_single_form_schema(
+        self, request: Request, form_slug: str
+    ) -> Response:
         form_config = self.form_config_map.get(form_slug)
 
         if form_config is None:
             raise HTTPException(status_code=404, detail="No such form found")
         else:
-            return form_config.pydantic_model.model_json_schema()
+            return form_config._schema_response.to_response(request)
+
+    async def shutdown(self):
+        """
+        Stops the worker processes used by ``FormConfig(executor='process')``.
+
+        It's called when the app shuts down. Starlette doesn't send lifespan
+        events to mounted apps though, so if the admin is mounted within
+        another app, call this from the other app's lifespan instead.
+        """
+        if self._form_process_pool is not None:
+            process_pool = self._form_process_pool
+            self._form_process_pool = None
+            await anyio.to_thread.run_sync(
+                partial(process_pool.shutdown, cancel_futures=True)
+            )
+
+    async def _run_form_endpoint(
+        self,
+        form_config: FormConfig,
+        request: Request,
+        model_instance: BaseModel,
+    ) -> FormResponse:
+        """
+        Sync endpoints are run in a thread or process pool, so they don't
+        block the event loop.
+        """
+        endpoint = cast(Callable[..., Any], form_config.endpoint)
+
+        if inspect.iscoroutinefunction(endpoint):
+            return await endpoint(request, model_instance)
+
+        if form_config.executor == "process":
+            if self._form_process_pool is None:
+                self._form_process_pool = ProcessPoolExecutor(
+                    max_workers=self.form_process_limit
+                )
+            return await asyncio.get_running_loop().run_in_executor(
+                self._form_process_pool, endpoint, None, model_instance
+            )
+
+        if self._form_thread_limiter is None:
+            self._form_thread_limiter = anyio.CapacityLimiter(
+                self.form_thread_limit
+            )
+        return await anyio.to_thread.run_sync(
+            endpoint,
+            request,
+            model_instance,
+            limiter=self._form_thread_limiter,
+        )
 
     async def post_single_form(self, request: Request, form_slug: str) -> Any:
         """
@@ -1036,36 +1853,131 @@ class AdminRouter(FastAPI):
                 {"detail": json.loads(exception.json())}, status_code=422
             )
 
+        if form_config.background:
+            job = await self.form_job_manager.submit(
+                job=Job(form_slug=form_slug, user_id=request.user.user.id),
+                function=partial(
+                    self._run_form_job,
+                    form_config=form_config,
+                    request=_detach_request(request),
+                    model_instance=model_instance,
+                ),
+            )
+            return JSONResponse(
+                job.to_response_model().model_dump(mode="json"),
+                status_code=202,
+            )
+
         try:
-            endpoint = form_config.endpoint
-            if inspect.iscoroutinefunction(endpoint):
-                response = await endpoint(  # type: ignore
-                    request, model_instance
-                )
-            else:
-                response = endpoint(request, model_instance)
+            response = await self._run_form_endpoint(
+                form_config=form_config,
+                request=request,
+                model_instance=model_instance,
+            )
         except ValueError as exception:
             return JSONResponse(
                 {"custom_form_error": str(exception)}, status_code=422
             )
 
         if isinstance(response, FileResponse):
-            headers = {
-                "Content-Disposition": (
-                    f'attachment; filename="{response.file_name}"'
-                )
-            }
-            return Response(
-                response.contents.getvalue(),
-                headers=headers,
-                media_type=response.media_type,
-            )
+            return response.to_response()
 
         message = (
             response if isinstance(response, str) else "Successfully submitted"
         )
         return JSONResponse({"custom_form_success": message})
 
+    async def _run_form_job(
+        self,
+        job: Job,
+        form_config: FormConfig,
+        request: Request,
+        model_instance: BaseModel,
+    ):
+        """
+        Runs a background form's endpoint, and stores the result on the job.
+        """
+        response = await self._run_form_endpoint(
+            form_config=form_config,
+            request=request,
+            model_instance=model_instance,
+        )
+
+        if isinstance(response, FileResponse):
+            job.file_path = await write_job_file(response.contents)
+            job.file_name = response.file_name
+            job.media_type = response.media_type
+        else:
+            job.message = (
+                response
+                if isinstance(response, str)
+                else "Successfully submitted"
+            )
+
+    async def _get_form_job(
+        self, request: Request, form_slug: str, job_id: str
+    ) -> Job:
+        """
+        Users can only access their own jobs, unless they're a superuser.
+        """
+        job = await self.form_job_manager.store.get(job_id)
+        user: BaseUser = request.user.user
+
+        if (
+            job is None
+            or job.form_slug != form_slug
+            or (job.user_id != user.id and not user.superuser)
+        ):
+            raise HTTPException(status_code=404, detail="No such job found")
+
+        return job
+
+    async def get_form_job(
+        self, request: Request, form_slug: str, job_id: str
+    ) -> FormJobResponseModel:
+        """
+        Returns the status of a background form job.
+        """
+        job = await self._get_form_job(
+            request=request, form_slug=form_slug, job_id=job_id
+        )
+        return job.to_response_model()
+
+    async def cancel_form_job(
+        self, request: Request, form_slug: str, job_id: str
+    ) -> FormJobResponseModel:
+        """
+        Cancels a background form job, if it hasn't already finished.
+        """
+        job = await self._get_form_job(
+            request=request, form_slug=form_slug, job_id=job_id
+        )
+        job = await self.form_job_manager.cancel(job)
+        return job.to_response_model()
+
+    async def download_form_job_file(
+        self, request: Request, form_slug: str, job_id: str
+    ) -> Response:
+        """
+        Downloads the file returned by a background form job.
+        """
+        job = await self._get_form_job(
+            request=request, form_slug=form_slug, job_id=job_id
+        )
+
+        if (
+            job.file_path is None
+            or job.file_name is None
+            or not os.path.exists(job.file_path)
+        ):
+            raise HTTPException(status_code=404, detail="No file found")
+
+        return FileResponse(
+            contents=pathlib.Path(job.file_path),
+            file_name=job.file_name,
+            media_type=job.media_type or "application/octet-stream",
+        ).to_response()
+
     ###########################################################################
 
     def get_meta(self) -> MetaResponseModel:
@@ -1090,6 +2002,13 @@ class AdminRouter(FastAPI):
         """
         return [i.table_class._meta.tablename for i in self.table_configs]
 
+    def get_table_references(self, request: Request) -> Response:
+        """
+        Returns the tables with foreign keys to each table, along with the
+        name of the foreign key column.
+        """
+        return self.table_references_response.to_response(request)
+
     def get_table_list_grouped(self) -> GroupedTableNamesResponseModel:
         """
         Returns a list of all apps with tables registered with the admin,
@@ -1117,33 +2036,166 @@ class AdminRouter(FastAPI):
 
     ###########################################################################
 
-    def get_translation_list(self) -> TranslationListResponse:
+    def get_translation_list(self, request: Request) -> Response:
         """
         Return a list of language codes and names for each available
         translation.
         """
-        return TranslationListResponse(
-            translations=[
-                TranslationListItem(
-                    language_code=translation.language_code,
-                    language_name=translation.language_name,
-                )
-                for translation in self.translations_map.values()
-            ],
-            default_language_code=self.default_language_code,
-        )
+        return self.translation_list_response.to_response(request)
 
-    def get_translation(self, language_code: str = "en") -> Translation:
+    def get_translation(
+        self, request: Request, language_code: str = "en"
+    ) -> Response:
         """
         Return a single language. The ``language_code`` is an IETF language
         code, for example 'en' for English.
+
+        If the ``v`` query param matches the current ``translations_version``,
+        the response is cached by the browser indefinitely.
         """
-        translation = self.translations_map.get(language_code.lower())
-        if translation is None:
+        response = self.translation_responses.get(language_code.lower())
+        if response is None:
             raise HTTPException(
                 status_code=404, detail="Translation not found"
             )
-        return translation
+
+        cache_control = (
+            TRANSLATION_IMMUTABLE_CACHE_CONTROL
+            if request.query_params.get("v") == self.translations_version
+            else None
+        )
+        return response.to_response(request, cache_control=cache_control)
+
+    ###########################################################################
+    # Bootstrap
+
+    def _resolve_language_code(
+        self,
+        language_code: Optional[str] = None,
+        browser_language_code: Optional[str] = None,
+    ) -> str:
+        """
+        Works out which translation the UI should use. The same logic used to
+        be in the UI, before the bootstrap endpoint existed.
+
+        :param language_code:
+            The language the user previously chose.
+        :param browser_language_code:
+            The browser's language, for example 'en-GB'. Only used if
+            ``default_language_code`` is ``'auto'``.
+
+        """
+        available = self.translation_responses
+
+        if language_code and language_code.lower() in available:
+            return language_code.lower()
+
+        if self.default_language_code == "auto":
+            if browser_language_code:
+                browser_language_code = browser_language_code.lower()
+                # For example, if 'en-gb' isn't available, try 'en'.
+                for code in (
+                    browser_language_code,
+                    browser_language_code.split("-")[0],
+                ):
+                    if code in available:
+                        return code
+        elif self.default_language_code.lower() in available:
+            return self.default_language_code.lower()
+
+        return "en" if "en" in available else next(iter(available))
+
+    def _get_public_bootstrap_response(
+        self, language_code: str
+    ) -> CachedResponse:
+        response = self._public_bootstrap_responses.get(language_code)
+
+        if response is None:
+            # It's built from the existing serialised responses, rather than
+            # serialising everything again.
+            response = CachedResponse(
+                body=b"".join(
+                    [
+                        b'{"meta":',
+                        self.get_meta().model_dump_json().encode(),
+                        b',"translations":',
+                        self.translation_list_response.body,
+                        b',"translation":',
+                        self.translation_responses[language_code].body,
+                        b"}",
+                    ]
+                ),
+                cache_control=TRANSLATION_CACHE_CONTROL,
+                compress=True,
+            )
+            self._public_bootstrap_responses[language_code] = response
+
+        return response
+
+    @functools.cached_property
+    def _bootstrap_body(self) -> bytes:
+        """
+        The parts of the bootstrap response which are the same for every
+        user.
+        """
+        return b"".join(
+            [
+                b'"tables":',
+                self.get_table_list_grouped().model_dump_json().encode(),
+                b',"forms":',
+                self._grouped_forms_response.body,
+                b',"links":',
+                bytes(JSONResponse(self.sidebar_links).body),
+            ]
+        )
+
+    def get_public_bootstrap(
+        self,
+        request: Request,
+        language_code: Optional[str] = None,
+        browser_language_code: Optional[str] = None,
+    ) -> Response:
+        """
+        Everything the UI needs before the user has logged in, in a single
+        response - the site name, the available translations, and the
+        translation for the user's language.
+        """
+        return self._get_public_bootstrap_response(
+            self._resolve_language_code(
+                language_code=language_code,
+                browser_language_code=browser_language_code,
+            )
+        ).to_response(request)
+
+    def get_bootstrap(
+        self,
+        request: Request,
+        language_code: Optional[str] = None,
+        browser_language_code: Optional[str] = None,
+    ) -> Response:
+        """
+        Everything the UI needs on startup, in a single response, rather than
+        making lots of separate requests. The ``public`` part is the same as
+        ``/public/bootstrap/``.
+        """
+        public = self._get_public_bootstrap_response(
+            self._resolve_language_code(
+                language_code=language_code,
+                browser_language_code=browser_language_code,
+            )
+        )
+        body = b"".join(
+            [
+                b'{"public":',
+                public.body,
+                b",",
+                self._bootstrap_body,
+                b',"user":',
+                self.get_user(request).model_dump_json().encode(),
+                b"}",
+            ]
+        )
+        return CachedResponse(body=body).to_response(request)
 
 
 def get_all_tables(
@@ -1152,30 +2204,7 @@ def get_all_tables(
     """
     Fetch any related tables, and include them.
     """
-    output: list[type[Table]] = []
-
-    def get_references(table: type[Table]):
-        references: list[Union[type[Table], Any]] = [
-            i._foreign_key_meta.references
-            for i in table._meta.foreign_key_columns
-        ]
-        for reference in references:
-            table = (
-                reference.resolve()
-                if isinstance(reference, LazyTableReference)
-                else reference
-            )
-
-            if table not in output:
-                output.append(table)
-                get_references(table)
-
-    for table in tables:
-        if table not in output:
-            output.append(table)
-        get_references(table)
-
-    return output
+    return TableGraph(tables, include_related=True).tables
 
 
 def create_admin(
@@ -1198,6 +2227,17 @@ def create_admin(
     debug: bool = False,
     sidebar_links: dict[str, str] = {},
     mfa_providers: Optional[Sequence[MFAProvider]] = None,
+    lazy_tables: bool = False,
+    form_thread_limit: int = 10,
+    form_process_limit: Optional[int] = None,
+    form_job_limit: int = 5,
+    form_job_store: Optional[JobStore] = None,
+    json_backend: JSONBackend = "json",
+    compression: Sequence[Encoding] = (),
+    compression_minimum_size: int = 1000,
+    session_cache_ttl: Optional[float] = None,
+    session_cache_size: int = 1000,
+    password_thread_limit: int = 4,
 ):
     """
     :param tables:
@@ -1234,7 +2274,10 @@ def create_admin(
         Rate limiting middleware is used to protect the login endpoint
         against brute force attack. If not set, an
         :class:`InMemoryLimitProvider <piccolo_api.rate_limiting.middleware.InMemoryLimitProvider>`
-        will be configured with reasonable defaults.
+        will be configured with reasonable defaults. It only counts requests
+        in each worker process - to share the counts between all of the
+        workers on a host, use
+        :class:`SQLiteLimitProvider <piccolo_admin.rate_limiting.SQLiteLimitProvider>`.
     :param production:
         If ``True``, the admin will enforce stronger security - for example,
         the cookies used will be secure, meaning they are only sent over
@@ -1321,6 +2364,56 @@ def create_admin(
 
     :param mfa_providers:
         Enables Multi-factor Authentication in the login process.
+    :param lazy_tables:
+        By default, the API endpoints for every table are created on startup,
+        which involves creating several Pydantic models per table. If you
+        have hundreds of tables, this slows down startup, and uses a lot of
+        memory. If ``True``, the endpoints for a table are only created when
+        it's first accessed.
+    :param form_thread_limit:
+        The maximum number of sync form endpoints which can run at the same
+        time in the thread pool. Any others wait until a thread is free.
+    :param form_process_limit:
+        The number of processes used for form endpoints with
+        ``executor='process'``. Defaults to the number of CPUs.
+    :param form_job_limit:
+        The maximum number of background form jobs (i.e.
+        ``FormConfig(background=True)``) which can run at the same time. Any
+        others are queued.
+    :param form_job_store:
+        Where the state of background form jobs is stored. Defaults to
+        ``InMemoryJobStore``. If you run several workers, or want jobs to
+        survive restarts, use ``TableJobStore`` instead.
+    :param json_backend:
+        Either ``'json'`` (the default), or ``'orjson'``, which is much faster
+        for large pages of rows (it requires ``orjson`` to be installed -
+        ``pip install piccolo_admin[orjson]``). The list endpoints then skip
+        validating each row with Pydantic, as the values come straight from
+        the database, and ``orjson`` is used for endpoints which don't have a
+        response model.
+    :param compression:
+        The encodings used to compress API responses, in order of
+        preference - ``'br'`` (only used if ``brotli`` is installed), and
+        ``'gzip'``. It's disabled by default, as the reverse proxy often
+        does it already - for example ``compression=['br', 'gzip']``.
+    :param compression_minimum_size:
+        API responses smaller than this many bytes aren't compressed.
+    :param session_cache_ttl:
+        If set, the user for each session token is cached in memory for this
+        many seconds, so API requests don't need to query the session and
+        user tables each time. The cache is cleared when the user logs out,
+        changes their password, or when the user or session tables are
+        edited. Each worker process has its own cache, so changes made in
+        another process take up to this long to apply. The metrics are
+        available via ``AdminRouter.session_cache.metrics``.
+    :param session_cache_size:
+        The maximum number of sessions cached when ``session_cache_ttl`` is
+        set.
+    :param password_thread_limit:
+        Checking passwords (when logging in, changing password, or setting up
+        MFA) is deliberately slow, so it's done in a thread pool, to avoid
+        blocking other requests. This is the maximum number of passwords
+        which are checked at the same time - any others wait their turn.
 
     """  # noqa: E501
     auth_table = auth_table or BaseUser
@@ -1368,4 +2461,15 @@ def create_admin(
         debug=debug,
         sidebar_links=sidebar_links,
         mfa_providers=mfa_providers,
+        lazy_tables=lazy_tables,
+        form_thread_limit=form_thread_limit,
+        form_process_limit=form_process_limit,
+        form_job_limit=form_job_limit,
+        form_job_store=form_job_store,
+        json_backend=json_backend,
+        compression=compression,
+        compression_minimum_size=compression_minimum_size,
+        session_cache_ttl=session_cache_ttl,
+        session_cache_size=session_cache_size,
+        password_thread_limit=password_thread_limit,
     )
@@ -176,6 +176,7 @@ director_config = TableConfig(
 studio_config = TableConfig(
     table_class=Studio,
     menu_group="Movies",
+    preview_length=200,
 )
 
 ticket_config = TableConfig(
@@ -267,7 +268,13 @@ APP = create_admin(
 )
 
 
-def run(persist: bool = False, engine: str = "sqlite", inflate: int = 0):
+def run(
+    persist: bool = False,
+    engine: str = "sqlite",
+    inflate: int = 0,
+    inflate_chunk_size: int = 1000,
+    inflate_processes: int = 1,
+):
     """
     Start the Piccolo admin.
 
@@ -279,13 +286,25 @@ def run(persist: bool = False, engine: str = "sqlite", inflate: int = 0):
         If set, this number of extra rows are inserted containing dummy data.
         This is useful when you need to test with lots of data. Example
         `--inflate=10000`.
+    :param inflate_chunk_size:
+        How many rows are generated and inserted at a time when using
+        `--inflate`.
+    :param inflate_processes:
+        Generating the dummy data is CPU intensive. For large values of
+        `--inflate`, it can be generated in several processes. Example
+        `--inflate=1000000 --inflate_processes=4`.
 
     """
     set_engine(engine)
     create_schema(persist=persist)
 
     if not persist:
-        populate_data(inflate=inflate, engine=engine)
+        populate_data(
+            inflate=inflate,
+            engine=engine,
+            inflate_chunk_size=inflate_chunk_size,
+            inflate_processes=inflate_processes,
+        )
 
     # Server
     class CustomConfig(Config):
@@ -2,8 +2,11 @@ import datetime
 import decimal
 import enum
 import logging
+import multiprocessing
 import os
 import random
+from collections.abc import Iterable
+from typing import Any, cast
 
 from piccolo.apps.user.tables import BaseUser
 from piccolo.columns.column_types import (
@@ -32,6 +35,7 @@ from piccolo.columns.readable import Readable
 from piccolo.engine.postgres import PostgresEngine
 from piccolo.engine.sqlite import SQLiteEngine
 from piccolo.table import Table, create_db_tables_sync, drop_db_tables_sync
+from piccolo.utils.sync import run_sync
 from piccolo_api.mfa.authenticator.tables import (
     AuthenticatorSecret as AuthenticatorSecret_,
 )
@@ -328,13 +332,22 @@ def create_schema(persist: bool = False):
     create_db_tables_sync(*TABLE_CLASSES, if_not_exists=True)
 
 
-def populate_data(inflate: int = 0, engine: str = "sqlite"):
+def populate_data(
+    inflate: int = 0,
+    engine: str = "sqlite",
+    inflate_chunk_size: int = 1000,
+    inflate_processes: int = 1,
+):
     """
     Populate the database with some example data.
 
     :param inflate:
         If set, this number of extra rows are inserted containing dummy data.
         This is useful for testing.
+    :param inflate_chunk_size:
+        See :func:`inflate_data`.
+    :param inflate_processes:
+        See :func:`inflate_data`.
 
     """
     # Add some rows
@@ -375,80 +388,219 @@ def populate_data(inflate: int = 0, engine: str = "sqlite"):
     new_user.save().run_sync()
 
     if inflate:
-        try:
-            import faker
-        except ImportError:
-            print(
-                "Install faker to use this feature: "
-                "`pip install piccolo_admin[faker]`"
-            )
+        inflate_data(
+            inflate,
+            engine=engine,
+            chunk_size=inflate_chunk_size,
+            processes=inflate_processes,
+        )
+
+
+###############################################################################
+# Inflating the data with lots of fake rows, for load testing.
+
+DIRECTOR_COLUMNS = ("name", "gender")
+
+MOVIE_COLUMNS = (
+    "name",
+    "rating",
+    "duration",
+    "director",
+    "oscar_nominations",
+    "won_oscar",
+    "description",
+    "release_date",
+    "box_office",
+    "barcode",
+    "genre",
+)
+
+# Each row is a tuple of values, in the same order as the columns. For movies,
+# ``director`` is the index of the director within the same chunk, as we don't
+# know the director IDs until they're inserted.
+FakeChunk = tuple[list[tuple[Any, ...]], list[tuple[Any, ...]]]
+
+
+def generate_fake_chunk(args: tuple[int, int]) -> FakeChunk:
+    """
+    Generates the fake directors and movies for a single chunk. It's a
+    top level function, so it can be used with ``multiprocessing``.
+
+    :param args:
+        The number of rows to generate, and the random seed. The seed means
+        the same data is generated each time, so benchmarks are comparable.
+
+    """
+    import faker
+
+    size, seed = args
+
+    fake = faker.Faker()
+    fake.seed_instance(seed)
+    rng = random.Random(seed)
+
+    directors: list[tuple[Any, ...]] = []
+    for _ in range(size):
+        gender = rng.choice(["m", "f", "n"])
+        if gender == "m":
+            name = fake.name_male()
+        elif gender == "f":
+            name = fake.name_female()
         else:
-            fake = faker.Faker()
-            remaining = inflate
-            chunk_size = 100
-
-            while remaining > 0:
-                if remaining < chunk_size:
-                    chunk_size = remaining
-                    remaining = 0
-                else:
-                    remaining = remaining - chunk_size
-
-                directors = []
-                genders = ["m", "f", "n"]
-                for _ in range(chunk_size):
-                    gender = random.choice(genders)
-                    if gender == "m":
-                        name = fake.name_male()
-                    elif gender == "f":
-                        name = fake.name_female()
-                    else:
-                        name = fake.name_nonbinary()
-                    directors.append(Director(name=name, gender=gender))
-
-                Director.insert(*directors).run_sync()
-
-                director_ids = (
-                    Director.select(Director._meta.primary_key)
-                    .order_by(Director._meta.primary_key, ascending=False)
-                    .limit(chunk_size)
-                    .output(as_list=True)
-                    .run_sync()
-                )
+            name = fake.name_nonbinary()
+        directors.append((name, gender))
+
+    movies: list[tuple[Any, ...]] = []
+    genres = [i.value for i in Movie.Genre]
+    for _ in range(size):
+        oscar_nominations = rng.choice([0, 0, 0, 0, 0, 1, 1, 3, 5])
+        won_oscar = oscar_nominations > 0
+        rating = (
+            rng.randint(80, 100) if won_oscar else rng.randint(1, 100)
+        ) / 10
+
+        movies.append(
+            (
+                "{} {}".format(
+                    fake.word().title(),
+                    fake.word(ext_word_list=MOVIE_WORDS),
+                ),
+                rating,
+                datetime.timedelta(minutes=rng.randint(60, 210)),
+                rng.randrange(size),
+                oscar_nominations,
+                won_oscar,
+                fake.sentence(30),
+                fake.date_object(),
+                decimal.Decimal(str(rng.randint(10, 1500) / 10)),
+                rng.randint(1_000_000_000, 9_999_999_999),
+                rng.choice(genres),
+            )
+        )
+
+    return directors, movies
+
 
-                movies = []
-                genres = [i.value for i in Movie.Genre]
-                for _ in range(chunk_size):
-                    oscar_nominations = random.sample(
-                        [0, 0, 0, 0, 0, 1, 1, 3, 5], 1
-                    )[0]
-                    won_oscar = oscar_nominations > 0
-                    rating = (
-                        random.randint(80, 100)
-                        if won_oscar
-                        else random.randint(1, 100)
-                    ) / 10
-
-                    movie = Movie(
-                        name="{} {}".format(
-                            fake.word().title(),
-                            fake.word(ext_word_list=MOVIE_WORDS),
-                        ),
-                        rating=rating,
-                        duration=datetime.timedelta(
-                            minutes=random.randint(60, 210)
-                        ),
-                        director=random.sample(director_ids, 1)[0],
-                        oscar_nominations=oscar_nominations,
-                        won_oscar=won_oscar,
-                        description=fake.sentence(30),
-                        release_date=fake.date_object(),
-                        box_office=decimal.Decimal(
-                            str(random.randint(10, 1500) / 10)
-                        ),
-                        barcode=random.randint(1_000_000_000, 9_999_999_999),
-                        genre=random.choice(genres),
+def _insert_chunk(chunk: FakeChunk):
+    """
+    Uses ``INSERT ... RETURNING`` to get the director IDs, rather than having
+    to query for them afterwards.
+    """
+    directors, movies = chunk
+
+    director_ids = [
+        i["id"]
+        for i in Director.insert(
+            *[Director(**dict(zip(DIRECTOR_COLUMNS, i))) for i in directors]
+        )
+        .returning(Director.id)
+        .run_sync()
+    ]
+
+    Movie.insert(
+        *[
+            Movie(
+                **dict(
+                    zip(
+                        MOVIE_COLUMNS,
+                        (*i[:3], director_ids[i[3]], *i[4:]),
                     )
-                    movies.append(movie)
+                )
+            )
+            for i in movies
+        ]
+    ).run_sync()
+
+
+async def _copy_chunks(chunks: Iterable[FakeChunk]):
+    """
+    Postgres can load data using ``COPY`` much faster than using ``INSERT``.
+
+    ``COPY`` can't return the IDs, so we reserve the director IDs from the
+    sequence first, and insert them explicitly.
+    """
+    db = cast(PostgresEngine, Director._meta.db)
+    connection = await db.get_new_connection()
+
+    try:
+        for directors, movies in chunks:
+            director_ids = [
+                i["id"]
+                for i in await connection.fetch(
+                    "SELECT nextval(pg_get_serial_sequence('director', 'id')) "
+                    "AS id FROM generate_series(1, $1)",
+                    len(directors),
+                )
+            ]
+
+            await connection.copy_records_to_table(
+                "director",
+                records=[
+                    (director_id, *director)
+                    for director_id, director in zip(director_ids, directors)
+                ],
+                columns=["id", *DIRECTOR_COLUMNS],
+            )
+            await connection.copy_records_to_table(
+                "movie",
+                records=[(*i[:3], director_ids[i[3]], *i[4:]) for i in movies],
+                columns=list(MOVIE_COLUMNS),
+            )
+    finally:
+        await connection.close()
+
 
-                Movie.insert(*movies).run_sync()
+def inflate_data(
+    count: int,
+    engine: str = "sqlite",
+    chunk_size: int = 1000,
+    processes: int = 1,
+):
+    """
+    Inserts lots of fake directors and movies, which is useful for load
+    testing. Requires ``faker``.
+
+    :param count:
+        How many directors, and how many movies to insert.
+    :param chunk_size:
+        How many rows are generated, and inserted, at a time. Bigger chunks
+        are faster, but use more memory. For SQLite, ``chunk_size`` multiplied
+        by the number of movie columns has to be less than SQLite's variable
+        limit (32766 by default).
+    :param processes:
+        Generating the fake data is usually slower than inserting it. If
+        greater than 1, the data is generated in this many processes.
+
+    """
+    try:
+        import faker  # noqa: F401
+    except ImportError:
+        print(
+            "Install faker to use this feature: "
+            "`pip install piccolo_admin[faker]`"
+        )
+        return
+
+    chunk_args = [
+        (min(chunk_size, count - offset), offset)
+        for offset in range(0, count, chunk_size)
+    ]
+
+    pool = multiprocessing.Pool(processes) if processes > 1 else None
+
+    try:
+        chunks: Iterable[FakeChunk] = (
+            pool.imap(generate_fake_chunk, chunk_args)
+            if pool
+            else map(generate_fake_chunk, chunk_args)
+        )
+
+        if engine == "postgres":
+            run_sync(_copy_chunks(chunks))
+        else:
+            for chunk in chunks:
+                _insert_chunk(chunk)
+    finally:
+        if pool:
+            pool.close()
+            pool.join()
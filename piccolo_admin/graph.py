@@ -0,0 +1,115 @@
+"""
+The foreign key relationships between tables, worked out once at startup.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+from typing import Union
+
+from piccolo.columns.column_types import ForeignKey
+from piccolo.columns.reference import LazyTableReference
+from piccolo.table import Table
+
+
+def get_referenced_table(column: ForeignKey) -> type[Table]:
+    reference: Union[type[Table], LazyTableReference] = (
+        column._foreign_key_meta.references
+    )
+    return (
+        reference.resolve()
+        if isinstance(reference, LazyTableReference)
+        else reference
+    )
+
+
+class TableGraph:
+    """
+    A graph of tables, where the edges are foreign keys.
+
+    :param tables:
+        The tables to add to the graph.
+    :param include_related:
+        If ``True``, any tables which ``tables`` reference (directly, or
+        indirectly) are added too.
+
+    """
+
+    def __init__(
+        self, tables: Iterable[type[Table]], include_related: bool = True
+    ) -> None:
+        # A dict, rather than a set, so the tables stay in order.
+        self._tables: dict[type[Table], None] = {}
+
+        #: Maps each table to its foreign key columns.
+        self.forward: dict[type[Table], list[ForeignKey]] = {}
+
+        #: Maps each table to the foreign key columns in other tables which
+        #: reference it. Only tables in the graph are included.
+        self.reverse: dict[type[Table], list[ForeignKey]] = {}
+
+        for table in tables:
+            if include_related:
+                for related_table in self._traverse(table):
+                    self._add(related_table)
+            else:
+                self._add(table)
+
+        for table, columns in self.forward.items():
+            for column in columns:
+                referenced_table = get_referenced_table(column)
+                if referenced_table in self._tables:
+                    self.reverse[referenced_table].append(column)
+
+    def _add(self, table: type[Table]) -> None:
+        if table not in self._tables:
+            self._tables[table] = None
+            self.forward[table] = list(table._meta.foreign_key_columns)
+            self.reverse[table] = []
+
+    def _traverse(self, table: type[Table]) -> Iterator[type[Table]]:
+        """
+        Yields ``table``, and then the tables it references, depth first.
+
+        It uses a stack rather than recursion, so long chains of foreign keys
+        don't hit the recursion limit.
+        """
+        visited = {table}
+        yield table
+
+        stack = [iter(table._meta.foreign_key_columns)]
+
+        while stack:
+            column = next(stack[-1], None)
+            if column is None:
+                stack.pop()
+                continue
+
+            referenced_table = get_referenced_table(column)
+            if referenced_table in visited or referenced_table in self._tables:
+                continue
+
+            visited.add(referenced_table)
+            yield referenced_table
+            stack.append(iter(referenced_table._meta.foreign_key_columns))
+
+    @property
+    def tables(self) -> list[type[Table]]:
+        return list(self._tables.keys())
+
+    def __contains__(self, table: type[Table]) -> bool:
+        return table in self._tables
+
+    def get_referenced_tables(self, table: type[Table]) -> list[type[Table]]:
+        """
+        The tables which ``table`` has foreign keys to.
+        """
+        return list(
+            dict.fromkeys(get_referenced_table(i) for i in self.forward[table])
+        )
+
+    def get_referencing_columns(self, table: type[Table]) -> list[ForeignKey]:
+        """
+        The foreign key columns in other tables which reference ``table``.
+        """
+        return self.reverse.get(table, [])
@@ -0,0 +1,517 @@
+"""
+Background jobs, for custom forms which take too long to run within a single
+HTTP request (see ``FormConfig(background=True)``).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import enum
+import io
+import logging
+import os
+import shutil
+import tempfile
+import uuid
+from abc import ABCMeta, abstractmethod
+from collections.abc import AsyncIterable, Awaitable, Callable, Iterable
+from dataclasses import dataclass, field, fields
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+
+import anyio.to_thread
+from piccolo.columns import Integer, Real, Text, Timestamptz, Varchar
+from piccolo.table import Table
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+
+class JobStatus(str, enum.Enum):
+    pending = "pending"
+    running = "running"
+    succeeded = "succeeded"
+    failed = "failed"
+    cancelled = "cancelled"
+
+
+FINISHED_STATUSES = (
+    JobStatus.succeeded,
+    JobStatus.failed,
+    JobStatus.cancelled,
+)
+
+
+def _now() -> datetime:
+    return datetime.now(tz=timezone.utc)
+
+
+@dataclass
+class Job:
+    """
+    The state of a single background job.
+
+    :param progress:
+        Between 0 and 1, if the endpoint reports its progress using
+        :func:`report_progress`.
+    :param message:
+        Once the job has finished, either the success or error message.
+    :param file_path:
+        If the endpoint returned a ``FileResponse``, its contents are written
+        to this file, so it can be downloaded later.
+
+    """
+
+    form_slug: str
+    user_id: int
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    status: JobStatus = JobStatus.pending
+    progress: Optional[float] = None
+    progress_message: Optional[str] = None
+    message: Optional[str] = None
+    file_name: Optional[str] = None
+    media_type: Optional[str] = None
+    file_path: Optional[str] = None
+    created_at: datetime = field(default_factory=_now)
+    finished_at: Optional[datetime] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATUSES
+
+    def to_response_model(self) -> FormJobResponseModel:
+        return FormJobResponseModel(
+            id=self.id,
+            form_slug=self.form_slug,
+            status=self.status,
+            progress=self.progress,
+            progress_message=self.progress_message,
+            message=self.message,
+            file_name=self.file_name if self.file_path else None,
+            created_at=self.created_at,
+            finished_at=self.finished_at,
+        )
+
+
+class FormJobResponseModel(BaseModel):
+    id: str
+    form_slug: str
+    status: JobStatus
+    progress: Optional[float] = None
+    progress_message: Optional[str] = None
+    message: Optional[str] = None
+    file_name: Optional[str] = None
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+
+
+###############################################################################
+# Stores
+
+
+class JobStore(metaclass=ABCMeta):
+    """
+    Persists the state of jobs. Subclass it to store jobs somewhere else.
+
+    :param ttl:
+        How long to keep finished jobs for, so the user has time to see the
+        result, or download the file.
+
+    """
+
+    def __init__(self, ttl: timedelta = timedelta(hours=1)):
+        self.ttl = ttl
+
+    @abstractmethod
+    async def save(self, job: Job) -> None:
+        """
+        If the job has been cancelled (for example, by another worker), it
+        shouldn't be overwritten with a different status.
+        """
+        pass
+
+    @abstractmethod
+    async def get(self, job_id: str) -> Optional[Job]:
+        pass
+
+    @abstractmethod
+    async def delete_expired(self) -> list[Job]:
+        """
+        Removes finished jobs which are older than ``ttl``, and returns them.
+        """
+        pass
+
+
+class InMemoryJobStore(JobStore):
+    """
+    Jobs are only visible to the process which created them, and are lost when
+    it restarts.
+    """
+
+    def __init__(self, ttl: timedelta = timedelta(hours=1)):
+        super().__init__(ttl=ttl)
+        self.jobs: dict[str, Job] = {}
+
+    async def save(self, job: Job) -> None:
+        self.jobs[job.id] = job
+
+    async def get(self, job_id: str) -> Optional[Job]:
+        return self.jobs.get(job_id)
+
+    async def delete_expired(self) -> list[Job]:
+        cutoff = _now() - self.ttl
+        expired = [
+            job
+            for job in self.jobs.values()
+            if job.finished_at is not None and job.finished_at < cutoff
+        ]
+        for job in expired:
+            del self.jobs[job.id]
+        return expired
+
+
+class FormJob(Table, tablename="piccolo_admin_form_job"):
+    """
+    Used by :class:`TableJobStore`. Add ``piccolo_admin.jobs.piccolo_app`` to
+    your ``APP_REGISTRY``, and run its migrations to create it.
+    """
+
+    job_id = Varchar(length=32, unique=True, index=True)
+    form_slug = Varchar(length=255)
+    user_id = Integer()
+    status = Varchar(length=20, default=JobStatus.pending.value)
+    progress = Real(null=True, default=None)
+    progress_message = Text(null=True, default=None)
+    message = Text(null=True, default=None)
+    file_name = Varchar(length=255, null=True, default=None)
+    media_type = Varchar(length=255, null=True, default=None)
+    file_path = Text(null=True, default=None)
+    created_at = Timestamptz()
+    finished_at = Timestamptz(null=True, default=None)
+
+
+class TableJobStore(JobStore):
+    """
+    Stores jobs in a database table, so the job status is still available if
+    the worker restarts, or if the next request is handled by a different
+    worker.
+
+    Files returned by the endpoints are written to ``tempfile.gettempdir()``,
+    so if the workers are on different machines, they need to share it.
+
+    """
+
+    def __init__(
+        self,
+        table: type[FormJob] = FormJob,
+        ttl: timedelta = timedelta(hours=1),
+    ):
+        super().__init__(ttl=ttl)
+        self.table = table
+
+    def _to_row(self, job: Job) -> dict[str, Any]:
+        return {
+            i.name: getattr(job, i.name)
+            for i in fields(Job)
+            if i.name not in ("id", "status")
+        } | {"job_id": job.id, "status": job.status.value}
+
+    def _to_job(self, row: dict[str, Any]) -> Job:
+        return Job(
+            **{
+                i.name: row[i.name]
+                for i in fields(Job)
+                if i.name not in ("id", "status")
+            },
+            id=row["job_id"],
+            status=JobStatus(row["status"]),
+        )
+
+    async def save(self, job: Job) -> None:
+        values = self._to_row(job)
+        query = self.table.update(**values).where(self.table.job_id == job.id)
+        if job.status != JobStatus.cancelled:
+            query = query.where(self.table.status != JobStatus.cancelled.value)
+
+        updated = await query.returning(self.table._meta.primary_key).run()
+        if (
+            not updated
+            and not await self.table.exists()
+            .where(self.table.job_id == job.id)
+            .run()
+        ):
+            await self.table.insert(self.table(**values)).run()
+
+    async def get(self, job_id: str) -> Optional[Job]:
+        row = (
+            await self.table.select()
+            .where(self.table.job_id == job_id)
+            .first()
+            .run()
+        )
+        return None if row is None else self._to_job(row)
+
+    async def delete_expired(self) -> list[Job]:
+        cutoff = _now() - self.ttl
+        rows = (
+            await self.table.delete()
+            .where(self.table.finished_at < cutoff)
+            .returning(*self.table._meta.columns)
+            .run()
+        )
+        return [self._to_job(row) for row in rows]
+
+
+###############################################################################
+# Progress
+
+
+class JobCancelledError(Exception):
+    """
+    Raised by :func:`report_progress` if the job has been cancelled, so sync
+    endpoints running in a thread stop early.
+    """
+
+
+@dataclass
+class _JobContext:
+    job: Job
+    store: JobStore
+    loop: asyncio.AbstractEventLoop
+    cancelled: bool = False
+    save_task: Optional[asyncio.Task] = None
+
+
+_job_context: contextvars.ContextVar[Optional[_JobContext]] = (
+    contextvars.ContextVar("_job_context", default=None)
+)
+
+
+def report_progress(progress: float, message: Optional[str] = None):
+    """
+    Call this within a background form's endpoint, to show the user how far
+    along the job is. It can be called from sync or async endpoints, but does
+    nothing when the endpoint isn't running as a background job, or is
+    using ``executor='process'``.
+
+    .. code-block:: python
+
+        def my_endpoint(request, data):
+            for index, item in enumerate(items):
+                process(item)
+                report_progress(
+                    (index + 1) / len(items),
+                    message=f"Processed {index + 1} of {len(items)}",
+                )
+
+    :param progress:
+        A number between 0 and 1.
+    :param message:
+        Optional text to show next to the progress bar.
+    :raises JobCancelledError:
+        If the user has cancelled the job.
+
+    """
+    context = _job_context.get()
+    if context is None:
+        return
+
+    if context.cancelled:
+        raise JobCancelledError("The job was cancelled.")
+
+    context.job.progress = min(max(progress, 0.0), 1.0)
+    context.job.progress_message = message
+
+    def save():
+        # If a save is already in progress, we skip this one, so a slow store
+        # isn't overwhelmed. The next save stores the latest progress anyway.
+        if context.save_task is None or context.save_task.done():
+            context.save_task = context.loop.create_task(
+                context.store.save(context.job)
+            )
+
+    try:
+        running_loop = asyncio.get_running_loop()
+    except RuntimeError:
+        running_loop = None
+
+    if running_loop is context.loop:
+        save()
+    else:
+        context.loop.call_soon_threadsafe(save)
+
+
+###############################################################################
+# Files
+
+
+async def write_job_file(
+    contents: Any,
+) -> str:
+    """
+    Writes the contents of a ``FileResponse`` to a temporary file, so it can
+    be downloaded once the job has finished, and returns its path.
+    """
+    file = tempfile.NamedTemporaryFile(
+        prefix="piccolo_admin_job_", delete=False
+    )
+
+    def write_sync(chunks: Iterable[Any]):
+        with file:
+            for chunk in chunks:
+                file.write(chunk.encode() if isinstance(chunk, str) else chunk)
+
+    if isinstance(contents, (str, os.PathLike)):
+
+        def copy():
+            with file, open(contents, "rb") as source:
+                shutil.copyfileobj(source, file)
+
+        await anyio.to_thread.run_sync(copy)
+    elif isinstance(contents, (io.StringIO, io.BytesIO)):
+        await anyio.to_thread.run_sync(write_sync, [contents.getvalue()])
+    elif isinstance(contents, AsyncIterable):
+        with file:
+            async for chunk in contents:
+                file.write(chunk.encode() if isinstance(chunk, str) else chunk)
+    else:
+        # Sync generators might block, so iterate them in a thread.
+        await anyio.to_thread.run_sync(write_sync, contents)
+
+    return file.name
+
+
+def _delete_file(path: str):
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+###############################################################################
+
+
+class JobManager:
+    """
+    Runs background jobs, with at most ``limit`` running at once - any others
+    wait until a slot is free.
+    """
+
+    def __init__(self, store: Optional[JobStore] = None, limit: int = 5):
+        self.store = store or InMemoryJobStore()
+        self.limit = limit
+        # The tasks for jobs running in this process.
+        self.tasks: dict[str, asyncio.Task] = {}
+        self._contexts: dict[str, _JobContext] = {}
+        # Created when first needed, so it's bound to the right event loop.
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def submit(
+        self, job: Job, function: Callable[[Job], Awaitable[None]]
+    ) -> Job:
+        """
+        Starts the job in the background.
+
+        :param function:
+            Does the work. It can set ``message`` and the file fields on the
+            job, and any ``ValueError`` it raises is shown to the user.
+
+        """
+        for expired_job in await self.store.delete_expired():
+            if expired_job.file_path:
+                _delete_file(expired_job.file_path)
+
+        await self.store.save(job)
+
+        loop = asyncio.get_running_loop()
+        context = _JobContext(job=job, store=self.store, loop=loop)
+        self._contexts[job.id] = context
+        task = loop.create_task(self._run(context=context, function=function))
+        # If the task is cancelled before it starts, ``_run`` never cleans up.
+        task.add_done_callback(lambda _: self._forget(job.id))
+        self.tasks[job.id] = task
+        return job
+
+    def _forget(self, job_id: str):
+        self.tasks.pop(job_id, None)
+        self._contexts.pop(job_id, None)
+
+    async def _run(
+        self,
+        context: _JobContext,
+        function: Callable[[Job], Awaitable[None]],
+    ):
+        job = context.job
+        _job_context.set(context)
+
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.limit)
+
+        try:
+            async with self._semaphore:
+                job.status = JobStatus.running
+                await self.store.save(job)
+                await function(job)
+            job.status = JobStatus.succeeded
+            job.progress = 1.0
+        except (asyncio.CancelledError, JobCancelledError):
+            job.status = JobStatus.cancelled
+        except ValueError as exception:
+            job.status = JobStatus.failed
+            job.message = str(exception)
+        except Exception:
+            logger.exception(f"Background job {job.id} failed")
+            job.status = JobStatus.failed
+            job.message = "Something went wrong"
+        finally:
+            self._forget(job.id)
+            if context.save_task is not None:
+                # Make sure it doesn't overwrite the final state.
+                await asyncio.wait([context.save_task])
+
+            if not context.cancelled:
+                # It might have been cancelled by another worker.
+                stored_job = await self.store.get(job.id)
+                context.cancelled = (
+                    stored_job is not None
+                    and stored_job.status == JobStatus.cancelled
+                )
+
+            if context.cancelled:
+                job.status = JobStatus.cancelled
+                if job.file_path:
+                    _delete_file(job.file_path)
+                    job.file_path = None
+
+            if job.finished_at is None:
+                job.finished_at = _now()
+
+            await self.store.save(job)
+
+    async def cancel(self, job: Job) -> Job:
+        """
+        Marks the job as cancelled. If it's running in this process, its task
+        is cancelled too. If it's running in another process, that process
+        keeps the cancelled status once the job stops.
+
+        We don't wait for the task to stop - sync endpoints running in a
+        thread can't be interrupted, and only stop once they next call
+        ``report_progress``.
+        """
+        if job.finished:
+            return job
+
+        context = self._contexts.get(job.id)
+        if context is not None:
+            context.cancelled = True
+            job = context.job
+
+        task = self.tasks.get(job.id)
+        if task is not None:
+            task.cancel()
+
+        job.status = JobStatus.cancelled
+        job.finished_at = _now()
+        await self.store.save(job)
+        return job
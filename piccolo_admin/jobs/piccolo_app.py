@@ -0,0 +1,22 @@
+"""
+An optional app, which is only needed when using ``TableJobStore``.
+"""
+
+import os
+
+from piccolo.conf.apps import AppConfig
+
+from piccolo_admin.jobs import FormJob
+
+CURRENT_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+
+
+APP_CONFIG = AppConfig(
+    app_name="piccolo_admin_jobs",
+    migrations_folder_path=os.path.join(
+        CURRENT_DIRECTORY, "piccolo_migrations"
+    ),
+    table_classes=[FormJob],
+    migration_dependencies=[],
+    commands=[],
+)
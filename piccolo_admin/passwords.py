@@ -0,0 +1,216 @@
+"""
+Hashes passwords in a thread pool, so logging in doesn't block the event loop.
+
+``BaseUser`` uses PBKDF2 with a high iteration count, which takes hundreds of
+milliseconds. ``hashlib`` releases the GIL while hashing, so threads are
+enough to stop it blocking other requests.
+"""
+
+from __future__ import annotations
+
+import datetime
+import logging
+from functools import partial
+from typing import Any, Optional, Union
+
+import anyio
+import anyio.to_thread
+from piccolo.apps.user.tables import BaseUser
+from piccolo_api.shared.auth import User
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+
+class PasswordHasher:
+    """
+    Runs ``BaseUser.hash_password`` in a thread, with at most ``limit``
+    passwords being hashed at once - any others wait their turn.
+    """
+
+    def __init__(self, limit: int = 4) -> None:
+        if limit < 1:
+            raise ValueError("`limit` must be at least 1.")
+
+        self.limit = limit
+        # This is created when first needed.
+        self._limiter: Optional[anyio.CapacityLimiter] = None
+
+    async def hash_password(
+        self,
+        auth_table: type[BaseUser],
+        password: str,
+        salt: str = "",
+        iterations: Optional[int] = None,
+    ) -> str:
+        if self._limiter is None:
+            self._limiter = anyio.CapacityLimiter(self.limit)
+
+        return await anyio.to_thread.run_sync(
+            partial(
+                auth_table.hash_password,
+                password=password,
+                salt=salt,
+                iterations=iterations,
+            ),
+            limiter=self._limiter,
+        )
+
+    async def login(
+        self, auth_table: type[BaseUser], username: str, password: str
+    ) -> Optional[int]:
+        """
+        The same as ``BaseUser.login``, except the password is hashed in a
+        thread. If ``auth_table`` has its own ``login`` method, it's used
+        instead.
+        """
+        if not _is_default(auth_table, "login"):
+            return await auth_table.login(username=username, password=password)
+
+        if (max_username_length := auth_table.username.length) and len(
+            username
+        ) > max_username_length:
+            logger.warning("Excessively long username provided.")
+            return None
+
+        if len(password) > auth_table._max_password_length:
+            logger.warning("Excessively long password provided.")
+            return None
+
+        response = (
+            await auth_table.select(
+                auth_table._meta.primary_key, auth_table.password
+            )
+            .where(auth_table.username == username)
+            .first()
+            .run()
+        )
+        if not response:
+            # We still hash the password, so the response time doesn't
+            # reveal whether the user exists.
+            await self.hash_password(auth_table, password)
+            return None
+
+        stored_password = response["password"]
+
+        _, iterations_, salt, _ = auth_table.split_stored_password(
+            stored_password
+        )
+        iterations = int(iterations_)
+
+        hashed_password = await self.hash_password(
+            auth_table, password, salt, iterations
+        )
+        if hashed_password != stored_password:
+            return None
+
+        # If the password was hashed with fewer iterations (e.g. an earlier
+        # Piccolo version), update it.
+        if iterations != auth_table._pbkdf2_iteration_count:
+            await self.update_password(auth_table, username, password)
+
+        await auth_table.update(
+            {auth_table.last_login: datetime.datetime.now()}
+        ).where(auth_table.username == username).run()
+
+        return response["id"]
+
+    async def update_password(
+        self,
+        auth_table: type[BaseUser],
+        user: Union[str, int],
+        password: str,
+    ):
+        """
+        The same as ``BaseUser.update_password``, except the password is
+        hashed in a thread.
+        """
+        if not _is_default(auth_table, "update_password"):
+            return await auth_table.update_password(
+                user=user, password=password
+            )
+
+        if isinstance(user, str):
+            clause = auth_table.username == user
+        elif isinstance(user, int):
+            clause = auth_table.id == user
+        else:
+            raise ValueError(
+                "The `user` arg must be a user id, or a username."
+            )
+
+        auth_table._validate_password(password=password)
+
+        hashed_password = await self.hash_password(auth_table, password)
+        await auth_table.update({auth_table.password: hashed_password}).where(
+            clause
+        ).run()
+
+
+def _is_default(auth_table: type[BaseUser], method_name: str) -> bool:
+    """
+    Checks whether ``auth_table`` uses the ``BaseUser`` implementation of the
+    given method, rather than overriding it.
+    """
+    return (
+        getattr(auth_table, method_name).__func__
+        is getattr(BaseUser, method_name).__func__
+    )
+
+
+class PasswordHashingProxy:
+    """
+    Wraps a ``BaseUser`` subclass, or an instance of one, so ``login`` and
+    ``update_password`` use ``PasswordHasher``. Everything else is passed
+    through to the wrapped object.
+
+    This lets us use the Piccolo API endpoints (e.g. ``session_login``)
+    without changing them.
+    """
+
+    def __init__(
+        self,
+        wrapped: Union[type[BaseUser], BaseUser],
+        password_hasher: PasswordHasher,
+    ) -> None:
+        self._wrapped = wrapped
+        self._auth_table: type[BaseUser] = (
+            wrapped if isinstance(wrapped, type) else wrapped.__class__
+        )
+        self._password_hasher = password_hasher
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._wrapped, name)
+
+    async def login(self, username: str, password: str) -> Optional[int]:
+        return await self._password_hasher.login(
+            self._auth_table, username=username, password=password
+        )
+
+    async def update_password(self, user: Union[str, int], password: str):
+        return await self._password_hasher.update_password(
+            self._auth_table, user=user, password=password
+        )
+
+
+class PasswordHashingMiddleware:
+    """
+    For endpoints which use ``request.user.user`` to check or change the
+    password (e.g. ``change_password``), we wrap the user in a
+    ``PasswordHashingProxy``.
+    """
+
+    def __init__(self, app: ASGIApp, password_hasher: PasswordHasher):
+        self.app = app
+        self.password_hasher = password_hasher
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        user = scope.get("user")
+        if isinstance(user, User):
+            scope["user"] = User(
+                user=PasswordHashingProxy(  # type: ignore
+                    user.user, password_hasher=self.password_hasher
+                )
+            )
+
+        await self.app(scope, receive, send)
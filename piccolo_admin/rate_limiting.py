@@ -0,0 +1,282 @@
+"""
+A rate limit provider which shares its counters between all of the worker
+processes on a host, using a SQLite database.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+from piccolo_api.rate_limiting.middleware import (
+    RateLimitError,
+    RateLimitingMiddleware,
+    RateLimitProvider,
+)
+from starlette.concurrency import run_in_threadpool
+from starlette.middleware.base import RequestResponseEndpoint
+from starlette.requests import Request
+from starlette.responses import Response
+
+CREATE_TABLE = """
+CREATE TABLE IF NOT EXISTS rate_limit (
+    namespace TEXT NOT NULL,
+    identifier TEXT NOT NULL,
+    window INTEGER NOT NULL,
+    current_count INTEGER NOT NULL,
+    previous_count INTEGER NOT NULL,
+    blocked_until REAL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (namespace, identifier)
+) WITHOUT ROWID
+"""
+
+
+@dataclasses.dataclass
+class _Counter:
+    window: int
+    current_count: int = 0
+    previous_count: int = 0
+    blocked_until: Optional[float] = None
+
+
+class SQLiteLimitProvider(RateLimitProvider):
+    """
+    ``InMemoryLimitProvider`` stores its counters in each process, so with
+    several workers, clients can make that many times more requests. This
+    provider stores them in a SQLite database instead, which all of the
+    workers on the host share - a local alternative to something like Redis.
+
+    It uses a sliding window - the number of requests in the previous window
+    is weighted by how much of it overlaps with the last ``timespan``
+    seconds. So each client only needs two counters, and there's no sudden
+    reset at the end of each window.
+
+    The database uses WAL mode, and each request is a single small
+    transaction. But it can still wait up to 5 seconds for another process to
+    release the write lock, so use it with ``SQLiteRateLimitingMiddleware``,
+    which calls it in a thread rather than on the event loop.
+
+    :param path:
+        The SQLite database file - it's created if it doesn't exist. Each
+        worker needs to use the same file.
+    :param timespan:
+        The length of the sliding window in seconds.
+    :param limit:
+        The number of requests allowed in the sliding window.
+    :param block_duration:
+        If set, once a client exceeds the limit, they're blocked for this
+        many seconds. Otherwise, they're allowed again as soon as they're
+        back under the limit.
+    :param namespace:
+        Lets several providers share the same database file, with separate
+        counters.
+    :param eviction_interval:
+        How often (in seconds) counters for clients which haven't made any
+        requests recently are deleted. Defaults to ``timespan``.
+
+    """
+
+    def __init__(
+        self,
+        path: str,
+        timespan: int,
+        limit: int = 1000,
+        block_duration: Optional[int] = None,
+        namespace: str = "default",
+        eviction_interval: Optional[float] = None,
+    ):
+        if timespan <= 0:
+            raise ValueError("`timespan` must be greater than 0.")
+
+        self.path = path
+        self.timespan = timespan
+        self.limit = limit
+        self.block_duration = block_duration
+        self.namespace = namespace
+        self.eviction_interval = (
+            timespan if eviction_interval is None else eviction_interval
+        )
+
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+        # The connection can't be shared with forked worker processes.
+        self._pid: Optional[int] = None
+        self._last_eviction = 0.0
+
+    def copy(
+        self,
+        namespace: str,
+        limit: Optional[int] = None,
+        timespan: Optional[int] = None,
+    ) -> SQLiteLimitProvider:
+        """
+        Returns a provider with the same settings, but separate counters.
+
+        :param limit:
+            Overrides ``limit``.
+        :param timespan:
+            Overrides ``timespan``.
+
+        """
+        return self.__class__(
+            path=self.path,
+            timespan=self.timespan if timespan is None else timespan,
+            limit=self.limit if limit is None else limit,
+            block_duration=self.block_duration,
+            namespace=namespace,
+            eviction_interval=self.eviction_interval,
+        )
+
+    def _get_connection(self) -> sqlite3.Connection:
+        if self._connection is None or self._pid != os.getpid():
+            connection = sqlite3.connect(
+                self.path,
+                timeout=5,
+                # We manage the transactions ourselves.
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(CREATE_TABLE)
+            self._connection = connection
+            self._pid = os.getpid()
+
+        return self._connection
+
+    def _get_counter(
+        self, connection: sqlite3.Connection, identifier: str, window: int
+    ) -> _Counter:
+        row = connection.execute(
+            "SELECT window, current_count, previous_count, blocked_until "
+            "FROM rate_limit WHERE namespace = ? AND identifier = ?",
+            (self.namespace, identifier),
+        ).fetchone()
+
+        if row is None:
+            return _Counter(window=window)
+
+        counter = _Counter(*row)
+
+        if counter.window == window - 1:
+            counter.previous_count = counter.current_count
+            counter.current_count = 0
+        elif counter.window != window:
+            counter.previous_count = 0
+            counter.current_count = 0
+
+        counter.window = window
+        return counter
+
+    def _evict(self, connection: sqlite3.Connection, now: float):
+        """
+        Deletes the counters which no longer affect the rate limit.
+        """
+        connection.execute(
+            "DELETE FROM rate_limit WHERE namespace = ? AND updated_at < ? "
+            "AND (blocked_until IS NULL OR blocked_until < ?)",
+            (self.namespace, now - 2 * self.timespan, now),
+        )
+        self._last_eviction = now
+
+    def increment(self, identifier: str):
+        """
+        :raises RateLimitError:
+            If the client has made too many requests.
+
+        """
+        now = time.time()
+        window = int(now // self.timespan)
+
+        with self._lock:
+            connection = self._get_connection()
+            # ``IMMEDIATE`` acquires the write lock straight away, so other
+            # processes can't update the counter in between.
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                counter = self._get_counter(connection, identifier, window)
+                counter.current_count += 1
+
+                elapsed = (now % self.timespan) / self.timespan
+                count = (
+                    counter.previous_count * (1 - elapsed)
+                    + counter.current_count
+                )
+
+                blocked = (
+                    counter.blocked_until is not None
+                    and counter.blocked_until > now
+                )
+                if not blocked and count > self.limit:
+                    blocked = True
+                    if self.block_duration:
+                        counter.blocked_until = now + self.block_duration
+
+                connection.execute(
+                    "INSERT OR REPLACE INTO rate_limit VALUES "
+                    "(?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        self.namespace,
+                        identifier,
+                        counter.window,
+                        counter.current_count,
+                        counter.previous_count,
+                        counter.blocked_until,
+                        now,
+                    ),
+                )
+
+                if now - self._last_eviction >= self.eviction_interval:
+                    self._evict(connection, now)
+
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+
+        if blocked:
+            raise RateLimitError()
+
+    def clear_blocked(self):
+        """
+        Resets the block list.
+        """
+        with self._lock:
+            self._get_connection().execute(
+                "UPDATE rate_limit SET blocked_until = NULL "
+                "WHERE namespace = ?",
+                (self.namespace,),
+            )
+
+
+class SQLiteRateLimitingMiddleware(RateLimitingMiddleware):
+    """
+    The same as ``RateLimitingMiddleware``, except a ``SQLiteLimitProvider``
+    is called in a thread, so waiting for the database lock doesn't block the
+    event loop.
+    """
+
+    async def dispatch(
+        self, request: Request, call_next: RequestResponseEndpoint
+    ) -> Response:
+        if not isinstance(self.rate_limit, SQLiteLimitProvider):
+            return await super().dispatch(request, call_next)
+
+        if not request.client:
+            # If we can't get the client, we have to reject the request.
+            return Response(
+                content="Client host can't be found.", status_code=400
+            )
+
+        try:
+            await run_in_threadpool(
+                self.rate_limit.increment, request.client.host
+            )
+        except RateLimitError:
+            return Response(content="Too many requests", status_code=429)
+        return await call_next(request)
@@ -35,7 +35,13 @@ APP = create_admin(
 )
 
 
-def sandbox(host: str = "localhost", port: int = 8080):
+def sandbox(
+    host: str = "localhost",
+    port: int = 8080,
+    inflate: int = 0,
+    inflate_chunk_size: int = 1000,
+    inflate_processes: int = 1,
+):
     """
     Run the Piccolo Admin in read only mode with a SQLite database.
 
@@ -43,11 +49,22 @@ def sandbox(host: str = "localhost", port: int = 8080):
         Which host to serve the app on.
     :param host:
         Which port to serve the app on.
+    :param inflate:
+        If set, this number of extra rows are inserted containing dummy data.
+    :param inflate_chunk_size:
+        How many rows are generated and inserted at a time when using
+        `--inflate`.
+    :param inflate_processes:
+        How many processes to use for generating the dummy data.
 
     """
     set_engine()
     create_schema(persist=False)
-    populate_data()
+    populate_data(
+        inflate=inflate,
+        inflate_chunk_size=inflate_chunk_size,
+        inflate_processes=inflate_processes,
+    )
 
     uvicorn.run(APP, host=host, port=port)
 
@@ -0,0 +1,262 @@
+"""
+An in-process cache of session lookups, so each API request doesn't need to
+query the session and user tables.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Optional
+
+from piccolo.apps.user.tables import BaseUser as PiccoloBaseUser
+from piccolo_api.session_auth.middleware import SessionsAuthBackend
+from piccolo_api.shared.auth import UnauthenticatedUser, User
+from piccolo_api.shared.auth.excluded_paths import check_excluded_paths
+from starlette.authentication import (
+    AuthCredentials,
+    AuthenticationError,
+    BaseUser,
+)
+from starlette.requests import HTTPConnection
+
+
+@dataclass
+class CachedSession:
+    user: PiccoloBaseUser
+    expiry_date: datetime
+    max_expiry_date: datetime
+    #: When the entry stops being valid, based on ``time.monotonic``.
+    cached_until: float
+
+    def is_valid(self, now: datetime) -> bool:
+        return self.expiry_date > now and self.max_expiry_date > now
+
+
+@dataclass
+class SessionCacheMetrics:
+    hits: int = 0
+    misses: int = 0
+    #: Entries removed because the cache was full.
+    evictions: int = 0
+    #: Entries removed because of a logout, password change, or user edit.
+    invalidations: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "hit_rate": self.hit_rate,
+        }
+
+
+class SessionCache:
+    """
+    A bounded cache of session token to user, where the least recently used
+    entries are evicted first.
+
+    Each process has its own cache, so if a session is removed by another
+    process, it can still be used in this one for up to ``ttl`` seconds.
+
+    :param ttl:
+        How many seconds an entry is cached for.
+    :param max_size:
+        The maximum number of sessions to cache.
+
+    """
+
+    def __init__(self, ttl: float = 60.0, max_size: int = 1000) -> None:
+        if ttl <= 0:
+            raise ValueError("`ttl` must be greater than 0.")
+        if max_size < 1:
+            raise ValueError("`max_size` must be at least 1.")
+
+        self.ttl = ttl
+        self.max_size = max_size
+        self.metrics = SessionCacheMetrics()
+        self._sessions: OrderedDict[str, CachedSession] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def get(self, token: str) -> Optional[CachedSession]:
+        """
+        Returns the cached session, unless it has expired. In which case
+        ``None`` is returned, and the database should be checked instead, as
+        another process might have extended it.
+        """
+        session = self._sessions.get(token)
+
+        if (
+            session is None
+            or session.cached_until <= time.monotonic()
+            or not session.is_valid(now=datetime.now())
+        ):
+            self._sessions.pop(token, None)
+            self.metrics.misses += 1
+            return None
+
+        self._sessions.move_to_end(token)
+        self.metrics.hits += 1
+        return session
+
+    def set(
+        self,
+        token: str,
+        user: PiccoloBaseUser,
+        expiry_date: datetime,
+        max_expiry_date: datetime,
+    ) -> CachedSession:
+        session = CachedSession(
+            user=user,
+            expiry_date=expiry_date,
+            max_expiry_date=max_expiry_date,
+            cached_until=time.monotonic() + self.ttl,
+        )
+        self._sessions[token] = session
+        self._sessions.move_to_end(token)
+
+        while len(self._sessions) > self.max_size:
+            self._sessions.popitem(last=False)
+            self.metrics.evictions += 1
+
+        return session
+
+    def invalidate(self, token: str) -> None:
+        if self._sessions.pop(token, None) is not None:
+            self.metrics.invalidations += 1
+
+    def invalidate_user(self, user_id: Any) -> None:
+        """
+        Removes all of the sessions for the given user.
+        """
+        tokens = [
+            token
+            for token, session in self._sessions.items()
+            if session.user.id == user_id
+        ]
+        for token in tokens:
+            self.invalidate(token)
+
+    def clear(self) -> None:
+        self.metrics.invalidations += len(self._sessions)
+        self._sessions.clear()
+
+
+class CachedSessionsAuthBackend(SessionsAuthBackend):
+    """
+    The same as ``SessionsAuthBackend``, except sessions are cached using
+    ``session_cache``.
+
+    When ``increase_expiry`` is set, the new expiry date is stored in the
+    cache before it's written to the database, so concurrent requests using
+    the same session don't write it again - each session is written at most
+    once per ``increase_expiry`` interval.
+    """
+
+    def __init__(self, *args, session_cache: SessionCache, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.session_cache = session_cache
+
+    def _reject(self, message: str) -> tuple[AuthCredentials, BaseUser]:
+        if self.allow_unauthenticated:
+            return (AuthCredentials(scopes=[]), UnauthenticatedUser())
+        raise AuthenticationError(message)
+
+    async def _load_session(self, token: str) -> Optional[CachedSession]:
+        """
+        Fetches the session and user from the database, and caches them.
+
+        :raises AuthenticationError:
+            If the user doesn't exist anymore.
+
+        """
+        session_table = self.session_table
+        session = (
+            await session_table.objects()
+            .where(session_table.token == token)
+            .first()
+            .run()
+        )
+        now = datetime.now()
+        if session is None or not (
+            session.expiry_date > now and session.max_expiry_date > now
+        ):
+            return None
+
+        piccolo_user = (
+            await self.auth_table.objects()
+            .where(self.auth_table._meta.primary_key == session.user_id)
+            .first()
+            .run()
+        )
+        if piccolo_user is None:
+            raise AuthenticationError("That user doesn't exist anymore")
+
+        return self.session_cache.set(
+            token=token,
+            user=piccolo_user,
+            expiry_date=session.expiry_date,
+            max_expiry_date=session.max_expiry_date,
+        )
+
+    async def _increase_expiry(self, token: str, session: CachedSession):
+        now = datetime.now()
+        if (
+            self.increase_expiry is None
+            or session.expiry_date - now >= self.increase_expiry
+        ):
+            return
+
+        session.expiry_date = session.expiry_date + self.increase_expiry
+
+        session_table = self.session_table
+        await session_table.update(
+            {session_table.expiry_date: session.expiry_date}
+        ).where(session_table.token == token).run()
+
+    @check_excluded_paths
+    async def authenticate(
+        self, conn: HTTPConnection
+    ) -> Optional[tuple[AuthCredentials, BaseUser]]:
+        token = conn.cookies.get(self.cookie_name, None)
+        if not token:
+            return self._reject("No session cookie found.")
+
+        session = self.session_cache.get(token)
+
+        if session is None:
+            try:
+                session = await self._load_session(token)
+            except AuthenticationError as exception:
+                return self._reject(str(exception))
+
+            if session is None:
+                return self._reject("No matching session found.")
+
+        await self._increase_expiry(token=token, session=session)
+
+        piccolo_user = session.user
+
+        if self.admin_only and not piccolo_user.admin:
+            raise AuthenticationError("Admin users only")
+
+        if self.superuser_only and not piccolo_user.superuser:
+            raise AuthenticationError("Superusers only")
+
+        if self.active_only and not piccolo_user.active:
+            raise AuthenticationError("Active users only")
+
+        return (
+            AuthCredentials(scopes=["authenticated"]),
+            User(user=piccolo_user),
+        )
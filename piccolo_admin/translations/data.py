@@ -32,6 +32,7 @@ ENGLISH = Translation(
         "Ascending": "Ascending",
         "Back to home page": "Back to home page",
         "Back": "Back",
+        "Cancel": "Cancel",
         "Change Password": "Change Password",
         "Clear filters": "Clear filters",
         "Close": "Close",
@@ -75,6 +76,7 @@ ENGLISH = Translation(
         "Password": "Password",
         "result(s)": "result(s)",
         "rows": "rows",
+        "Running": "Running",
         "Save": "Save",
         "Seconds": "Seconds",
         "Select a column to update": "Select a column to update",
@@ -96,6 +98,7 @@ ENGLISH = Translation(
         "Use again": "Use again",
         "Username": "Username",
         "Version": "Version",
+        "Waiting to start": "Waiting to start",
         "Weeks": "Weeks",
         "Welcome to": "Welcome to",
         "with a matching": "with a matching",
@@ -113,6 +116,7 @@ WELSH = Translation(
         "Ascending": "Esgynnol",
         "Back to home page": "Yn ôl i'r dudalen gartref",
         "Back": "Ol",
+        "Cancel": "Canslo",
         "Change Password": "Newid cyfrinair",
         "Clear filters": "Clirio hidlwyr",
         "Close": "Cau",
@@ -156,6 +160,7 @@ WELSH = Translation(
         "Password": "Cyfrinair",
         "result(s)": "canlyniad(au)",
         "rows": "rhesi",
+        "Running": "Yn rhedeg",
         "Save": "Arbed",
         "Seconds": "Eiliadau",
         "Select a column to update": "Dewiswch golofn i'w diweddaru",
@@ -177,6 +182,7 @@ WELSH = Translation(
         "Use again": "Defnyddiwch eto",
         "Username": "Enw defnyddiwr",
         "Version": "Fersiwn",
+        "Waiting to start": "Yn aros i ddechrau",
         "Weeks": "Wythnosau",
         "Welcome to": "Croeso i",
         "with a matching": "gyda chyfateb",
@@ -194,6 +200,7 @@ CROATIAN = Translation(
         "Ascending": "Uzlazno",
         "Back to home page": "Vrati se na početnu stranicu",
         "Back": "Natrag",
+        "Cancel": "Odustani",
         "Change Password": "Promijeni lozinku",
         "Clear filters": "Obriši filtere",
         "Close": "Zatvori",
@@ -237,6 +244,7 @@ CROATIAN = Translation(
         "Password": "Zaporka",
         "result(s)": "rezultat(a)",
         "rows": "redaka",
+        "Running": "U tijeku",
         "Save": "Spremi",
         "Seconds": "Sekunde",
         "Select a column to update": "Odaberite stupac za ažuriranje",
@@ -258,6 +266,7 @@ CROATIAN = Translation(
         "Use again": "Koristi ponovno",
         "Username": "Korisničko ime",
         "Version": "Verzija",
+        "Waiting to start": "Čeka na početak",
         "Weeks": "Tjedni",
         "Welcome to": "Dobrodošli u",
         "with a matching": "s odgovarajućom kolumnom",
@@ -275,6 +284,7 @@ PORTUGUESE = Translation(
         "Ascending": "Ascendente",
         "Back to home page": "Voltar à página inicial",
         "Back": "Voltar atrás",
+        "Cancel": "Cancelar",
         "Change Password": "Mudar senha",
         "Clear filters": "Limpar Filtros",
         "Close": "Fechar",
@@ -318,6 +328,7 @@ PORTUGUESE = Translation(
         "Password": "Senha",
         "result(s)": "resultado(s)",
         "rows": "linhas",
+        "Running": "Em execução",
         "Save": "Guardar",
         "Seconds": "Segundos",
         "Select a column to update": "Selecione uma coluna para atualizar",
@@ -339,6 +350,7 @@ PORTUGUESE = Translation(
         "Use again": "Use novamente",
         "Username": "Nome de usuário",
         "Version": "Versão",
+        "Waiting to start": "Aguardando para iniciar",
         "Weeks": "Semanas",
         "Welcome to": "Bem-vindo ao",
         "with a matching": "com uma correspondência",
@@ -356,6 +368,7 @@ GERMAN = Translation(
         "Ascending": "Aufsteigend",
         "Back to home page": "Zurück zur Startseite",
         "Back": "Zurück",
+        "Cancel": "Abbrechen",
         "Change Password": "Passwort ändern",
         "Clear filters": "Filter löschen",
         "Close": "Schließen",
@@ -399,6 +412,7 @@ GERMAN = Translation(
         "Password": "Passwort",
         "result(s)": "Ergebnis(se)",
         "rows": "Zeilen",
+        "Running": "Läuft",
         "Save": "Speichern",
         "Seconds": "Sekunden",
         "Select a column to update": "Wählen Sie eine Spalte aus, um zu aktualisieren",
@@ -420,6 +434,7 @@ GERMAN = Translation(
         "Use again": "Wiederbenutzen",
         "Username": "Nutzername",
         "Version": "Version",
+        "Waiting to start": "Wartet auf Start",
         "Weeks": "Wochen",
         "Welcome to": "Willkommen zu",
         "with a matching": "mit einem Matching",
@@ -437,6 +452,7 @@ FRENCH = Translation(
         "Ascending": "Croissant",
         "Back to home page": "Retour à la page d'accueil",
         "Back": "Retour",
+        "Cancel": "Annuler",
         "Change Password": "Changer le mot de passe",
         "Clear filters": "Supprimer les filtres",
         "Close": "Fermer",
@@ -480,6 +496,7 @@ FRENCH = Translation(
         "Password": "Mot de passe",
         "result(s)": "résultat(s)",
         "rows": "lignes",
+        "Running": "En cours",
         "Save": "Sauvegarder",
         "Seconds": "Secondes",
         "Select a column to update": "Sélectionnez une colonne à mettre à jour",
@@ -501,6 +518,7 @@ FRENCH = Translation(
         "Use again": "Utiliser à nouveau",
         "Username": "Nom d'utilisateur",
         "Version": "Version",
+        "Waiting to start": "En attente de démarrage",
         "Weeks": "Semaines",
         "Welcome to": "Bienvenue à",
         "with a matching": "avec une correspondance",
@@ -518,6 +536,7 @@ SPANISH = Translation(
         "Ascending": "Ascendente",
         "Back to home page": "Volver a la página de inicio",
         "Back": "atrás",
+        "Cancel": "Cancelar",
         "Change Password": "Cambia la contraseña",
         "Clear filters": "Eliminar filtros",
         "Close": "Cerca",
@@ -561,6 +580,7 @@ SPANISH = Translation(
         "Password": "Clave",
         "result(s)": "resultado(s)",
         "rows": "hilera",
+        "Running": "En ejecución",
         "Save": "Ahorrar",
         "Seconds": "Segundos",
         "Select a column to update": "Seleccione una columna para actualizar",
@@ -582,6 +602,7 @@ SPANISH = Translation(
         "Use again": "Usar de nuevo",
         "Username": "Nombre de usuario",
         "Version": "Versión",
+        "Waiting to start": "Esperando para empezar",
         "Weeks": "Semanas",
         "Welcome to": "Bienvenido a",
         "with a matching": "con un juego",
@@ -599,6 +620,7 @@ FINNISH = Translation(
         "Ascending": "Nouseva",
         "Back to home page": "Takaisin pääsivulle",
         "Back": "Takaisin",
+        "Cancel": "Peruuta",
         "Change Password": "Vaihda salasana",
         "Clear filters": "Nollaa suodattimet",
         "Close": "Sulje",
@@ -642,6 +664,7 @@ FINNISH = Translation(
         "Password": "Salasana",
         "result(s)": "tulokset",
         "rows": "rivit",
+        "Running": "Käynnissä",
         "Save": "Tallenna",
         "Seconds": "Sekunnit",
         "Select a column to update": "Valitse päivitettävä pystyrivi",
@@ -663,6 +686,7 @@ FINNISH = Translation(
         "Use again": "Käytä uudelleen",
         "Username": "Käyttäjänimi",
         "Version": "Versio",
+        "Waiting to start": "Odottaa käynnistystä",
         "Weeks": "Viikot",
         "Welcome to": "Tervetuloa",
         "with a matching": "osumalla",
@@ -680,6 +704,7 @@ RUSSIAN = Translation(
         "Ascending": "По возрастанию",
         "Back to home page": "Вернуться на главную страницу",
         "Back": "Назад",
+        "Cancel": "Отмена",
         "Change Password": "Сменить пароль",
         "Clear filters": "Сбросить фильтры",
         "Close": "Закрыть",
@@ -723,6 +748,7 @@ RUSSIAN = Translation(
         "Password": "Пароль",
         "result(s)": "строк(и)",
         "rows": "строки",
+        "Running": "Выполняется",
         "Save": "Сохранить",
         "Seconds": "Секунды",
         "Select a column to update": "Выберите столбец для обновления",
@@ -744,6 +770,7 @@ RUSSIAN = Translation(
         "Use again": "Использовать снова",
         "Username": "Логин",
         "Version": "Версия",
+        "Waiting to start": "Ожидает запуска",
         "Weeks": "Недели",
         "Welcome to": "Добро пожаловать в",
         "with a matching": "c соответствующим",
@@ -761,6 +788,7 @@ UKRAINIAN = Translation(
         "Ascending": "За зростанням",
         "Back to home page": "Повернутися на головну сторінку",
         "Back": "Назад",
+        "Cancel": "Скасувати",
         "Change Password": "Змінити пароль",
         "Clear filters": "Очистити фільтри",
         "Close": "Закрити",
@@ -804,6 +832,7 @@ UKRAINIAN = Translation(
         "Password": "Пароль",
         "result(s)": "результат(ів)",
         "rows": "рядки",
+        "Running": "Виконується",
         "Save": "Зберегти",
         "Seconds": "Секунди",
         "Select a column to update": "Виберіть стовпчик для оновлення",
@@ -825,6 +854,7 @@ UKRAINIAN = Translation(
         "Use again": "Використати ще раз",
         "Username": "Ім'я користувача",
         "Version": "Версія",
+        "Waiting to start": "Очікує запуску",
         "Weeks": "Тижні",
         "Welcome to": "Ласкаво просимо до",
         "with a matching": "з пов'язаним",
@@ -842,6 +872,7 @@ SIMPLIFIED_CHINESE = Translation(
         "Ascending": "正序",
         "Back to home page": "返回主页",
         "Back": "返回",
+        "Cancel": "取消",
         "Change Password": "修改密码",
         "Clear filters": "清除过滤器",
         "Close": "关闭",
@@ -885,6 +916,7 @@ SIMPLIFIED_CHINESE = Translation(
         "Password": "密码",
         "result(s)": "结果",
         "rows": "行",
+        "Running": "运行中",
         "Save": "保存",
         "Seconds": "秒",
         "Select a column to update": "选择要更新的列",
@@ -906,6 +938,7 @@ SIMPLIFIED_CHINESE = Translation(
         "Use again": "再次使用",
         "Username": "用户名",
         "Version": "版本",
+        "Waiting to start": "等待开始",
         "Weeks": "周",
         "Welcome to": "欢迎来到",
         "with a matching": "匹配了",  # it should be 与...匹配
@@ -923,6 +956,7 @@ TRADITIONAL_CHINESE = Translation(
         "Ascending": "升冪排序",
         "Back to home page": "返回首頁",
         "Back": "返回",
+        "Cancel": "取消",
         "Change Password": "修改密碼",
         "Clear filters": "清除篩選器",
         "Close": "關閉",
@@ -966,6 +1000,7 @@ TRADITIONAL_CHINESE = Translation(
         "Password": "密碼",
         "result(s)": "結果",
         "rows": "行",
+        "Running": "執行中",
         "Save": "儲存",
         "Seconds": "秒",
         "Select a column to update": "選擇要更新的列",
@@ -987,6 +1022,7 @@ TRADITIONAL_CHINESE = Translation(
         "Use again": "再次使用",
         "Username": "使用者名稱",
         "Version": "版本",
+        "Waiting to start": "等待開始",
         "Weeks": "星期",
         "Welcome to": "歡迎來到",
         "with a matching": "相對應的",
@@ -1004,6 +1040,7 @@ TURKISH = Translation(
         "Ascending": "Artan sırada",
         "Back to home page": "Anasayfaya geri dön",
         "Back": "Geri dön",
+        "Cancel": "İptal",
         "Change Password": "Şifreyi değiştir",
         "Clear filters": "Filtreleri temizle",
         "Close": "Kapat",
@@ -1047,6 +1084,7 @@ TURKISH = Translation(
         "Password": "Şifre",
         "result(s)": "kayıt(lar)",
         "rows": "satır",
+        "Running": "Çalışıyor",
         "Save": "Kaydet",
         "Seconds": "Saniyeler",
         "Select a column to update": "Güncelleme için bir sütun seç",
@@ -1068,6 +1106,7 @@ TURKISH = Translation(
         "Use again": "Tekrar kullan",
         "Username": "Kullanıcı adı",
         "Version": "Versiyon",
+        "Waiting to start": "Başlamayı bekliyor",
         "Weeks": "Haftalar",
         "Welcome to": "Hoşgeldiniz",
         "with a matching": "ile eşleşen",
@@ -1085,6 +1124,7 @@ FARSI = Translation(
         "Ascending": "صعودی",
         "Back to home page": "بازگشت به صفحه اصلی",
         "Back": "بازگشت",
+        "Cancel": "لغو",
         "Change Password": "تغییر رمز عبور",
         "Clear filters": "پاک‌کردن فیلترها",
         "Close": "بستن",
@@ -1128,6 +1168,7 @@ FARSI = Translation(
         "Password": "رمز عبور",
         "result(s)": "(ها)نتیجه",
         "rows": "ردیف",
+        "Running": "در حال اجرا",
         "Save": "ذخیره",
         "Seconds": "ثانیه",
         "Select a column to update": "ستونی را برای بروزرسانی انتخاب کنید",
@@ -1149,6 +1190,7 @@ FARSI = Translation(
         "Use again": "استفاده مجدد",
         "Username": "نام کاربری",
         "Version": "نسخه",
+        "Waiting to start": "در انتظار شروع",
         "Weeks": "هفته",
         "Welcome to": "خوش آمدید به",
         "with a matching": "با تطبیق",
@@ -1166,6 +1208,7 @@ ITALIAN = Translation(
         "Ascending": "Crescente",
         "Back to home page": "Torna alla home",
         "Back": "Indietro",
+        "Cancel": "Annulla",
         "Change Password": "Cambia Password",
         "Clear filters": "Rimuovi filtri",
         "Close": "Chiudi",
@@ -1209,6 +1252,7 @@ ITALIAN = Translation(
         "Password": "Password",
         "result(s)": "risultato(i)",
         "rows": "righe",
+        "Running": "In esecuzione",
         "Save": "Salva",
         "Seconds": "Secondi",
         "Select a column to update": "Selezionare una colonna da aggiornare",
@@ -1230,6 +1274,7 @@ ITALIAN = Translation(
         "Use again": "Usa di nuovo",
         "Username": "Nome utente",
         "Version": "Versione",
+        "Waiting to start": "In attesa di avvio",
         "Weeks": "Settimane",
         "Welcome to": "Benvenuti in",
         "with a matching": "con una corrispondenza",
@@ -1247,6 +1292,7 @@ HUNGARIAN = Translation(
         "Ascending": "Növekvő",
         "Back to home page": "Vissza a főoldalra",
         "Back": "Vissza",
+        "Cancel": "Mégse",
         "Change Password": "Jelszó módosítása",
         "Clear filters": "Szűrők törlése",
         "Close": "Bezárás",
@@ -1290,6 +1336,7 @@ HUNGARIAN = Translation(
         "Password": "Jelszó",
         "result(s)": "találat",
         "rows": "sor",
+        "Running": "Fut",
         "Save": "Mentés",
         "Seconds": "Másodpercek",
         "Select a column to update": "Válasszon egy frissítendő oszlopot",
@@ -1311,6 +1358,7 @@ HUNGARIAN = Translation(
         "Use again": "Újra használ",
         "Username": "Felhasználónév",
         "Version": "Verzió",
+        "Waiting to start": "Indításra vár",
         "Weeks": "Hetek",
         "Welcome to": "Üdvözöljük itt:",
         "with a matching": "egyező értékkel",
@@ -1328,6 +1376,7 @@ SLOVAK = Translation(
         "Ascending": "Vzostupne",
         "Back to home page": "Späť na hlavnú stránku",
         "Back": "Späť",
+        "Cancel": "Zrušiť",
         "Change Password": "Zmeniť heslo",
         "Clear filters": "Vymazať filtre",
         "Close": "Zavrieť",
@@ -1371,6 +1420,7 @@ SLOVAK = Translation(
         "Password": "Heslo",
         "result(s)": "výsledok(y)",
         "rows": "riadky",
+        "Running": "Prebieha",
         "Save": "Uložiť",
         "Seconds": "Sekundy",
         "Select a column to update": "Vyberte stĺpec na aktualizáciu",
@@ -1392,6 +1442,7 @@ SLOVAK = Translation(
         "Use again": "Použiť znova",
         "Username": "Používateľské meno",
         "Version": "Verzia",
+        "Waiting to start": "Čaká na spustenie",
         "Weeks": "Týždne",
         "Welcome to": "Vitajte v",
         "with a matching": "so zhodou",
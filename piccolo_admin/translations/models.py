@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic import BaseModel, Field
 
 
@@ -9,6 +11,13 @@ class TranslationListItem(BaseModel):
 class TranslationListResponse(BaseModel):
     translations: list[TranslationListItem]
     default_language_code: str = Field(description="e.g. 'en'")
+    translations_version: Optional[str] = Field(
+        default=None,
+        description=(
+            "Changes whenever the translations change. Pass it as the `v` "
+            "query param when fetching a translation, so it can be cached."
+        ),
+    )
 
 
 class Translation(BaseModel):
@@ -1,6 +1,6 @@
 #!/bin/bash
 
-SOURCES="piccolo_admin tests e2e"
+SOURCES="piccolo_admin tests e2e benchmarks"
 
 isort $SOURCES
 black $SOURCES
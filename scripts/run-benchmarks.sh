@@ -0,0 +1,9 @@
+#!/bin/bash
+# To run all benchmarks: ./scripts/run-benchmarks.sh all
+# To save the results: ./scripts/run-benchmarks.sh all --output=results.json
+# To see all options: ./scripts/run-benchmarks.sh --help
+
+mkdir -p piccolo_admin/dist/assets
+touch piccolo_admin/dist/index.html
+
+python -m benchmarks $@
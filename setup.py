@@ -18,7 +18,7 @@ with open(os.path.join(DIRECTORY, "README.md")) as f:
     LONG_DESCRIPTION = f.read()
 
 
-EXTRAS = ["faker", "s3"]
+EXTRAS = ["brotli", "faker", "orjson", "s3"]
 
 
 def parse_requirement(req_path: str) -> list[str]:
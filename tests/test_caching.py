@@ -0,0 +1,15 @@
+from unittest import TestCase
+
+from piccolo_admin.caching import etag_matches
+
+
+class TestETagMatches(TestCase):
+    def test_etag_matches(self):
+        etag = '"abc"'
+        self.assertTrue(etag_matches('"abc"', etag))
+        self.assertTrue(etag_matches('W/"abc"', etag))
+        self.assertTrue(etag_matches('"xyz", "abc"', etag))
+        self.assertTrue(etag_matches("*", etag))
+        self.assertFalse(etag_matches('"xyz"', etag))
+        self.assertFalse(etag_matches("", etag))
+        self.assertFalse(etag_matches(None, etag))
@@ -0,0 +1,233 @@
+import gzip
+import os
+import tempfile
+from unittest import TestCase
+
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse, Response, StreamingResponse
+from starlette.routing import Mount, Route
+from starlette.testclient import TestClient
+
+from piccolo_admin.compression import (
+    CompressionMiddleware,
+    PrecompressedStaticFiles,
+)
+from piccolo_admin.endpoints import create_admin
+from piccolo_admin.example.tables import Movie
+
+BODY = "Hello world " * 200
+
+
+def large(request):
+    return PlainTextResponse(BODY, headers={"ETag": '"abc"'})
+
+
+def small(request):
+    return PlainTextResponse("Hello world")
+
+
+def image(request):
+    return Response(BODY.encode(), media_type="image/png")
+
+
+def encoded(request):
+    return Response(
+        gzip.compress(BODY.encode()),
+        media_type="text/plain",
+        headers={"Content-Encoding": "gzip"},
+    )
+
+
+def stream(request):
+    async def iterator():
+        for _ in range(10):
+            yield BODY
+
+    return StreamingResponse(iterator(), media_type="text/csv")
+
+
+def download(request):
+    async def iterator():
+        for _ in range(10):
+            yield BODY
+
+    return StreamingResponse(
+        iterator(),
+        media_type="text/csv",
+        headers={
+            "Content-Disposition": 'attachment; filename="data.csv"',
+            "Content-Length": str(len(BODY) * 10),
+        },
+    )
+
+
+APP = CompressionMiddleware(
+    Starlette(
+        routes=[
+            Route("/large/", large),
+            Route("/small/", small),
+            Route("/image/", image),
+            Route("/encoded/", encoded),
+            Route("/stream/", stream),
+            Route("/download/", download),
+        ]
+    ),
+    encodings=["gzip"],
+)
+
+
+class TestCompressionMiddleware(TestCase):
+    def setUp(self):
+        self.client = TestClient(APP)
+
+    def get(self, path: str, accept_encoding: str = "gzip"):
+        return self.client.get(
+            path, headers={"Accept-Encoding": accept_encoding}
+        )
+
+    def test_compressed(self):
+        response = self.get("/large/")
+        self.assertEqual(response.headers["content-encoding"], "gzip")
+        self.assertEqual(response.headers["vary"], "Accept-Encoding")
+        self.assertLess(int(response.headers["content-length"]), len(BODY))
+        self.assertEqual(response.text, BODY)
+        self.assertEqual(response.headers["etag"], '"abc"')
+
+    def test_not_accepted(self):
+        for accept_encoding in ("identity", "br", "gzip;q=0"):
+            response = self.get("/large/", accept_encoding=accept_encoding)
+            self.assertNotIn("content-encoding", response.headers)
+            self.assertEqual(response.text, BODY)
+
+    def test_skipped(self):
+        """
+        Small responses, and those which are already compressed, are left
+        alone.
+        """
+        for path in ("/small/", "/image/"):
+            response = self.get(path)
+            self.assertNotIn("content-encoding", response.headers, path)
+
+        response = self.get("/encoded/")
+        self.assertEqual(response.headers["content-encoding"], "gzip")
+        self.assertEqual(response.text, BODY)
+
+    def test_streaming(self):
+        response = self.get("/stream/")
+        self.assertEqual(response.headers["content-encoding"], "gzip")
+        self.assertNotIn("content-length", response.headers)
+        self.assertEqual(response.text, BODY * 10)
+
+    def test_download(self):
+        """
+        Downloads keep their ``Content-Length``, so the browser can show the
+        progress.
+        """
+        response = self.get("/download/")
+        self.assertNotIn("content-encoding", response.headers)
+        self.assertEqual(
+            int(response.headers["content-length"]), len(BODY) * 10
+        )
+
+    def test_invalid_encoding(self):
+        with self.assertRaises(ValueError):
+            CompressionMiddleware(APP, encodings=["foo"])  # type: ignore
+
+
+class TestPrecompressedStaticFiles(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        path = os.path.join(self.directory.name, "index.js")
+        with open(path, "w") as f:
+            f.write(BODY)
+        with open(f"{path}.gz", "wb") as f:
+            f.write(gzip.compress(BODY.encode(), compresslevel=9))
+
+        self.client = TestClient(
+            Starlette(
+                routes=[
+                    Mount(
+                        "/assets",
+                        PrecompressedStaticFiles(
+                            directory=self.directory.name
+                        ),
+                    )
+                ]
+            )
+        )
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_precompressed(self):
+        response = self.client.get(
+            "/assets/index.js", headers={"Accept-Encoding": "br, gzip"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["content-encoding"], "gzip")
+        self.assertIn("javascript", response.headers["content-type"])
+        self.assertEqual(
+            response.headers["cache-control"],
+            "public, max-age=31536000, immutable",
+        )
+        self.assertEqual(response.headers["vary"], "Accept-Encoding")
+        self.assertEqual(response.text, BODY)
+
+        response = self.client.get(
+            "/assets/index.js",
+            headers={
+                "Accept-Encoding": "gzip",
+                "If-None-Match": response.headers["etag"],
+            },
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_uncompressed(self):
+        response = self.client.get(
+            "/assets/index.js", headers={"Accept-Encoding": "identity"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("content-encoding", response.headers)
+        self.assertEqual(
+            response.headers["cache-control"],
+            "public, max-age=31536000, immutable",
+        )
+        self.assertEqual(response.text, BODY)
+
+    def test_missing(self):
+        response = self.client.get(
+            "/assets/missing.js", headers={"Accept-Encoding": "gzip"}
+        )
+        self.assertEqual(response.status_code, 404)
+        self.assertNotIn("cache-control", response.headers)
+
+
+class TestAdminCompression(TestCase):
+    def test_openapi(self):
+        """
+        Make sure the public and private apps compress their responses.
+        """
+        client = TestClient(
+            create_admin(tables=[Movie], compression=["br", "gzip"])
+        )
+        response = client.get(
+            "/public/openapi.json", headers={"Accept-Encoding": "gzip"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["content-encoding"], "gzip")
+        self.assertIn("paths", response.json())
+
+    def test_default(self):
+        """
+        Compression is disabled by default.
+        """
+        client = TestClient(create_admin(tables=[Movie]))
+        response = client.get(
+            "/public/openapi.json", headers={"Accept-Encoding": "gzip"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("content-encoding", response.headers)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            create_admin(tables=[Movie], compression=["foo"])  # type: ignore
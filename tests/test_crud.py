@@ -0,0 +1,1247 @@
+import asyncio
+import csv
+import datetime
+import io
+import json
+import time
+from unittest.mock import MagicMock, patch
+
+from piccolo.apps.user.tables import BaseUser
+from piccolo.columns.column_types import ForeignKey, Varchar
+from piccolo.columns.readable import Readable
+from piccolo.engine.postgres import PostgresEngine
+from piccolo.table import Table
+from piccolo.testing.test_case import TableTest
+from piccolo_api.crud.endpoints import OrderBy
+from piccolo_api.crud.hooks import Hook, HookType
+from piccolo_api.session_auth.tables import SessionsBase
+from starlette.testclient import TestClient
+
+from piccolo_admin.crud import AdminCRUD
+from piccolo_admin.endpoints import TableConfig, create_admin
+from piccolo_admin.example.tables import Director, Movie, Studio, Ticket
+
+
+class AdminCRUDTest(TableTest):
+    """
+    Creates a logged in client for an admin containing the ``Movie`` table.
+    """
+
+    credentials = {"username": "Bob", "password": "bob123"}
+
+    tables = [BaseUser, SessionsBase, Director, Studio, Movie]
+
+    def setUp(self):
+        super().setUp()
+        BaseUser.create_user_sync(
+            **self.credentials, active=True, admin=True, superuser=True
+        )
+
+        Director.insert(
+            Director(name="George Lucas"),
+            Director(name="Ridley Scott"),
+        ).run_sync()
+        george_lucas, ridley_scott = (
+            Director.select(Director.id)
+            .order_by(Director.id)
+            .output(as_list=True)
+            .run_sync()
+        )
+        Movie.insert(
+            Movie(name="Star Wars", director=george_lucas, rating=8.6),
+            Movie(name="Alien", director=ridley_scott, rating=8.4),
+            Movie(name="Blade Runner", director=ridley_scott, rating=8.1),
+        ).run_sync()
+
+        self.client = TestClient(self.create_app())
+        self.csrftoken = self.login(self.client)
+
+    def login(self, client: TestClient) -> str:
+        """
+        :returns:
+            The CSRF token.
+        """
+        # To get a CSRF cookie
+        response = client.get("/")
+        csrftoken = response.cookies["csrftoken"]
+
+        # Login
+        payload = dict(csrftoken=csrftoken, **self.credentials)
+        client.post(
+            "/public/login/",
+            json=payload,
+            headers={"X-CSRFToken": csrftoken},
+        )
+        return csrftoken
+
+    def create_app(self):
+        return create_admin(tables=[Movie])
+
+
+class TestExport(AdminCRUDTest):
+    tables = AdminCRUDTest.tables + [Ticket]
+
+    def create_app(self):
+        return create_admin(tables=[Movie, Ticket])
+
+    def test_csv(self):
+        """
+        Make sure the rows are exported as CSV, respecting the filters,
+        ordering, and visible fields.
+        """
+        response = self.client.get(
+            "/api/tables/movie/export/",
+            params={
+                "director": 2,
+                "__order": "name",
+                "__visible_fields": "name,director",
+                "__readable": "true",
+            },
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.headers["content-disposition"],
+            'attachment; filename="movie.csv"',
+        )
+
+        rows = list(csv.reader(io.StringIO(response.text)))
+        self.assertListEqual(
+            rows,
+            [
+                ["name", "director", "director_readable"],
+                ["Alien", "2", "Ridley Scott"],
+                ["Blade Runner", "2", "Ridley Scott"],
+            ],
+        )
+
+    def test_csv_format(self):
+        """
+        Make sure the cells are formatted the same as the list endpoint,
+        which the UI used to build the CSV from.
+        """
+        Ticket.insert(
+            Ticket(
+                booked_by="Bob",
+                movie=1,
+                start_date=datetime.date(2020, 1, 1),
+                start_time=datetime.time(18, 30),
+                booked_on=datetime.datetime(
+                    2019, 12, 1, 9, 15, tzinfo=datetime.timezone.utc
+                ),
+                vip=True,
+            )
+        ).run_sync()
+
+        response = self.client.get("/api/tables/ticket/export/")
+        self.assertEqual(response.status_code, 200)
+        header, row = list(csv.reader(io.StringIO(response.text)))
+        cells = dict(zip(header, row))
+
+        # Previously it was written as ``2019-12-01 09:15:00+00:00``.
+        self.assertEqual(cells["booked_on"], "2019-12-01T09:15:00Z")
+
+        response = self.client.get("/api/tables/ticket/")
+        self.assertEqual(response.status_code, 200)
+        self.assertDictEqual(
+            cells,
+            {
+                key: value if isinstance(value, str) else json.dumps(value)
+                for key, value in response.json()["rows"][0].items()
+            },
+        )
+
+    def test_csv_delimiter(self):
+        response = self.client.get(
+            "/api/tables/movie/export/",
+            params={
+                "__visible_fields": "name,rating",
+                "__order": "-rating",
+                "__delimiter": ";",
+            },
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.text.splitlines(),
+            [
+                "name;rating",
+                "Star Wars;8.6",
+                "Alien;8.4",
+                "Blade Runner;8.1",
+            ],
+        )
+
+    def test_jsonl(self):
+        response = self.client.get(
+            "/api/tables/movie/export/",
+            params={
+                "__format": "jsonl",
+                "__visible_fields": "id,name",
+                "__order": "id",
+            },
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.headers["content-disposition"],
+            'attachment; filename="movie.jsonl"',
+        )
+        self.assertListEqual(
+            [json.loads(i) for i in response.text.splitlines()],
+            [
+                {"id": 1, "name": "Star Wars"},
+                {"id": 2, "name": "Alien"},
+                {"id": 3, "name": "Blade Runner"},
+            ],
+        )
+
+    def test_batches(self):
+        """
+        Make sure all rows are returned when they span several batches.
+        """
+        with patch.object(AdminCRUD, "export_batch_size", 2):
+            response = self.client.get(
+                "/api/tables/movie/export/",
+                params={"__visible_fields": "name"},
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.text.splitlines()), 4)
+
+    def test_errors(self):
+        for params in (
+            {"__format": "xml"},
+            {"__delimiter": "|"},
+            {"__order": "foo"},
+            {"foo": "bar"},
+        ):
+            response = self.client.get(
+                "/api/tables/movie/export/", params=params
+            )
+            self.assertEqual(response.status_code, 400)
+
+
+def reject_star_wars(row_id, **kwargs):
+    if (
+        Movie.exists()
+        .where(Movie.id == row_id, Movie.name == "Star Wars")
+        .run_sync()
+    ):
+        raise ValueError("Star Wars can't be modified.")
+
+
+def patch_hook(row_id, values, **kwargs):
+    reject_star_wars(row_id)
+    return values
+
+
+def delete_hook(row_id, **kwargs):
+    reject_star_wars(row_id)
+
+
+class TestBulkUpdate(AdminCRUDTest):
+    def test_row_ids(self):
+        response = self.client.patch(
+            "/api/tables/movie/bulk/",
+            json={"row_ids": [1, 2, 99, "abc"], "data": {"rating": 10}},
+            headers={"X-CSRFToken": self.csrftoken},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertDictEqual(
+            response.json(),
+            {
+                "succeeded": [1, 2],
+                "failed": [
+                    {"row_id": "abc", "error": "The ID is invalid"},
+                    {"row_id": 99, "error": "The resource doesn't exist"},
+                ],
+            },
+        )
+        self.assertListEqual(
+            Movie.select(Movie.rating)
+            .order_by(Movie.id)
+            .output(as_list=True)
+            .run_sync(),
+            [10, 10, 8.1],
+        )
+
+    def test_filters(self):
+        response = self.client.patch(
+            "/api/tables/movie/bulk/",
+            json={"filters": {"director": 2}, "data": {"rating": 5}},
+            headers={"X-CSRFToken": self.csrftoken},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertCountEqual(response.json()["succeeded"], [2, 3])
+        self.assertListEqual(
+            Movie.select(Movie.rating)
+            .order_by(Movie.id)
+            .output(as_list=True)
+            .run_sync(),
+            [8.6, 5, 5],
+        )
+
+    def test_batches(self):
+        """
+        Make sure the primary keys are sent in batches, so we don't exceed
+        the limit on query parameters.
+        """
+        with patch.object(AdminCRUD, "bulk_batch_size", 2):
+            response = self.client.patch(
+                "/api/tables/movie/bulk/",
+                json={"row_ids": [1, 2, 3], "data": {"rating": 10}},
+                headers={"X-CSRFToken": self.csrftoken},
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertListEqual(response.json()["succeeded"], [1, 2, 3])
+        self.assertListEqual(
+            Movie.select(Movie.rating).output(as_list=True).run_sync(),
+            [10, 10, 10],
+        )
+
+    def test_errors(self):
+        for payload in (
+            {"data": {"rating": 5}},
+            {"row_ids": [1], "filters": {"director": 2}, "data": {}},
+            {"filters": {}, "data": {"rating": 5}},
+            {"filters": {"foo": 1}, "data": {"rating": 5}},
+            {"filters": {"__order": "id"}, "data": {"rating": 5}},
+            {"row_ids": [1], "data": {"foo": 5}},
+            {"row_ids": [1], "data": {"rating": "abc"}},
+            {"row_ids": [1]},
+        ):
+            response = self.client.patch(
+                "/api/tables/movie/bulk/",
+                json=payload,
+                headers={"X-CSRFToken": self.csrftoken},
+            )
+            self.assertEqual(response.status_code, 400)
+
+
+class TestBulkUpdateHooks(AdminCRUDTest):
+    def create_app(self):
+        return create_admin(
+            tables=[
+                TableConfig(
+                    Movie,
+                    hooks=[
+                        Hook(hook_type=HookType.pre_patch, callable=patch_hook)
+                    ],
+                )
+            ]
+        )
+
+    def test_hooks(self):
+        """
+        Make sure rows rejected by a hook are reported, and the others are
+        still updated.
+        """
+        response = self.client.patch(
+            "/api/tables/movie/bulk/",
+            json={"row_ids": [1, 2], "data": {"rating": 10}},
+            headers={"X-CSRFToken": self.csrftoken},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertDictEqual(
+            response.json(),
+            {
+                "succeeded": [2],
+                "failed": [
+                    {"row_id": 1, "error": "Star Wars can't be modified."}
+                ],
+            },
+        )
+        self.assertListEqual(
+            Movie.select(Movie.rating)
+            .order_by(Movie.id)
+            .output(as_list=True)
+            .run_sync(),
+            [8.6, 10, 8.1],
+        )
+
+    def test_filters(self):
+        """
+        The hooks still run for each row when using filters.
+        """
+        with patch.object(AdminCRUD, "bulk_batch_size", 1):
+            response = self.client.patch(
+                "/api/tables/movie/bulk/",
+                json={
+                    "filters": {"rating__operator": "gt", "rating": 8},
+                    "data": {"rating": 10},
+                },
+                headers={"X-CSRFToken": self.csrftoken},
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertCountEqual(response.json()["succeeded"], [2, 3])
+        self.assertEqual(len(response.json()["failed"]), 1)
+        self.assertListEqual(
+            Movie.select(Movie.rating)
+            .order_by(Movie.id)
+            .output(as_list=True)
+            .run_sync(),
+            [8.6, 10, 10],
+        )
+
+
+class TestBulkDelete(AdminCRUDTest):
+    def test_row_ids(self):
+        response = self.client.request(
+            "DELETE",
+            "/api/tables/movie/bulk/",
+            json={"row_ids": [1, 3, 99]},
+            headers={"X-CSRFToken": self.csrftoken},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertDictEqual(
+            response.json(),
+            {
+                "succeeded": [1, 3],
+                "failed": [
+                    {"row_id": 99, "error": "The resource doesn't exist"}
+                ],
+            },
+        )
+        self.assertListEqual(
+            Movie.select(Movie.name).output(as_list=True).run_sync(),
+            ["Alien"],
+        )
+
+    def test_filters(self):
+        response = self.client.request(
+            "DELETE",
+            "/api/tables/movie/bulk/",
+            json={"filters": {"name": "Alien", "name__match": "exact"}},
+            headers={"X-CSRFToken": self.csrftoken},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertListEqual(response.json()["succeeded"], [2])
+        self.assertEqual(Movie.count().run_sync(), 2)
+
+    def test_read_only(self):
+        client = TestClient(create_admin(tables=[Movie], read_only=True))
+        csrftoken = self.login(client)
+        response = client.request(
+            "DELETE",
+            "/api/tables/movie/bulk/",
+            json={"row_ids": [1]},
+            headers={"X-CSRFToken": csrftoken},
+        )
+        self.assertEqual(response.status_code, 405)
+        self.assertEqual(Movie.count().run_sync(), 3)
+
+
+class TestBulkDeleteHooks(AdminCRUDTest):
+    def create_app(self):
+        return create_admin(
+            tables=[
+                TableConfig(
+                    Movie,
+                    hooks=[
+                        Hook(
+                            hook_type=HookType.pre_delete,
+                            callable=delete_hook,
+                        )
+                    ],
+                )
+            ]
+        )
+
+    def test_hooks(self):
+        response = self.client.request(
+            "DELETE",
+            "/api/tables/movie/bulk/",
+            json={"row_ids": [1, 2]},
+            headers={"X-CSRFToken": self.csrftoken},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertDictEqual(
+            response.json(),
+            {
+                "succeeded": [2],
+                "failed": [
+                    {"row_id": 1, "error": "Star Wars can't be modified."}
+                ],
+            },
+        )
+        self.assertListEqual(
+            Movie.select(Movie.name)
+            .order_by(Movie.id)
+            .output(as_list=True)
+            .run_sync(),
+            ["Star Wars", "Blade Runner"],
+        )
+
+    def test_filters(self):
+        """
+        The hooks still run for each row when using filters.
+        """
+        with patch.object(AdminCRUD, "bulk_batch_size", 1):
+            response = self.client.request(
+                "DELETE",
+                "/api/tables/movie/bulk/",
+                json={"filters": {"rating__operator": "gt", "rating": 8}},
+                headers={"X-CSRFToken": self.csrftoken},
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertCountEqual(response.json()["succeeded"], [2, 3])
+        self.assertListEqual(
+            Movie.select(Movie.name).output(as_list=True).run_sync(),
+            ["Star Wars"],
+        )
+
+
+class TestKeysetPagination(AdminCRUDTest):
+    def create_app(self):
+        return create_admin(
+            tables=[
+                TableConfig(
+                    Movie,
+                    pagination="keyset",
+                    order_by=[OrderBy(Movie.rating, ascending=False)],
+                )
+            ]
+        )
+
+    def get_page(self, **params) -> dict:
+        response = self.client.get(
+            "/api/tables/movie/",
+            params={"__page_size": 1, "__visible_fields": "name", **params},
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_cursors(self):
+        """
+        Make sure we can page forwards and backwards using the cursors.
+        """
+        page_1 = self.get_page()
+        self.assertListEqual(page_1["rows"], [{"name": "Star Wars"}])
+        self.assertIsNone(page_1["previous_cursor"])
+
+        page_2 = self.get_page(__cursor=page_1["next_cursor"])
+        self.assertListEqual(page_2["rows"], [{"name": "Alien"}])
+
+        page_3 = self.get_page(__cursor=page_2["next_cursor"])
+        self.assertListEqual(page_3["rows"], [{"name": "Blade Runner"}])
+        self.assertIsNone(page_3["next_cursor"])
+
+        page_2 = self.get_page(__cursor=page_3["previous_cursor"])
+        self.assertListEqual(page_2["rows"], [{"name": "Alien"}])
+        self.assertIsNotNone(page_2["next_cursor"])
+
+        page_1 = self.get_page(__cursor=page_2["previous_cursor"])
+        self.assertListEqual(page_1["rows"], [{"name": "Star Wars"}])
+        self.assertIsNone(page_1["previous_cursor"])
+
+    def test_page(self):
+        """
+        Jumping to a page still works, and returns cursors.
+        """
+        page_2 = self.get_page(__page=2)
+        self.assertListEqual(page_2["rows"], [{"name": "Alien"}])
+        self.assertIsNotNone(page_2["previous_cursor"])
+        self.assertIsNotNone(page_2["next_cursor"])
+
+    def test_invalid_cursor(self):
+        response = self.client.get(
+            "/api/tables/movie/", params={"__cursor": "abc"}
+        )
+        self.assertEqual(response.status_code, 400)
+
+        # A cursor for a different ordering
+        cursor = self.get_page()["next_cursor"]
+        response = self.client.get(
+            "/api/tables/movie/",
+            params={"__cursor": cursor, "__order": "name"},
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_nullable_fallback(self):
+        """
+        Nullable columns can't be used for keyset pagination, so we fall back
+        to offset pagination.
+        """
+        response = self.get_page(__order="release_date")
+        self.assertNotIn("next_cursor", response)
+        self.assertEqual(len(response["rows"]), 1)
+
+    def test_invalid_config(self):
+        with self.assertRaises(ValueError):
+            TableConfig(Movie, pagination="foo")  # type: ignore
+
+
+class TestCountStrategy(AdminCRUDTest):
+    def get_client(self, **kwargs) -> TestClient:
+        client = TestClient(
+            create_admin(tables=[TableConfig(Movie, **kwargs)])
+        )
+        self.login(client)
+        return client
+
+    def test_exact(self):
+        response = self.client.get("/api/tables/movie/count/")
+        self.assertEqual(response.status_code, 200)
+        self.assertDictEqual(
+            response.json(),
+            {"count": 3, "page_size": 15, "estimated": False},
+        )
+
+    def test_none(self):
+        client = self.get_client(count_strategy="none")
+        response = client.get("/api/tables/movie/count/")
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(response.json()["count"])
+
+        response = client.get("/api/tables/movie/schema/")
+        self.assertEqual(response.json()["extra"]["count_strategy"], "none")
+
+    def test_estimate(self):
+        """
+        There's no estimate available for SQLite, so it falls back to an
+        exact count.
+        """
+        client = self.get_client(count_strategy="estimate")
+        response = client.get("/api/tables/movie/count/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["count"], 3)
+        self.assertFalse(response.json()["estimated"])
+
+    def test_cached(self):
+        client = self.get_client(count_strategy="cached", count_cache_ttl=60)
+        response = client.get("/api/tables/movie/count/")
+        self.assertEqual(response.json()["count"], 3)
+
+        Movie.delete().where(Movie.name == "Alien").run_sync()
+
+        # The cached count is returned.
+        response = client.get("/api/tables/movie/count/")
+        self.assertEqual(response.json()["count"], 3)
+        self.assertTrue(response.json()["estimated"])
+
+        # Each set of filters is cached separately.
+        response = client.get(
+            "/api/tables/movie/count/", params={"director": 2}
+        )
+        self.assertEqual(response.json()["count"], 1)
+
+        # Once the TTL has passed, the count is refreshed.
+        with patch(
+            "piccolo_admin.crud.time.monotonic",
+            return_value=time.monotonic() + 61,
+        ):
+            response = client.get("/api/tables/movie/count/")
+        self.assertEqual(response.json()["count"], 2)
+
+    def test_cached_operators(self):
+        """
+        Make sure filters which only differ by the operator or match type
+        are cached separately.
+        """
+        client = self.get_client(count_strategy="cached")
+
+        for params, count in (
+            ({"rating": 8.4}, 1),
+            ({"rating": 8.4, "rating__operator": "gte"}, 2),
+            ({"name": "a"}, 3),
+            ({"name": "a", "name__match": "exact"}, 0),
+        ):
+            response = client.get("/api/tables/movie/count/", params=params)
+            self.assertEqual(response.json()["count"], count)
+
+    def test_invalid_filters(self):
+        client = self.get_client(count_strategy="cached")
+        response = client.get("/api/tables/movie/count/", params={"foo": 1})
+        self.assertEqual(response.status_code, 400)
+
+    def test_invalid_config(self):
+        with self.assertRaises(ValueError):
+            TableConfig(Movie, count_strategy="foo")  # type: ignore
+
+
+class TestListWithCount(AdminCRUDTest):
+    def test_count(self):
+        """
+        Make sure the rows and count are returned together, respecting the
+        filters and pagination.
+        """
+        response = self.client.get(
+            "/api/tables/movie/",
+            params={
+                "__count": "true",
+                "director": 2,
+                "__order": "name",
+                "__page_size": 1,
+                "__page": 2,
+                "__visible_fields": "name",
+            },
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertDictEqual(
+            response.json(),
+            {
+                "rows": [{"name": "Blade Runner"}],
+                "count": 2,
+                "page_size": 15,
+                "estimated": False,
+            },
+        )
+
+    def test_without_count(self):
+        for params in ({}, {"__count": "false"}):
+            response = self.client.get("/api/tables/movie/", params=params)
+            self.assertEqual(response.status_code, 200)
+            self.assertListEqual(list(response.json().keys()), ["rows"])
+
+    def test_keyset(self):
+        client = TestClient(
+            create_admin(tables=[TableConfig(Movie, pagination="keyset")])
+        )
+        self.login(client)
+
+        response = client.get(
+            "/api/tables/movie/",
+            params={"__count": "true", "__page_size": 2},
+        )
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(len(data["rows"]), 2)
+        self.assertEqual(data["count"], 3)
+        self.assertIsNotNone(data["next_cursor"])
+
+        # The cursor doesn't affect the count.
+        response = client.get(
+            "/api/tables/movie/",
+            params={
+                "__count": "true",
+                "__page_size": 2,
+                "__cursor": data["next_cursor"],
+            },
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["rows"]), 1)
+        self.assertEqual(response.json()["count"], 3)
+
+    def test_errors(self):
+        for params in (
+            {"__count": "foo"},
+            {"__count": "true", "foo": "bar"},
+            {"__count": "true", "rating__operator": "foo"},
+        ):
+            response = self.client.get("/api/tables/movie/", params=params)
+            self.assertEqual(response.status_code, 400, params)
+
+
+class TestListing(AdminCRUDTest):
+    def create_app(self):
+        return create_admin(
+            tables=[
+                TableConfig(
+                    Movie,
+                    visible_columns=[Movie.name, Movie.director],
+                    link_column=Movie.name,
+                ),
+                TableConfig(
+                    Director,
+                    visible_columns=[Director.name],
+                    pagination="keyset",
+                ),
+            ]
+        )
+
+    def test_listing(self):
+        """
+        Make sure only the visible columns, the primary key, and the link
+        column are selected.
+        """
+        response = self.client.get(
+            "/api/tables/movie/",
+            params={
+                "__listing": "true",
+                "__readable": "true",
+                "__order": "name",
+                "__count": "true",
+            },
+        )
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data["count"], 3)
+        self.assertDictEqual(
+            data["rows"][0],
+            {
+                "name": "Alien",
+                "director": 2,
+                "director_readable": "Ridley Scott",
+                "id": 2,
+            },
+        )
+
+    def test_keyset(self):
+        response = self.client.get(
+            "/api/tables/director/",
+            params={"__listing": "true", "__page_size": 1},
+        )
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertListEqual(data["rows"], [{"name": "George Lucas", "id": 1}])
+        self.assertIsNotNone(data["next_cursor"])
+
+    def test_visible_fields(self):
+        """
+        ``__visible_fields`` takes precedence.
+        """
+        response = self.client.get(
+            "/api/tables/movie/",
+            params={"__listing": "true", "__visible_fields": "rating"},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertListEqual(
+            list(response.json()["rows"][0].keys()), ["rating"]
+        )
+
+    def test_without_listing(self):
+        for params in ({}, {"__listing": "false"}):
+            response = self.client.get("/api/tables/movie/", params=params)
+            self.assertEqual(response.status_code, 200)
+            self.assertIn("description", response.json()["rows"][0])
+
+    def test_error(self):
+        response = self.client.get(
+            "/api/tables/movie/", params={"__listing": "foo"}
+        )
+        self.assertEqual(response.status_code, 400)
+
+
+class TestPreview(AdminCRUDTest):
+    def setUp(self):
+        super().setUp()
+        Movie.update({Movie.description: "A long time ago"}).where(
+            Movie.name == "Star Wars"
+        ).run_sync()
+
+    def create_app(self):
+        return create_admin(
+            tables=[
+                TableConfig(
+                    Movie,
+                    visible_columns=[Movie.name, Movie.description],
+                    preview_length=6,
+                ),
+                TableConfig(
+                    Director,
+                    visible_columns=[Director.name],
+                    pagination="keyset",
+                    preview_length={Director.name: 6},
+                ),
+            ]
+        )
+
+    def test_offset(self):
+        """
+        Make sure long values are truncated in the listing.
+        """
+        response = self.client.get(
+            "/api/tables/movie/",
+            params={"__listing": "true", "__order": "name"},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertListEqual(
+            response.json()["rows"],
+            [
+                {
+                    "name": "Alien",
+                    "id": 2,
+                    "description": "",
+                    "description_truncated": False,
+                },
+                {
+                    "name": "Blade Runner",
+                    "id": 3,
+                    "description": "",
+                    "description_truncated": False,
+                },
+                {
+                    "name": "Star Wars",
+                    "id": 1,
+                    "description": "A long",
+                    "description_truncated": True,
+                },
+            ],
+        )
+
+    def test_keyset(self):
+        response = self.client.get(
+            "/api/tables/director/",
+            params={"__listing": "true", "__page_size": 1, "__count": "true"},
+        )
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertListEqual(
+            data["rows"],
+            [{"id": 1, "name": "George", "name_truncated": True}],
+        )
+        self.assertEqual(data["count"], 2)
+
+        response = self.client.get(
+            "/api/tables/director/",
+            params={"__listing": "true", "__cursor": data["next_cursor"]},
+        )
+        self.assertListEqual(
+            response.json()["rows"],
+            [{"id": 2, "name": "Ridley", "name_truncated": True}],
+        )
+
+    def test_only_preview_columns(self):
+        response = self.client.get(
+            "/api/tables/movie/",
+            params={
+                "__listing": "true",
+                "__visible_fields": "description",
+                "name": "Star Wars",
+            },
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertListEqual(
+            response.json()["rows"],
+            [{"description": "A long", "description_truncated": True}],
+        )
+
+    def test_without_listing(self):
+        """
+        Make sure the full values are returned otherwise, for example on the
+        edit page.
+        """
+        response = self.client.get(
+            "/api/tables/movie/", params={"name": "Star Wars"}
+        )
+        self.assertEqual(
+            response.json()["rows"][0]["description"], "A long time ago"
+        )
+
+        response = self.client.get("/api/tables/movie/1/")
+        self.assertEqual(response.json()["description"], "A long time ago")
+
+
+class TestJSONBackend(AdminCRUDTest):
+    def create_app(self, json_backend="orjson"):
+        return create_admin(
+            tables=[
+                TableConfig(Movie, preview_length={Movie.name: 4}),
+                TableConfig(Director, pagination="keyset"),
+                BaseUser,
+            ],
+            json_backend=json_backend,
+        )
+
+    def test_same_output(self):
+        """
+        Make sure the output is identical to the default JSON backend.
+        """
+        json_client = TestClient(self.create_app(json_backend="json"))
+        self.login(json_client)
+
+        for path, params in (
+            ("/api/tables/movie/", {}),
+            ("/api/tables/movie/", {"__readable": "true", "__count": "true"}),
+            ("/api/tables/movie/", {"__listing": "true", "__order": "name"}),
+            ("/api/tables/movie/", {"__visible_fields": "name,rating"}),
+            ("/api/tables/movie/", {"__page_size": 1, "__page": 2}),
+            ("/api/tables/director/", {"__page_size": 1}),
+            ("/api/tables/director/", {"__order": "-name"}),
+            ("/api/tables/director/", {"__visible_fields": "name"}),
+            ("/api/tables/piccolo_user/", {}),
+        ):
+            response = self.client.get(path, params=params)
+            self.assertEqual(response.status_code, 200, (path, params))
+            self.assertEqual(
+                response.json(),
+                json_client.get(path, params=params).json(),
+                (path, params),
+            )
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            create_admin(tables=[Movie], json_backend="foo")  # type: ignore
+
+
+class TestSchema(AdminCRUDTest):
+    def test_etag(self):
+        """
+        Make sure the schema is returned with an ETag, and a 304 response is
+        returned if the client already has it.
+        """
+        response = self.client.get("/api/tables/movie/schema/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["title"], "MovieIn")
+        etag = response.headers["etag"]
+        self.assertEqual(
+            response.headers["cache-control"], "private, no-cache"
+        )
+
+        response = self.client.get(
+            "/api/tables/movie/schema/", headers={"If-None-Match": etag}
+        )
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+        self.assertEqual(response.headers["etag"], etag)
+
+        response = self.client.get(
+            "/api/tables/movie/schema/",
+            headers={"If-None-Match": '"abc123"'},
+        )
+        self.assertEqual(response.status_code, 200)
+
+
+class TestReferences(AdminCRUDTest):
+    def test_references(self):
+        """
+        Make sure the references are returned with an ETag.
+        """
+        response = self.client.get("/api/tables/director/references/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json(),
+            {"references": [{"tableName": "movie", "columnName": "director"}]},
+        )
+
+        response = self.client.get(
+            "/api/tables/director/references/",
+            headers={"If-None-Match": response.headers["etag"]},
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_all_references(self):
+        response = self.client.get("/api/tables/references/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json()["references"],
+            {
+                "director": [{"tableName": "movie", "columnName": "director"}],
+                "movie": [],
+                "studio": [{"tableName": "movie", "columnName": "studio"}],
+            },
+        )
+        self.assertIn("etag", response.headers)
+
+    def test_reference_counts(self):
+        ridley_scott = (
+            Director.select(Director.id)
+            .where(Director.name == "Ridley Scott")
+            .first()
+            .run_sync()["id"]
+        )
+
+        response = self.client.get(
+            f"/api/tables/director/references/{ridley_scott}/"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json(),
+            {
+                "references": [
+                    {
+                        "tableName": "movie",
+                        "columnName": "director",
+                        "count": 2,
+                    }
+                ]
+            },
+        )
+
+        response = self.client.get("/api/tables/director/references/abc/")
+        self.assertEqual(response.status_code, 400)
+
+
+class Band(Table):
+    name = Varchar(unique=True)
+
+
+class Concert(Table):
+    band = ForeignKey(Band, target_column=Band.name)
+
+
+class TestReferenceCountsTargetColumn(TableTest):
+    tables = [Band, Concert]
+
+    def test_target_column(self):
+        """
+        Make sure the counts are correct when the foreign key references a
+        column other than the primary key.
+        """
+        Band.insert(
+            Band(name="Pythonistas"), Band(name="Rustaceans")
+        ).run_sync()
+        Concert.insert(
+            Concert(band="Pythonistas"),
+            Concert(band="Pythonistas"),
+            Concert(band="Rustaceans"),
+        ).run_sync()
+
+        band_id = (
+            Band.select(Band.id)
+            .where(Band.name == "Pythonistas")
+            .first()
+            .run_sync()["id"]
+        )
+
+        admin_crud = AdminCRUD(table=Band, referencing_columns=[Concert.band])
+        counts = asyncio.run(
+            admin_crud._get_reference_counts([Concert.band], row_id=band_id)
+        )
+        self.assertEqual(counts, [2])
+
+
+class TestSearchStrategy(AdminCRUDTest):
+    def get_client(self, **kwargs) -> TestClient:
+        client = TestClient(
+            create_admin(tables=[TableConfig(Movie, **kwargs)])
+        )
+        self.login(client)
+        return client
+
+    def search(self, client: TestClient, **params) -> list[str]:
+        response = client.get("/api/tables/movie/ids/", params=params)
+        self.assertEqual(response.status_code, 200)
+        return list(response.json().values())
+
+    def test_contains(self):
+        self.assertEqual(self.search(self.client, search="LIEN"), ["Alien"])
+        self.assertEqual(
+            self.search(self.client, search="a", limit=1, offset=1),
+            ["Alien"],
+        )
+        self.assertEqual(len(self.search(self.client)), 3)
+
+    def test_readable_template(self):
+        """
+        By default, the formatted readable is searched, including any text in
+        the template. The other strategies search the column directly.
+        """
+        readable = Readable(template="Movie: %s", columns=[Movie.name])
+
+        with patch.object(Movie, "get_readable", return_value=readable):
+            self.assertEqual(
+                self.search(self.client, search="movie: al"), ["Movie: Alien"]
+            )
+
+            client = self.get_client(search_strategy="prefix")
+            self.assertEqual(
+                self.search(client, search="Al"), ["Movie: Alien"]
+            )
+            self.assertEqual(self.search(client, search="Movie: Al"), [])
+
+    def test_prefix(self):
+        client = self.get_client(search_strategy="prefix")
+        self.assertEqual(self.search(client, search="Al"), ["Alien"])
+        self.assertEqual(self.search(client, search="lien"), [])
+        self.assertEqual(self.search(client, search="_lien"), [])
+
+    def test_json_backend(self):
+        """
+        With ``orjson``, the response should be the same as ``PiccoloCRUD``.
+        """
+        clients = []
+        for json_backend in ("json", "orjson"):
+            client = TestClient(
+                create_admin(tables=[Movie], json_backend=json_backend)
+            )
+            self.login(client)
+            clients.append(client)
+
+        for params in (
+            {},
+            {"limit": "1", "offset": "1"},
+            {"search": "LIEN"},
+            {"search": "a", "limit": "1", "offset": "1"},
+            {"search": "%"},
+        ):
+            json_response, orjson_response = [
+                client.get("/api/tables/movie/ids/", params=params)
+                for client in clients
+            ]
+            self.assertEqual(orjson_response.status_code, 200)
+            self.assertEqual(orjson_response.content, json_response.content)
+
+    def test_fallback(self):
+        """
+        Trigram and full text search need Postgres, so fall back to
+        ``'contains'`` for SQLite.
+        """
+        for search_strategy in ("trigram", "fulltext"):
+            client = self.get_client(search_strategy=search_strategy)
+            self.assertEqual(self.search(client, search="lien"), ["Alien"])
+
+    def test_postgres(self):
+        admin_crud = AdminCRUD(table=Movie, search_strategy="trigram")
+
+        db = MagicMock(spec=PostgresEngine, engine_type="postgres")
+
+        with patch.object(Movie._meta, "_db", db):
+            querystring = admin_crud._get_ids_query("star", limit=10, offset=0)
+            self.assertIn(
+                "subquery.search_value ILIKE $1 ORDER BY "
+                "similarity(subquery.search_value, $2) DESC LIMIT 10 OFFSET 0",
+                querystring.compile_string(engine_type="postgres")[0],
+            )
+
+            admin_crud.search_strategy = "fulltext"
+            querystring = admin_crud._get_ids_query(
+                "star wa", limit=None, offset=0
+            )
+            self.assertEqual(
+                querystring.compile_string(engine_type="postgres")[1][-1],
+                "star:* & wa:*",
+            )
+
+    def test_no_cache(self):
+        """
+        The cache is off by default, so changes made outside of the API are
+        visible straight away.
+        """
+        self.assertEqual(self.search(self.client, search="alien"), ["Alien"])
+        Movie.delete().where(Movie.name == "Alien").run_sync()
+        self.assertEqual(self.search(self.client, search="alien"), [])
+
+    def test_cache(self):
+        client = self.get_client(ids_cache_ttl=10)
+        self.assertEqual(self.search(client, search="alien"), ["Alien"])
+
+        Movie.delete().where(Movie.name == "Alien").run_sync()
+
+        # The stale response is returned.
+        self.assertEqual(self.search(client, search="alien"), ["Alien"])
+        self.assertEqual(self.search(client, search="alie"), [])
+
+        # Once the TTL has passed, the response is refreshed.
+        with patch(
+            "piccolo_admin.crud.time.monotonic",
+            return_value=time.monotonic() + 11,
+        ):
+            self.assertEqual(self.search(client, search="alien"), [])
+
+    def test_cache_cleared(self):
+        """
+        Make sure the cache is cleared when the table is modified.
+        """
+        client = self.get_client(ids_cache_ttl=10)
+        csrftoken = client.cookies["csrftoken"]
+        self.assertEqual(self.search(client, search="alien"), ["Alien"])
+
+        response = client.delete(
+            "/api/tables/movie/2/", headers={"X-CSRFToken": csrftoken}
+        )
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(self.search(client, search="alien"), [])
+
+        response = client.request(
+            "DELETE",
+            "/api/tables/movie/bulk/",
+            json={"filters": {"name": "Star Wars"}},
+            headers={"X-CSRFToken": csrftoken},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.search(client), ["Blade Runner"])
+
+    def test_invalid_config(self):
+        with self.assertRaises(ValueError):
+            TableConfig(Movie, search_strategy="foo")  # type: ignore
+
+        with self.assertRaises(ValueError):
+            TableConfig(Movie, ids_cache_ttl=0)
@@ -32,6 +32,7 @@ from piccolo_admin.endpoints import (
     get_all_tables,
 )
 from piccolo_admin.example.app import APP, MEDIA_ROOT, Director, Movie
+from piccolo_admin.example.tables import Studio
 from piccolo_admin.translations.data import ENGLISH, FRENCH, TRANSLATIONS
 from piccolo_admin.version import __VERSION__
 
@@ -157,6 +158,35 @@ class TestTableConfig(TestCase):
                 link_column=TableB.table_a,
             )
 
+    def test_preview_length(self):
+        """
+        Make sure an ``int`` applies to the ``Text`` columns, and a ``dict``
+        to specific columns.
+        """
+        self.assertDictEqual(
+            TableConfig(
+                table_class=Post, preview_length=50
+            ).get_preview_lengths(),
+            {"content": 50},
+        )
+        self.assertDictEqual(
+            TableConfig(
+                table_class=Post, preview_length={Post.name: 10}
+            ).get_preview_lengths(),
+            {"name": 10},
+        )
+        self.assertDictEqual(
+            TableConfig(table_class=Post).get_preview_lengths(), {}
+        )
+
+    def test_preview_length_error(self):
+        for preview_length in (0, {Post.rating: 10}, {Post.content: 0}):
+            with self.assertRaises(ValueError):
+                TableConfig(
+                    table_class=Post,
+                    preview_length=preview_length,  # type: ignore
+                )
+
     def test_sort_column(self):
         """
         Make sure the custom `sort_column` is returned.
@@ -1001,6 +1031,163 @@ class TestTranslations(TestCase):
         response = client.get("/public/translations/nolanguage/")
         self.assertEqual(response.status_code, 404)
 
+    def test_caching(self):
+        """
+        Make sure the translations are compressed, and can be cached.
+        """
+        client = TestClient(APP)
+
+        response = client.get(
+            "/public/translations/en/", headers={"Accept-Encoding": "gzip"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["content-encoding"], "gzip")
+        self.assertEqual(response.headers["vary"], "Accept-Encoding")
+        self.assertEqual(response.headers["cache-control"], "public, no-cache")
+        self.assertEqual(response.json()["language_code"], "en")
+
+        response = client.get(
+            "/public/translations/en/",
+            headers={
+                "Accept-Encoding": "gzip",
+                "If-None-Match": response.headers["etag"],
+            },
+        )
+        self.assertEqual(response.status_code, 304)
+
+        response = client.get(
+            "/public/translations/en/", headers={"Accept-Encoding": "identity"}
+        )
+        self.assertNotIn("content-encoding", response.headers)
+        self.assertEqual(response.json()["language_code"], "en")
+
+    def test_immutable(self):
+        """
+        If the translations version is passed in, the browser can cache the
+        response indefinitely.
+        """
+        client = TestClient(APP)
+
+        version = client.get("/public/translations/").json()[
+            "translations_version"
+        ]
+        self.assertIsInstance(version, str)
+
+        response = client.get(
+            "/public/translations/en/", params={"v": version}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.headers["cache-control"],
+            "public, max-age=31536000, immutable",
+        )
+
+
+class TestBootstrap(TableTest):
+    credentials = {"username": "Bob", "password": "bob123"}
+
+    tables = [SessionsBase, BaseUser, AuthenticatorSecret]
+
+    def setUp(self):
+        super().setUp()
+        BaseUser.create_user_sync(
+            **self.credentials, active=True, admin=True, superuser=True
+        )
+
+    def login(self, client: TestClient):
+        # To get a CSRF cookie
+        response = client.get("/")
+        csrftoken = response.cookies["csrftoken"]
+
+        payload = dict(csrftoken=csrftoken, **self.credentials)
+        client.post(
+            "/public/login/",
+            json=payload,
+            headers={"X-CSRFToken": csrftoken},
+        )
+
+    def test_bootstrap(self):
+        """
+        Make sure the bootstrap response matches the separate endpoints.
+        """
+        response = TestClient(APP).get("/api/bootstrap/")
+        self.assertEqual(response.status_code, 401)
+
+        client = TestClient(APP)
+        self.login(client)
+
+        response = client.get("/api/bootstrap/")
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+
+        for key, path in (
+            ("user", "/api/user/"),
+            ("tables", "/api/tables/grouped/"),
+            ("forms", "/api/forms/grouped/"),
+            ("links", "/api/links/"),
+        ):
+            self.assertEqual(data[key], client.get(path).json())
+
+        public = data["public"]
+        for key, path in (
+            ("meta", "/public/meta/"),
+            ("translations", "/public/translations/"),
+            ("translation", "/public/translations/en/"),
+        ):
+            self.assertEqual(public[key], client.get(path).json())
+
+        # The ETag is specific to the user.
+        etag = response.headers["etag"]
+        response = client.get(
+            "/api/bootstrap/", headers={"If-None-Match": etag}
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_public_bootstrap(self):
+        client = TestClient(APP)
+
+        response = client.get("/public/bootstrap/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json()["meta"], client.get("/public/meta/").json()
+        )
+        self.assertEqual(response.headers["cache-control"], "public, no-cache")
+
+    def test_language(self):
+        """
+        Make sure the correct translation is returned.
+        """
+        client = TestClient(APP)
+
+        for params, language_code in (
+            ({}, "en"),
+            ({"language_code": "fr"}, "fr"),
+            ({"language_code": "FR"}, "fr"),
+            ({"language_code": "xx"}, "en"),
+            ({"browser_language_code": "de-DE"}, "de"),
+            (
+                {"language_code": "fr", "browser_language_code": "de"},
+                "fr",
+            ),
+        ):
+            response = client.get("/public/bootstrap/", params=params)
+            self.assertEqual(
+                response.json()["translation"]["language_code"],
+                language_code,
+            )
+
+        client = TestClient(
+            create_admin(
+                tables=[],
+                translations=[ENGLISH, FRENCH],
+                default_language_code="fr",
+            )
+        )
+        response = client.get(
+            "/public/bootstrap/", params={"browser_language_code": "en"}
+        )
+        self.assertEqual(response.json()["translation"]["language_code"], "fr")
+
 
 class TestHooks(TestCase):
     credentials = {"username": "Bob", "password": "bob123"}
@@ -1130,3 +1317,72 @@ class TestValidators(TestCase):
         )
         self.assertEqual(response.status_code, 403)
         self.assertEqual(response.content, b'{"detail":"Not allowed!"}')
+
+
+class TestLazyTables(TestCase):
+    credentials = {"username": "Bob", "password": "bob123"}
+
+    def setUp(self):
+        create_db_tables_sync(
+            SessionsBase, BaseUser, Director, Studio, Movie, if_not_exists=True
+        )
+        BaseUser.create_user_sync(
+            **self.credentials, active=True, admin=True, superuser=True
+        )
+        Director.insert(Director(name="George Lucas")).run_sync()
+
+    def tearDown(self):
+        drop_db_tables_sync(SessionsBase, BaseUser, Director, Studio, Movie)
+
+    def get_client(self, app) -> TestClient:
+        client = TestClient(app)
+        response = client.get("/")
+        csrftoken = response.cookies["csrftoken"]
+        client.post(
+            "/public/login/",
+            json={**self.credentials, "csrftoken": csrftoken},
+            headers={"X-CSRFToken": csrftoken},
+        )
+        return client
+
+    def get_table_paths(self, app) -> list[str]:
+        return [
+            i.path
+            for i in app.private_app.routes
+            if i.path.startswith("/tables/director/")
+        ]
+
+    def test_lazy_tables(self):
+        """
+        Make sure the table endpoints are only added once they're needed.
+        """
+        app = create_admin(tables=[Movie], lazy_tables=True)
+        self.assertListEqual(self.get_table_paths(app), [])
+
+        client = self.get_client(app)
+
+        # The table list doesn't need the table endpoints.
+        response = client.get("/api/tables/")
+        self.assertEqual(response.status_code, 200)
+        self.assertListEqual(response.json(), ["director", "movie", "studio"])
+        self.assertListEqual(self.get_table_paths(app), [])
+
+        response = client.get("/api/tables/director/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["rows"][0]["name"], "George Lucas")
+        self.assertIn("/tables/director/", self.get_table_paths(app))
+        self.assertNotIn("director", app._pending_table_configs)
+        self.assertIn("movie", app._pending_table_configs)
+
+    def test_openapi(self):
+        """
+        The OpenAPI schema should still contain every table.
+        """
+        app = create_admin(tables=[Movie], lazy_tables=True)
+        client = self.get_client(app)
+
+        response = client.get("/api/openapi.json")
+        self.assertEqual(response.status_code, 200)
+        paths = response.json()["paths"]
+        for tablename in ("director", "movie", "studio"):
+            self.assertIn(f"/tables/{tablename}/", paths)
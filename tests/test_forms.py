@@ -0,0 +1,644 @@
+import asyncio
+import io
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+from unittest import mock
+
+from piccolo.apps.user.tables import BaseUser
+from piccolo.testing.test_case import TableTest
+from piccolo_api.session_auth.tables import SessionsBase
+from pydantic import BaseModel
+from starlette.testclient import TestClient
+
+from piccolo_admin.endpoints import FileResponse, FormConfig, create_admin
+from piccolo_admin.jobs import (
+    FormJob,
+    TableJobStore,
+    report_progress,
+    write_job_file,
+)
+
+
+class FileModel(BaseModel):
+    rows: int = 3
+
+
+def get_rows(rows: int):
+    yield "name\n"
+    for index in range(rows):
+        yield f"row {index}\n"
+
+
+async def get_rows_async(rows: int):
+    for row in get_rows(rows):
+        yield row.encode()
+
+
+def sync_generator_endpoint(request, data: FileModel) -> FileResponse:
+    return FileResponse(
+        contents=get_rows(data.rows),
+        file_name="rows.csv",
+        media_type="text/csv",
+    )
+
+
+async def async_generator_endpoint(request, data: FileModel) -> FileResponse:
+    return FileResponse(
+        contents=get_rows_async(data.rows),
+        file_name="rows.csv",
+        media_type="text/csv",
+    )
+
+
+def bytes_io_endpoint(request, data: FileModel) -> FileResponse:
+    return FileResponse(
+        contents=io.BytesIO("".join(get_rows(data.rows)).encode()),
+        file_name="rows.csv",
+        media_type="text/csv",
+    )
+
+
+def string_io_endpoint(request, data: FileModel) -> FileResponse:
+    return FileResponse(
+        contents=io.StringIO("".join(get_rows(data.rows))),
+        file_name="rows.csv",
+        media_type="text/csv",
+    )
+
+
+class MessageModel(BaseModel):
+    message: str = "hello"
+
+
+def thread_endpoint(request, data: MessageModel) -> str:
+    """
+    Sync endpoints shouldn't be run on the event loop.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return f"{data.message} from a thread"
+    return "Running on the event loop"
+
+
+def process_endpoint(request, data: MessageModel) -> str:
+    if request is not None:
+        raise ValueError("The request shouldn't be passed in.")
+    return f"{data.message} from process {os.getpid()}"
+
+
+def process_error_endpoint(request, data: MessageModel) -> str:
+    raise ValueError("Something went wrong")
+
+
+async def user_endpoint(request, data: MessageModel) -> str:
+    """
+    Background jobs receive a copy of the request, which outlives it.
+    """
+    try:
+        await request.body()
+    except RuntimeError:
+        return f"{data.message} {request.user.user.username}"
+    return "The body was readable"
+
+
+class FormTest(TableTest):
+    """
+    Creates a logged in client for an admin containing ``forms``.
+    """
+
+    credentials = {"username": "Bob", "password": "bob123"}
+
+    tables = [BaseUser, SessionsBase]
+
+    forms: list[FormConfig] = []
+
+    admin_kwargs: dict[str, Any] = {}
+
+    def setUp(self):
+        super().setUp()
+        BaseUser.create_user_sync(
+            **self.credentials, active=True, admin=True, superuser=True
+        )
+
+        self.admin = create_admin(
+            tables=[], forms=self.forms, **self.admin_kwargs
+        )
+        self.client = TestClient(self.admin)
+
+        # To get a CSRF cookie
+        response = self.client.get("/")
+        self.csrftoken = response.cookies["csrftoken"]
+
+        # Login
+        payload = dict(csrftoken=self.csrftoken, **self.credentials)
+        self.client.post(
+            "/public/login/",
+            json=payload,
+            headers={"X-CSRFToken": self.csrftoken},
+        )
+
+    def post_form(self, slug: str, data: dict = {}):
+        return self.client.post(
+            f"/api/forms/{slug}/",
+            json=data,
+            headers={"X-CSRFToken": self.csrftoken},
+        )
+
+
+class TestFileResponse(FormTest):
+    forms = [
+        FormConfig(
+            name="Sync generator",
+            pydantic_model=FileModel,
+            endpoint=sync_generator_endpoint,
+        ),
+        FormConfig(
+            name="Async generator",
+            pydantic_model=FileModel,
+            endpoint=async_generator_endpoint,
+        ),
+        FormConfig(
+            name="Bytes IO",
+            pydantic_model=FileModel,
+            endpoint=bytes_io_endpoint,
+        ),
+        FormConfig(
+            name="String IO",
+            pydantic_model=FileModel,
+            endpoint=string_io_endpoint,
+        ),
+    ]
+
+    def test_file_response(self):
+        for slug in (
+            "sync-generator",
+            "async-generator",
+            "bytes-io",
+            "string-io",
+        ):
+            response = self.post_form(slug)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.text, "name\nrow 0\nrow 1\nrow 2\n")
+            self.assertEqual(
+                response.headers["content-disposition"],
+                'attachment; filename="rows.csv"',
+            )
+            self.assertEqual(
+                response.headers["content-type"], "text/csv; charset=utf-8"
+            )
+
+    def test_content_length(self):
+        """
+        Make sure ``Content-Length`` is set when we know the size up front.
+        """
+        response = self.post_form("bytes-io", {"rows": 100_000})
+        self.assertEqual(
+            int(response.headers["content-length"]), len(response.content)
+        )
+
+        response = self.post_form("sync-generator", {"rows": 100_000})
+        self.assertNotIn("content-length", response.headers)
+        self.assertEqual(response.text.count("\n"), 100_001)
+
+
+class TestFileResponsePath(FormTest):
+    def setUp(self):
+        file = tempfile.NamedTemporaryFile(
+            mode="w", suffix=".csv", delete=False
+        )
+        file.write("name\nrow 0\n")
+        file.close()
+        self.path = file.name
+
+        def endpoint(request, data: FileModel) -> FileResponse:
+            return FileResponse(
+                contents=Path(self.path),
+                file_name="rows.csv",
+                media_type="text/csv",
+            )
+
+        def str_endpoint(request, data: FileModel) -> FileResponse:
+            return FileResponse(
+                contents=self.path,
+                file_name="rows.csv",
+                media_type="text/csv",
+            )
+
+        self.forms = [
+            FormConfig(
+                name="Path", pydantic_model=FileModel, endpoint=endpoint
+            ),
+            FormConfig(
+                name="String path",
+                pydantic_model=FileModel,
+                endpoint=str_endpoint,
+            ),
+        ]
+        super().setUp()
+
+    def tearDown(self):
+        super().tearDown()
+        os.unlink(self.path)
+
+    def test_path(self):
+        for slug in ("path", "string-path"):
+            response = self.post_form(slug)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.text, "name\nrow 0\n")
+            self.assertEqual(response.headers["content-length"], "11")
+            self.assertEqual(
+                response.headers["content-disposition"],
+                'attachment; filename="rows.csv"',
+            )
+
+    def test_write_job_file(self):
+        """
+        Background jobs copy the file, rather than writing the path.
+        """
+        for contents in (self.path, Path(self.path)):
+            path = asyncio.run(write_job_file(contents))
+            try:
+                with open(path) as file:
+                    self.assertEqual(file.read(), "name\nrow 0\n")
+            finally:
+                os.unlink(path)
+
+
+class TestExecutor(FormTest):
+    forms = [
+        FormConfig(
+            name="Thread",
+            pydantic_model=MessageModel,
+            endpoint=thread_endpoint,
+        ),
+        FormConfig(
+            name="Process",
+            pydantic_model=MessageModel,
+            endpoint=process_endpoint,
+            executor="process",
+        ),
+        FormConfig(
+            name="Process error",
+            pydantic_model=MessageModel,
+            endpoint=process_error_endpoint,
+            executor="process",
+        ),
+    ]
+
+    def test_thread(self):
+        response = self.post_form("thread")
+        self.assertEqual(response.status_code, 200)
+        self.assertDictEqual(
+            response.json(), {"custom_form_success": "hello from a thread"}
+        )
+
+    def test_process(self):
+        response = self.post_form("process")
+        self.assertEqual(response.status_code, 200)
+        message = response.json()["custom_form_success"]
+        self.assertTrue(message.startswith("hello from process"))
+        self.assertNotEqual(message, f"hello from process {os.getpid()}")
+
+    def test_shutdown(self):
+        """
+        Make sure the worker processes are stopped when the app shuts down.
+        """
+        self.post_form("process")
+        process_pool = self.admin._form_process_pool
+        self.assertIsNotNone(process_pool)
+
+        # Runs the lifespan events.
+        with TestClient(self.admin):
+            pass
+
+        self.assertIsNone(self.admin._form_process_pool)
+        with self.assertRaises(RuntimeError):
+            process_pool.submit(os.getpid)
+
+    def test_process_error(self):
+        response = self.post_form("process-error")
+        self.assertEqual(response.status_code, 422)
+        self.assertDictEqual(
+            response.json(), {"custom_form_error": "Something went wrong"}
+        )
+
+    def test_invalid_config(self):
+        async def endpoint(request, data: MessageModel):
+            return "ok"
+
+        with self.assertRaises(ValueError):
+            FormConfig(
+                name="Async",
+                pydantic_model=MessageModel,
+                endpoint=endpoint,
+                executor="process",
+            )
+
+        with self.assertRaises(ValueError):
+            FormConfig(
+                name="Foo",
+                pydantic_model=MessageModel,
+                endpoint=thread_endpoint,
+                executor="foo",  # type: ignore
+            )
+
+
+class TestCaching(FormTest):
+    forms = [
+        FormConfig(
+            name="Thread",
+            pydantic_model=MessageModel,
+            endpoint=thread_endpoint,
+            form_group="B",
+        ),
+        FormConfig(
+            name="File",
+            pydantic_model=FileModel,
+            endpoint=sync_generator_endpoint,
+            form_group="A",
+        ),
+    ]
+
+    def assert_etag(self, path: str):
+        response = self.client.get(path)
+        self.assertEqual(response.status_code, 200)
+        etag = response.headers["etag"]
+
+        response = self.client.get(path, headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+
+    def test_schema(self):
+        """
+        Make sure the schema is only generated once, and is returned with an
+        ETag.
+        """
+        with mock.patch.object(
+            MessageModel,
+            "model_json_schema",
+            wraps=MessageModel.model_json_schema,
+        ) as model_json_schema:
+            for _ in range(3):
+                response = self.client.get("/api/forms/thread/schema/")
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.json()["title"], "MessageModel")
+
+        model_json_schema.assert_called_once()
+        self.assert_etag("/api/forms/thread/schema/")
+
+    def test_forms(self):
+        self.assertEqual(
+            self.client.get("/api/forms/").json(),
+            [
+                {"name": "Thread", "slug": "thread", "description": None},
+                {"name": "File", "slug": "file", "description": None},
+            ],
+        )
+        self.assert_etag("/api/forms/")
+
+        response = self.client.get("/api/forms/grouped/")
+        self.assertEqual(list(response.json()["grouped"].keys()), ["A", "B"])
+        self.assert_etag("/api/forms/grouped/")
+
+
+progress_event = threading.Event()
+
+
+def progress_endpoint(request, data: MessageModel) -> str:
+    report_progress(0.5, message="Half way")
+    progress_event.wait(timeout=5)
+    return f"{data.message} from a job"
+
+
+blocking_event = threading.Event()
+
+
+def blocking_endpoint(request, data: MessageModel) -> str:
+    """
+    Doesn't call ``report_progress``, so can't be stopped early.
+    """
+    blocking_event.wait(timeout=5)
+    return "Finished"
+
+
+def slow_endpoint(request, data: MessageModel) -> str:
+    for index in range(100):
+        report_progress(index / 100)
+        time.sleep(0.05)
+    return "Finished"
+
+
+class TestBackground(FormTest):
+    forms = [
+        FormConfig(
+            name="Message",
+            pydantic_model=MessageModel,
+            endpoint=thread_endpoint,
+            background=True,
+        ),
+        FormConfig(
+            name="File",
+            pydantic_model=FileModel,
+            endpoint=sync_generator_endpoint,
+            background=True,
+        ),
+        FormConfig(
+            name="Error",
+            pydantic_model=MessageModel,
+            endpoint=process_error_endpoint,
+            background=True,
+        ),
+        FormConfig(
+            name="Progress",
+            pydantic_model=MessageModel,
+            endpoint=progress_endpoint,
+            background=True,
+        ),
+        FormConfig(
+            name="Slow",
+            pydantic_model=MessageModel,
+            endpoint=slow_endpoint,
+            background=True,
+        ),
+        FormConfig(
+            name="Blocking",
+            pydantic_model=MessageModel,
+            endpoint=blocking_endpoint,
+            background=True,
+        ),
+        FormConfig(
+            name="User",
+            pydantic_model=MessageModel,
+            endpoint=user_endpoint,
+            background=True,
+        ),
+    ]
+
+    def setUp(self):
+        super().setUp()
+        # The event loop needs to keep running between requests, so the
+        # background tasks aren't destroyed.
+        self.client.__enter__()
+
+    def tearDown(self):
+        self.client.__exit__(None, None, None)
+        super().tearDown()
+
+    def get_job(self, slug: str, job_id: str) -> dict[str, Any]:
+        response = self.client.get(f"/api/forms/{slug}/jobs/{job_id}/")
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def wait_for_job(self, slug: str, job_id: str) -> dict[str, Any]:
+        for _ in range(100):
+            job = self.get_job(slug, job_id)
+            if job["finished_at"] is not None:
+                return job
+            time.sleep(0.05)
+        raise TimeoutError("The job didn't finish")
+
+    def wait_for_task(self, job_id: str):
+        """
+        Cancelled jobs are marked as finished straight away, but the task
+        might still be running.
+        """
+        for _ in range(100):
+            if job_id not in self.admin.form_job_manager.tasks:
+                return
+            time.sleep(0.05)
+        raise TimeoutError("The task didn't finish")
+
+    def start_job(self, slug: str, data: dict = {}) -> str:
+        response = self.post_form(slug, data)
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.json()["form_slug"], slug)
+        return response.json()["id"]
+
+    def test_message(self):
+        job_id = self.start_job("message")
+        job = self.wait_for_job("message", job_id)
+        self.assertEqual(job["status"], "succeeded")
+        self.assertEqual(job["message"], "hello from a thread")
+        self.assertIsNone(job["file_name"])
+
+    def test_request(self):
+        job_id = self.start_job("user")
+        job = self.wait_for_job("user", job_id)
+        self.assertEqual(job["status"], "succeeded")
+        self.assertEqual(job["message"], "hello Bob")
+
+    def test_file(self):
+        job_id = self.start_job("file")
+        job = self.wait_for_job("file", job_id)
+        self.assertEqual(job["status"], "succeeded")
+        self.assertEqual(job["file_name"], "rows.csv")
+
+        response = self.client.get(f"/api/forms/file/jobs/{job_id}/download/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.text, "name\nrow 0\nrow 1\nrow 2\n")
+        self.assertEqual(
+            response.headers["content-disposition"],
+            'attachment; filename="rows.csv"',
+        )
+
+    def test_error(self):
+        job_id = self.start_job("error")
+        job = self.wait_for_job("error", job_id)
+        self.assertEqual(job["status"], "failed")
+        self.assertEqual(job["message"], "Something went wrong")
+
+    def test_progress(self):
+        progress_event.clear()
+        job_id = self.start_job("progress")
+
+        for _ in range(100):
+            job = self.get_job("progress", job_id)
+            if job["progress"] is not None:
+                break
+            time.sleep(0.05)
+
+        self.assertEqual(job["status"], "running")
+        self.assertEqual(job["progress"], 0.5)
+        self.assertEqual(job["progress_message"], "Half way")
+
+        progress_event.set()
+        job = self.wait_for_job("progress", job_id)
+        self.assertEqual(job["status"], "succeeded")
+        self.assertEqual(job["progress"], 1.0)
+        self.assertEqual(job["message"], "hello from a job")
+
+    def test_cancel(self):
+        job_id = self.start_job("slow")
+        response = self.client.delete(
+            f"/api/forms/slow/jobs/{job_id}/",
+            headers={"X-CSRFToken": self.csrftoken},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["status"], "cancelled")
+        self.assertEqual(self.get_job("slow", job_id)["status"], "cancelled")
+
+    def test_cancel_blocking(self):
+        """
+        Cancelling shouldn't wait for a sync endpoint to finish.
+        """
+        blocking_event.clear()
+        job_id = self.start_job("blocking")
+
+        start = time.monotonic()
+        response = self.client.delete(
+            f"/api/forms/blocking/jobs/{job_id}/",
+            headers={"X-CSRFToken": self.csrftoken},
+        )
+        self.assertLess(time.monotonic() - start, 2)
+        self.assertEqual(response.json()["status"], "cancelled")
+
+        # Once the endpoint finishes, the job is still cancelled.
+        blocking_event.set()
+        self.wait_for_task(job_id)
+        job = self.get_job("blocking", job_id)
+        self.assertEqual(job["status"], "cancelled")
+
+    def test_missing(self):
+        job_id = self.start_job("message")
+        self.wait_for_job("message", job_id)
+
+        for path in (
+            "/api/forms/message/jobs/abc123/",
+            f"/api/forms/file/jobs/{job_id}/",
+            f"/api/forms/message/jobs/{job_id}/download/",
+        ):
+            response = self.client.get(path)
+            self.assertEqual(response.status_code, 404)
+
+
+class TestBackgroundTableStore(TestBackground):
+    tables = [BaseUser, SessionsBase, FormJob]
+
+    admin_kwargs = {"form_job_store": TableJobStore()}
+
+    def test_cancel_other_worker(self):
+        """
+        If another worker cancels the job, the cancelled status is kept.
+        """
+        blocking_event.clear()
+        job_id = self.start_job("blocking")
+
+        FormJob.update(
+            {
+                FormJob.status: "cancelled",
+                FormJob.finished_at: datetime.now(tz=timezone.utc),
+            }
+        ).where(FormJob.job_id == job_id).run_sync()
+
+        blocking_event.set()
+        self.wait_for_task(job_id)
+
+        self.assertEqual(
+            self.get_job("blocking", job_id)["status"], "cancelled"
+        )
@@ -0,0 +1,104 @@
+from unittest import TestCase
+
+from piccolo.columns.base import Column
+from piccolo.columns.column_types import ForeignKey, Varchar
+from piccolo.table import Table, create_table_class
+from starlette.testclient import TestClient
+
+from piccolo_admin.crud import AdminCRUD
+from piccolo_admin.endpoints import create_admin, get_all_tables
+from piccolo_admin.example.tables import Director, Movie, Studio
+from piccolo_admin.graph import TableGraph
+
+
+class Category(Table):
+    name = Varchar()
+    parent: ForeignKey["Category"] = ForeignKey("self")
+
+
+class Product(Table):
+    name = Varchar()
+    category = ForeignKey(Category)
+
+
+def create_chain(count: int) -> list[type[Table]]:
+    tables: list[type[Table]] = []
+
+    for index in range(count):
+        class_members: dict[str, Column] = {"name": Varchar()}
+        if tables:
+            class_members["parent"] = ForeignKey(references=tables[-1])
+
+        tables.append(
+            create_table_class(
+                class_name=f"ChainTable{index}",
+                class_kwargs={"tablename": f"chain_table_{index}"},
+                class_members=class_members,
+            )
+        )
+
+    return tables
+
+
+class TestTableGraph(TestCase):
+    def test_include_related(self):
+        graph = TableGraph([Product])
+        self.assertEqual(graph.tables, [Product, Category])
+
+        graph = TableGraph([Product], include_related=False)
+        self.assertEqual(graph.tables, [Product])
+
+    def test_edges(self):
+        graph = TableGraph([Product])
+
+        self.assertEqual(graph.get_referenced_tables(Product), [Category])
+        self.assertEqual(graph.get_referenced_tables(Category), [Category])
+
+        self.assertEqual(
+            graph.get_referencing_columns(Category),
+            [Product.category, Category.parent],
+        )
+        self.assertEqual(graph.get_referencing_columns(Product), [])
+
+    def test_reverse_only_includes_graph(self):
+        """
+        Tables which aren't in the graph aren't included in the reverse
+        edges.
+        """
+        graph = TableGraph([Category])
+        self.assertEqual(
+            graph.get_referencing_columns(Category), [Category.parent]
+        )
+
+    def test_long_chain(self):
+        """
+        Make sure long chains of foreign keys don't exceed the recursion
+        limit.
+        """
+        tables = create_chain(3000)
+        self.assertEqual(get_all_tables(tables[-1:]), tables[::-1])
+
+
+class TestReferences(TestCase):
+    def test_admin_router(self):
+        admin = create_admin(tables=[Movie])
+        self.assertIn(Studio, admin.table_graph)
+        self.assertEqual(
+            admin.table_graph.get_referencing_columns(Director),
+            [Movie.director],
+        )
+
+    def test_references(self):
+        """
+        If ``referencing_columns`` is passed in, the references endpoint
+        returns them, rather than introspecting the table classes.
+        """
+        client = TestClient(
+            AdminCRUD(table=Director, referencing_columns=[Movie.director])
+        )
+        response = client.get("/references/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json(),
+            {"references": [{"tableName": "movie", "columnName": "director"}]},
+        )
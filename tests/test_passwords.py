@@ -0,0 +1,147 @@
+import asyncio
+import threading
+from unittest import TestCase
+from unittest.mock import patch
+
+from piccolo.apps.user.tables import BaseUser
+from piccolo.testing.test_case import TableTest
+from piccolo_api.mfa.authenticator.tables import AuthenticatorSecret
+from piccolo_api.session_auth.tables import SessionsBase
+from starlette.testclient import TestClient
+
+from piccolo_admin.endpoints import create_admin
+from piccolo_admin.example.tables import Director, Movie
+from piccolo_admin.passwords import PasswordHasher, PasswordHashingProxy
+
+
+class TestPasswordHasher(TableTest):
+    tables = [BaseUser]
+
+    def setUp(self):
+        super().setUp()
+        self.user = BaseUser.create_user_sync(
+            username="Bob", password="bob123", active=True
+        )
+        self.password_hasher = PasswordHasher(limit=2)
+
+    def test_login(self):
+        login = self.password_hasher.login
+
+        self.assertEqual(
+            asyncio.run(login(BaseUser, username="Bob", password="bob123")),
+            self.user.id,
+        )
+        self.assertIsNone(
+            asyncio.run(login(BaseUser, username="Bob", password="bob456"))
+        )
+        self.assertIsNone(
+            asyncio.run(login(BaseUser, username="Sally", password="bob123"))
+        )
+
+    def test_thread(self):
+        """
+        Make sure the password is hashed in a thread, rather than blocking the
+        event loop.
+        """
+        hash_password = BaseUser.hash_password
+        threads: list[threading.Thread] = []
+
+        def wrapper(*args, **kwargs):
+            threads.append(threading.current_thread())
+            return hash_password(*args, **kwargs)
+
+        with patch.object(BaseUser, "hash_password", wrapper):
+            user_id = asyncio.run(
+                PasswordHashingProxy(
+                    BaseUser, password_hasher=self.password_hasher
+                ).login(username="Bob", password="bob123")
+            )
+
+        self.assertEqual(user_id, self.user.id)
+        self.assertEqual(len(threads), 1)
+        self.assertIsNot(threads[0], threading.main_thread())
+
+    def test_update_password(self):
+        """
+        Passwords hashed with fewer iterations are rehashed when logging in.
+        """
+        BaseUser.update(
+            {
+                BaseUser.password: BaseUser.hash_password(
+                    "bob123", iterations=1000
+                )
+            },
+            force=True,
+        ).run_sync()
+
+        asyncio.run(
+            self.password_hasher.login(
+                BaseUser, username="Bob", password="bob123"
+            )
+        )
+
+        password = BaseUser.select(BaseUser.password).first().run_sync()
+        self.assertTrue(
+            password["password"].startswith(
+                f"pbkdf2_sha256${BaseUser._pbkdf2_iteration_count}$"
+            )
+        )
+        self.assertEqual(BaseUser.login_sync("Bob", "bob123"), self.user.id)
+
+    def test_limit(self):
+        with self.assertRaises(ValueError):
+            PasswordHasher(limit=0)
+
+
+class TestAdminPasswords(TableTest):
+    tables = [BaseUser, SessionsBase, AuthenticatorSecret, Movie, Director]
+
+    def setUp(self):
+        super().setUp()
+        BaseUser.create_user_sync(
+            username="Bob",
+            password="bob123",
+            active=True,
+            admin=True,
+            superuser=True,
+        )
+
+    def test_change_password(self):
+        client = TestClient(create_admin(tables=[Movie]))
+
+        # To get a CSRF cookie
+        response = client.get("/")
+        csrftoken = response.cookies["csrftoken"]
+
+        response = client.post(
+            "/public/login/",
+            json={"username": "Bob", "password": "bob456"},
+            headers={"X-CSRFToken": csrftoken},
+        )
+        self.assertEqual(response.status_code, 401)
+
+        response = client.post(
+            "/public/login/",
+            json={"username": "Bob", "password": "bob123"},
+            headers={"X-CSRFToken": csrftoken},
+        )
+        self.assertEqual(response.status_code, 200)
+
+        response = client.post(
+            "/api/change-password/",
+            json={
+                "current_password": "bob123",
+                "new_password": "bob456",
+                "confirm_new_password": "bob456",
+            },
+            headers={"X-CSRFToken": csrftoken},
+            follow_redirects=False,
+        )
+        self.assertEqual(response.status_code, 303)
+        self.assertIsNotNone(BaseUser.login_sync("Bob", "bob456"))
+
+
+class TestInvalid(TestCase):
+    def test_invalid_limit(self):
+        with self.assertRaises(ValueError):
+            create_admin(tables=[Movie], password_thread_limit=0)
@@ -0,0 +1,208 @@
+import asyncio
+import os
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+from piccolo.apps.user.tables import BaseUser
+from piccolo.testing.test_case import TableTest
+from piccolo_api.mfa.authenticator.tables import AuthenticatorSecret
+from piccolo_api.rate_limiting.middleware import RateLimitError
+from piccolo_api.session_auth.tables import SessionsBase
+from starlette.testclient import TestClient
+
+from piccolo_admin.endpoints import create_admin
+from piccolo_admin.example.tables import Director, Movie
+from piccolo_admin.rate_limiting import SQLiteLimitProvider
+
+
+class TestSQLiteLimitProvider(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "rate_limit.sqlite")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def get_provider(self, **kwargs) -> SQLiteLimitProvider:
+        return SQLiteLimitProvider(
+            **{"path": self.path, "timespan": 100, "limit": 3, **kwargs}
+        )
+
+    def increment(self, provider: SQLiteLimitProvider, now: float) -> bool:
+        """
+        :returns:
+            ``True`` if the request is allowed.
+        """
+        with patch("piccolo_admin.rate_limiting.time.time", return_value=now):
+            try:
+                provider.increment("127.0.0.1")
+            except RateLimitError:
+                return False
+            return True
+
+    def get_row_count(self, provider: SQLiteLimitProvider) -> int:
+        return (
+            provider._get_connection()
+            .execute("SELECT COUNT(*) FROM rate_limit")
+            .fetchone()[0]
+        )
+
+    def test_limit(self):
+        provider = self.get_provider()
+        self.assertEqual(
+            [self.increment(provider, now=1000 + i) for i in range(4)],
+            [True, True, True, False],
+        )
+
+        # Other clients aren't affected.
+        provider.increment("127.0.0.2")
+
+    def test_shared(self):
+        """
+        Make sure the counters are shared between providers using the same
+        file (e.g. in different worker processes).
+        """
+        provider_1 = self.get_provider()
+        provider_2 = self.get_provider()
+
+        self.assertTrue(self.increment(provider_1, now=1000))
+        self.assertTrue(self.increment(provider_2, now=1001))
+        self.assertTrue(self.increment(provider_1, now=1002))
+        self.assertFalse(self.increment(provider_2, now=1003))
+
+        # Unless they have a different namespace.
+        self.assertTrue(
+            self.increment(provider_1.copy(namespace="other"), now=1004)
+        )
+
+    def test_sliding_window(self):
+        provider = self.get_provider()
+
+        for i in range(3):
+            self.assertTrue(self.increment(provider, now=1090 + i))
+
+        # A new window has started, but the requests from the previous one
+        # still count.
+        self.assertFalse(self.increment(provider, now=1110))
+
+        # Once enough time has passed, requests are allowed again.
+        self.assertTrue(self.increment(provider, now=1190))
+
+        # Long after, the counters are reset.
+        for i in range(3):
+            self.assertTrue(self.increment(provider, now=5000 + i))
+
+    def test_block_duration(self):
+        provider = self.get_provider(block_duration=1000)
+
+        for i in range(4):
+            self.increment(provider, now=1000 + i)
+
+        # It would be allowed by the sliding window, but it's still blocked.
+        self.assertFalse(self.increment(provider, now=1500))
+        self.assertTrue(self.increment(provider, now=2100))
+
+        for i in range(4):
+            self.increment(provider, now=3000 + i)
+
+        provider.clear_blocked()
+        self.assertTrue(self.increment(provider, now=3300))
+
+    def test_eviction(self):
+        provider = self.get_provider(eviction_interval=50)
+
+        self.increment(provider, now=1000)
+        self.assertEqual(self.get_row_count(provider), 1)
+
+        with patch("piccolo_admin.rate_limiting.time.time", return_value=1300):
+            provider.increment("127.0.0.2")
+
+        # Only the recent counter remains.
+        self.assertEqual(self.get_row_count(provider), 1)
+
+    def test_copy(self):
+        provider = self.get_provider().copy(
+            namespace="other", limit=5, timespan=200
+        )
+        self.assertEqual(
+            (provider.namespace, provider.limit, provider.timespan),
+            ("other", 5, 200),
+        )
+        self.assertEqual(provider.path, self.path)
+
+    def test_timespan(self):
+        with self.assertRaises(ValueError):
+            self.get_provider(timespan=0)
+
+
+class TestAdminRateLimiting(TableTest):
+    tables = [BaseUser, SessionsBase, AuthenticatorSecret, Movie, Director]
+
+    def setUp(self):
+        super().setUp()
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        super().tearDown()
+        self.directory.cleanup()
+
+    def test_login(self):
+        provider = SQLiteLimitProvider(
+            path=os.path.join(self.directory.name, "rate_limit.sqlite"),
+            timespan=300,
+            limit=2,
+        )
+        client = TestClient(
+            create_admin(tables=[Movie], rate_limit_provider=provider)
+        )
+
+        # To get a CSRF cookie
+        response = client.get("/")
+        csrftoken = response.cookies["csrftoken"]
+
+        status_codes = [
+            client.post(
+                "/public/login/",
+                json={"username": "Bob", "password": "bob123"},
+                headers={"X-CSRFToken": csrftoken},
+            ).status_code
+            for _ in range(3)
+        ]
+        self.assertEqual(status_codes, [401, 401, 429])
+
+    def test_not_on_event_loop(self):
+        """
+        The provider can wait for the database lock, so make sure it isn't
+        called on the event loop.
+        """
+        provider = SQLiteLimitProvider(
+            path=os.path.join(self.directory.name, "rate_limit.sqlite"),
+            timespan=300,
+        )
+        increment = provider.increment
+        on_event_loop = []
+
+        def wrapped(identifier: str):
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                on_event_loop.append(False)
+            else:
+                on_event_loop.append(True)
+            increment(identifier)
+
+        client = TestClient(
+            create_admin(tables=[Movie], rate_limit_provider=provider)
+        )
+        response = client.get("/")
+        csrftoken = response.cookies["csrftoken"]
+
+        with patch.object(provider, "increment", wrapped):
+            client.post(
+                "/public/login/",
+                json={"username": "Bob", "password": "bob123"},
+                headers={"X-CSRFToken": csrftoken},
+            )
+
+        self.assertEqual(on_event_loop, [False])
@@ -0,0 +1,210 @@
+import datetime
+from unittest import TestCase
+
+from piccolo.apps.user.tables import BaseUser
+from piccolo.testing.test_case import TableTest
+from piccolo_api.mfa.authenticator.tables import AuthenticatorSecret
+from piccolo_api.session_auth.tables import SessionsBase
+from starlette.testclient import TestClient
+
+from piccolo_admin.endpoints import create_admin
+from piccolo_admin.example.tables import Director, Movie
+from piccolo_admin.sessions import SessionCache
+
+
+def make_user(user_id: int) -> BaseUser:
+    return BaseUser(id=user_id, username=f"user_{user_id}")
+
+
+class TestSessionCache(TestCase):
+    expiry_date = datetime.datetime.now() + datetime.timedelta(hours=1)
+
+    def add(self, cache: SessionCache, token: str, user_id: int = 1):
+        cache.set(
+            token=token,
+            user=make_user(user_id),
+            expiry_date=self.expiry_date,
+            max_expiry_date=self.expiry_date,
+        )
+
+    def test_metrics(self):
+        cache = SessionCache()
+        self.assertEqual(cache.metrics.hit_rate, 0.0)
+
+        self.assertIsNone(cache.get("abc"))
+        self.add(cache, "abc")
+        self.assertIsNotNone(cache.get("abc"))
+        self.assertIsNotNone(cache.get("abc"))
+        self.assertIsNotNone(cache.get("abc"))
+
+        self.assertEqual(
+            cache.metrics.to_dict(),
+            {
+                "hits": 3,
+                "misses": 1,
+                "evictions": 0,
+                "invalidations": 0,
+                "hit_rate": 0.75,
+            },
+        )
+
+    def test_eviction(self):
+        """
+        The least recently used sessions are evicted first.
+        """
+        cache = SessionCache(max_size=2)
+        self.add(cache, "a")
+        self.add(cache, "b")
+        cache.get("a")
+        self.add(cache, "c")
+
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNotNone(cache.get("c"))
+        self.assertEqual(cache.metrics.evictions, 1)
+
+    def test_expired(self):
+        cache = SessionCache()
+
+        self.add(cache, "a")
+        cache._sessions["a"].cached_until = 0
+        self.assertIsNone(cache.get("a"))
+
+        # The session itself has expired.
+        self.add(cache, "b")
+        cache._sessions["b"].expiry_date = datetime.datetime.now()
+        self.assertIsNone(cache.get("b"))
+
+        self.assertEqual(len(cache), 0)
+
+    def test_invalidate(self):
+        cache = SessionCache()
+        self.add(cache, "a", user_id=1)
+        self.add(cache, "b", user_id=1)
+        self.add(cache, "c", user_id=2)
+
+        cache.invalidate_user(1)
+        self.assertEqual(list(cache._sessions.keys()), ["c"])
+
+        cache.invalidate("c")
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.metrics.invalidations, 3)
+
+    def test_invalid_args(self):
+        with self.assertRaises(ValueError):
+            SessionCache(ttl=0)
+
+        with self.assertRaises(ValueError):
+            SessionCache(max_size=0)
+
+
+class TestCachedSessions(TableTest):
+    credentials = {"username": "Bob", "password": "bob123"}
+
+    tables = [BaseUser, SessionsBase, AuthenticatorSecret, Movie, Director]
+
+    def setUp(self):
+        super().setUp()
+        self.user = BaseUser.create_user_sync(
+            **self.credentials, active=True, admin=True, superuser=True
+        )
+        self.app = create_admin(tables=[Movie, BaseUser], session_cache_ttl=60)
+        self.session_cache = self.app.session_cache
+        assert self.session_cache is not None
+
+        self.client = TestClient(self.app)
+
+        # To get a CSRF cookie
+        response = self.client.get("/")
+        self.csrftoken = response.cookies["csrftoken"]
+
+        response = self.client.post(
+            "/public/login/",
+            json=dict(csrftoken=self.csrftoken, **self.credentials),
+            headers={"X-CSRFToken": self.csrftoken},
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_cached(self):
+        self.assertIsNone(create_admin(tables=[Movie]).session_cache)
+
+        for _ in range(3):
+            response = self.client.get("/api/user/")
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json()["username"], "Bob")
+
+        self.assertEqual(self.session_cache.metrics.misses, 1)
+        self.assertEqual(self.session_cache.metrics.hits, 2)
+
+    def test_logout(self):
+        self.assertEqual(self.client.get("/api/user/").status_code, 200)
+        self.assertEqual(len(self.session_cache), 1)
+
+        response = self.client.post(
+            "/public/logout/", headers={"X-CSRFToken": self.csrftoken}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(self.session_cache), 0)
+        self.assertEqual(SessionsBase.count().run_sync(), 0)
+
+    def test_change_password(self):
+        self.assertEqual(self.client.get("/api/user/").status_code, 200)
+        self.assertEqual(len(self.session_cache), 1)
+
+        response = self.client.post(
+            "/api/change-password/",
+            json={
+                "current_password": "bob123",
+                "new_password": "bob456",
+                "confirm_new_password": "bob456",
+            },
+            headers={"X-CSRFToken": self.csrftoken},
+            follow_redirects=False,
+        )
+        self.assertEqual(response.status_code, 303)
+        self.assertEqual(len(self.session_cache), 0)
+
+    def test_deactivate(self):
+        """
+        If a user is deactivated, their cached sessions can't be used any
+        more.
+        """
+        self.assertEqual(self.client.get("/api/user/").status_code, 200)
+
+        response = self.client.patch(
+            f"/api/tables/piccolo_user/{self.user.id}/",
+            json={"active": False},
+            headers={"X-CSRFToken": self.csrftoken},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(self.session_cache), 0)
+
+        response = self.client.get("/api/user/")
+        self.assertEqual(response.status_code, 401)
+
+    def test_increase_expiry(self):
+        """
+        The session expiry is extended, and the cached session is kept in
+        sync, so subsequent requests don't extend it again.
+        """
+        expiry_date = datetime.datetime.now() + datetime.timedelta(minutes=5)
+        SessionsBase.update(
+            {SessionsBase.expiry_date: expiry_date}, force=True
+        ).run_sync()
+        self.session_cache.clear()
+
+        for _ in range(3):
+            self.assertEqual(self.client.get("/api/user/").status_code, 200)
+
+        new_expiry_date = (
+            SessionsBase.select(SessionsBase.expiry_date)
+            .first()
+            .run_sync()["expiry_date"]
+        )
+        self.assertEqual(
+            new_expiry_date, expiry_date + datetime.timedelta(minutes=20)
+        )
+
+        (session,) = self.session_cache._sessions.values()
+        self.assertEqual(session.expiry_date, new_expiry_date)